@@ -1,124 +1,428 @@
 import os
-from random import randint
-import requests
-from flask import Flask, jsonify, request
+from time import time_ns
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+from backend.app.events import ChainEvents
+from backend.app.background import BackgroundPubSub, StartupTasks, connect_pubsub, sync_peers, load_chain_file, seed_data
 from backend.blockchain.blockchain import Blockchain
-from backend.pubsub import PubSub
+from backend.miner import Miner
+from backend.util.rwlock import ReadWriteLock
+from backend.util.response_cache import TipResponseCache
+from backend.util.merkle import leaf_hash, merkle_proof, verify_merkle_proof
+from backend.util.event_bus import EventBus, encode_event
+from backend.util.metrics import REGISTRY
+from backend.util.profiler import Profiler
+from backend.config import MERKLE_BLOCK_VERSION, PROFILING_ENABLED, PRUNE_DEPTH, SECONDS
 from backend.wallet.wallet import Wallet
 from backend.wallet.transaction import Transaction
 from backend.wallet.transaction_pool import TransactionPool
 
 
-app = Flask(__name__)
-CORS(app, resources={ r'/*': { 'origins': 'http://localhost:3000' } })
-blockchain = Blockchain()
-wallet = Wallet(blockchain)
-transaction_pool = TransactionPool()
-pubsub = PubSub(blockchain, transaction_pool)
-
-# GET
-@app.route('/')
-def route_default():
-    return 'Welcome to the Blockchain'
-
-# GET
-@app.route('/blockchain')
-def route_blockchain():
-    return jsonify(blockchain.to_json())
-
-# QUERY
-@app.route('/blockchain/range')
-def route_blockchain_range():
-    start = int(request.args.get('start'))
-    end = int(request.args.get('end'))
-
-    return jsonify(blockchain.to_json()[::-1][start:end])
-
-# GET
-@app.route('/blockchain/length')
-def route_blockchain_length():
-    return jsonify(len(blockchain.chain))
-
-# GET
-@app.route('/blockchain/mine')
-def route_blockchain_mine():
-    transaction_data = transaction_pool.transaction_data()
-    transaction_data.append(Transaction.reward_transaction(wallet).to_json())
-    blockchain.add_block(transaction_data)
-    block = blockchain.chain[-1]
-    pubsub.broadcast_block(block)
-    transaction_pool.clear_blockchain_transactions(blockchain)
-
-    return jsonify(block.to_json())
-
-# POST
-@app.route('/wallet/transact', methods=['POST'])
-def route_wallet_transact():
-    transaction_data = request.get_json()
-    transaction = transaction_pool.existing_transaction(wallet.address)
-    
-    # Existing transaction exists - modify it
-    if transaction:
-        transaction.update(wallet, transaction_data['recipient'],  transaction_data['amount'])
-    # Create new transaction
-    else:
-        transaction = Transaction(wallet, transaction_data['recipient'],  transaction_data['amount'])
-
-    pubsub.broadcast_transaction(transaction)
-
-    return jsonify(transaction.to_json())
-
-# GET
-@app.route('/wallet/info')
-def route_wallet_info():
-    return jsonify({'address': wallet.address, 'balance': wallet.balance})
-
-# GET
-@app.route('/known-addresses')
-def route_known_addresses():
-    known_addresses = set()
-
-    for block in blockchain.chain:
-        for transaction in block.data:
-            known_addresses.update(transaction['output'].keys())
-
-    return jsonify(list(known_addresses))
-
-# GET
-@app.route('/transactions')
-def route_transactions():
-    return jsonify(transaction_pool.transaction_data())
-
-
-# -- TESTING AND EXPERIMENTATION -- #
-
 ROOT_PORT = 5000
-PORT = ROOT_PORT
-
-# Run peers who can make requests
-if os.environ.get('PEER') == 'True':
-    PORT = randint(5001, 6000)
-    result = requests.get(f'http://localhost:{ROOT_PORT}/blockchain')
-    result_blockchain = Blockchain.from_json(result.json())
-
-    try:
-        blockchain.replace_chain(result_blockchain.chain)
-        print('\n-- Successfully synchronized the local chain')
-    except Exception as e:
-        print(f'\n-- Error synchronizing: {e}')
-
-# Seed blockchain with transactions
-if os.environ.get('SEED_DATA') == 'True':
-    for i in range(10):
-        blockchain.add_block([
-            Transaction(Wallet(), Wallet().address, randint(2, 50)).to_json(),
-            Transaction(Wallet(), Wallet().address, randint(2, 50)).to_json()
-        ])
-
-    for i in range(3):
-        transaction_pool.set_transaction(Transaction(Wallet(), Wallet().address, randint(2, 50)))
-
-## -- END TESTING AND EXPERIMENTATION -- ##
-
-app.run(port=PORT)
+
+# Known peers to synchronize with (comma separated base URLs)
+PEER_URLS = os.environ.get('PEER_URLS', f'http://localhost:{ROOT_PORT}').split(',')
+
+# Page size of /wallet/history
+DEFAULT_HISTORY_LIMIT = 20
+MAX_HISTORY_LIMIT = 100
+
+# Recipients per /wallet/transact/batch request
+MAX_BATCH_PAYMENTS = 10000
+
+# Open /events streams (each holds a server thread)
+MAX_EVENT_SUBSCRIBERS = 100
+# Seconds between keepalive comments on idle /events streams
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Blocks covered by /blockchain/stats (and how finely throughput is split)
+DEFAULT_STATS_WINDOW = 1000
+MAX_STATS_WINDOW = 10000
+MAX_STATS_SEGMENTS = 1000
+
+def create_app(start_background=True):
+    """
+    Create node app (run with python -m backend.app)
+    - Nothing is started at import time
+    - PubSub connect, peer sync, chain file loading and seeding run in a background
+      thread, so HTTP requests (e.g. /health) are answered right away
+    :param start_background: <bool> Whether startup tasks are started
+    :return: <Flask> App
+    """
+    app = Flask(__name__)
+    CORS(app, resources={ r'/*': { 'origins': 'http://localhost:3000' } })
+    blockchain = Blockchain(PRUNE_DEPTH)
+    wallet = Wallet(blockchain)
+    transaction_pool = TransactionPool()
+    # Guards blockchain and transaction_pool – shared by request threads, PubSub and Miner
+    state_lock = ReadWriteLock()
+    pubsub = BackgroundPubSub(blockchain, transaction_pool, state_lock)
+    miner = Miner(blockchain, transaction_pool, wallet, pubsub, state_lock)
+    # Chain endpoint responses – invalidated whenever the chain tip changes
+    response_cache = TipResponseCache()
+    # Pushes chain and pool changes to /events streams
+    event_bus = EventBus(MAX_EVENT_SUBSCRIBERS)
+    chain_events = ChainEvents(blockchain, transaction_pool, state_lock, event_bus)
+    # Samples live node on request (/debug/profile)
+    profiler = Profiler()
+    started_at = time_ns()
+
+    startup = StartupTasks()
+    startup.add('pubsub', lambda: connect_pubsub(pubsub))
+    startup.add('sync', lambda: sync_peers(blockchain, transaction_pool, state_lock, PEER_URLS))
+    startup.add('chain_file', lambda: load_chain_file(blockchain, state_lock))
+    startup.add('seed_data', lambda: seed_data(blockchain, transaction_pool, state_lock))
+
+    # Latest app's gauges replace those of any app created before
+    for name in ('chain_length', 'transaction_pool_size', 'response_cache_hits', 'response_cache_misses',
+                 'pruned_bytes_reclaimed'):
+        REGISTRY.unregister(name)
+
+    REGISTRY.gauge('chain_length', 'Blocks in local chain', function=lambda: len(blockchain.chain))
+    REGISTRY.gauge('transaction_pool_size', 'Transactions in pool', function=lambda: len(transaction_pool.transaction_map))
+    REGISTRY.gauge('response_cache_hits', 'Chain responses served from cache', function=lambda: response_cache.hits)
+    REGISTRY.gauge('response_cache_misses', 'Chain responses computed', function=lambda: response_cache.misses)
+    REGISTRY.gauge('pruned_bytes_reclaimed', 'Approximate bytes freed by pruning Block data',
+                   function=lambda: blockchain.reclaimed_bytes)
+
+    def chain_response(compute):
+        """
+        Serve chain-derived JSON from response cache with ETag / conditional GET support
+        :param compute: <callable> Returns response data (called under read lock on cache miss)
+        :return: <Response> JSON response (304 if client copy still current)
+        """
+        with state_lock.read():
+            body, etag = response_cache.get(blockchain.chain[-1].hash, request.full_path, compute)
+
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        # Clients must revalidate (If-None-Match) before reusing their copy
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def pruned_response(heights):
+        """
+        Error response for requests reaching Blocks whose data was pruned
+        :param heights: <callable> Returns (first height, height after last) from chain length
+        :return: <tuple / None> 410 response, None if every Block requested has data
+        """
+        with state_lock.read():
+            start, end = heights(len(blockchain.chain))
+
+            if blockchain.is_pruned(start, end):
+                return jsonify({
+                    'error': f'Data of Blocks below height {blockchain.pruned_height} pruned (headers at /blockchain/headers)'
+                }), 410
+
+    # GET
+    @app.route('/')
+    def route_default():
+        return 'Welcome to the Blockchain'
+
+    # GET
+    @app.route('/blockchain')
+    def route_blockchain():
+        return pruned_response(lambda length: (0, length)) or chain_response(lambda: blockchain.serialize())
+
+    # QUERY
+    @app.route('/blockchain/range')
+    def route_blockchain_range():
+        start = int(request.args.get('start'))
+        end = int(request.args.get('end'))
+
+        # Newest first – heights length - end to length - start - 1
+        return pruned_response(lambda length: (length - end, length - start)) or chain_response(
+            lambda: Blockchain.serialize_blocks(blockchain.chain[::-1][start:end]))
+
+    # GET
+    @app.route('/blockchain/length')
+    def route_blockchain_length():
+        return chain_response(lambda: len(blockchain.chain))
+
+    # GET
+    @app.route('/blockchain/work')
+    def route_blockchain_work():
+        # Cumulative work of chain – peers synchronize from the one with most work
+        return chain_response(lambda: blockchain.tip_work())
+
+    # GET
+    @app.route('/blockchain/headers')
+    def route_blockchain_headers():
+        return chain_response(lambda: list(map(lambda block: block.to_header_json(), blockchain.chain)))
+
+    # QUERY
+    @app.route('/blockchain/blocks')
+    def route_blockchain_blocks():
+        start = int(request.args.get('start'))
+        end = int(request.args.get('end'))
+
+        return pruned_response(lambda length: (start, end)) or chain_response(
+            lambda: Blockchain.serialize_blocks(blockchain.chain[start:end]))
+
+    # QUERY
+    @app.route('/blockchain/stats')
+    def route_blockchain_stats():
+        window = min(int(request.args.get('window', DEFAULT_STATS_WINDOW)), MAX_STATS_WINDOW)
+        segments = min(int(request.args.get('segments', 10)), MAX_STATS_SEGMENTS)
+
+        return chain_response(lambda: blockchain.stats(window, segments))
+
+    # GET
+    @app.route('/blockchain/pruning')
+    def route_blockchain_pruning():
+        with state_lock.read():
+            return jsonify(blockchain.prune_stats())
+
+    # GET
+    @app.route('/blockchain/proof/<transaction_id>')
+    def route_blockchain_proof(transaction_id):
+        with state_lock.read():
+            location = blockchain.find_transaction(transaction_id)
+
+            if not location:
+                return jsonify({'error': f'Transaction {transaction_id} not found in chain'}), 404
+
+            height, position = location
+            block = blockchain.chain[height]
+
+            if block.version < MERKLE_BLOCK_VERSION:
+                return jsonify({'error': f'Block {block.hash} has no Merkle root (legacy format)'}), 409
+
+            if block.data is None:
+                return jsonify({'error': f'Data of Block {block.hash} pruned'}), 410
+
+            return jsonify({
+                'block_hash': block.hash,
+                'height': height,
+                'merkle_root': block.merkle_root,
+                'transaction': block.data[position],
+                'transaction_hash': leaf_hash(block.data[position]),
+                'proof': merkle_proof(block.data, position)
+            })
+
+    # POST
+    @app.route('/blockchain/proof/verify', methods=['POST'])
+    def route_blockchain_proof_verify():
+        proof_data = request.get_json()
+
+        with state_lock.read():
+            block = blockchain.find_block(proof_data['block_hash'])
+
+        if not block or block.version < MERKLE_BLOCK_VERSION:
+            return jsonify({'valid': False, 'error': 'Merkle Block not found in chain'})
+
+        return jsonify({'valid': verify_merkle_proof(proof_data['transaction'], proof_data['proof'], block.merkle_root)})
+
+    # GET
+    @app.route('/blockchain/mine')
+    def route_blockchain_mine():
+        # Waits for mining to finish – prefer /blockchain/mine/jobs
+        job = miner.start_job()
+        job.wait()
+
+        if not job.block:
+            return jsonify(job.to_json()), 409
+
+        return jsonify(job.block.to_json())
+
+    # POST
+    @app.route('/blockchain/mine/jobs', methods=['POST'])
+    def route_blockchain_mine_jobs():
+        return jsonify(miner.start_job().to_json()), 202
+
+    # QUERY
+    @app.route('/blockchain/mine/jobs/<job_id>')
+    def route_blockchain_mine_job(job_id):
+        job = miner.get_job(job_id)
+
+        if not job:
+            return jsonify({'error': f'Mining job {job_id} not found'}), 404
+
+        # Long-poll: wait (up to 'wait' seconds) for job to finish
+        wait = request.args.get('wait')
+        if wait:
+            job.wait(min(float(wait), 30))
+
+        return jsonify(job.to_json())
+
+    # DELETE
+    @app.route('/blockchain/mine/jobs/<job_id>', methods=['DELETE'])
+    def route_blockchain_mine_job_cancel(job_id):
+        job = miner.cancel_job(job_id)
+
+        if not job:
+            return jsonify({'error': f'Mining job {job_id} not found'}), 404
+
+        return jsonify(job.to_json())
+
+    # POST
+    @app.route('/wallet/transact', methods=['POST'])
+    def route_wallet_transact():
+        transaction_data = request.get_json()
+
+        with state_lock.write():
+            transaction = transaction_pool.existing_transaction(wallet.address)
+
+            # Existing transaction exists - modify it
+            if transaction:
+                transaction.update(wallet, transaction_data['recipient'],  transaction_data['amount'])
+            # Create new transaction
+            else:
+                transaction = Transaction(wallet, transaction_data['recipient'],  transaction_data['amount'])
+
+            # Pooled here – echo of own broadcast is dropped as already seen
+            transaction_pool.admit_transaction(transaction, blockchain)
+
+        pubsub.broadcast_transaction(transaction)
+
+        return jsonify(transaction.to_json())
+
+    # POST
+    @app.route('/wallet/transact/batch', methods=['POST'])
+    def route_wallet_transact_batch():
+        try:
+            # Malformed body (e.g. missing payments, recipient or amount) refused like an invalid batch
+            payments = [(payment['recipient'], payment['amount']) for payment in request.get_json()['payments']]
+
+            if len(payments) > MAX_BATCH_PAYMENTS:
+                return jsonify({'error': f'Batch exceeds {MAX_BATCH_PAYMENTS} payments'}), 413
+
+            with state_lock.write():
+                transaction = transaction_pool.existing_transaction(wallet.address)
+
+                # Existing transaction exists - add every recipient to it
+                if transaction:
+                    transaction.update_batch(wallet, payments)
+                # Create new transaction
+                else:
+                    transaction = Transaction.batch(wallet, payments)
+
+                transaction_pool.admit_transaction(transaction, blockchain)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 400
+
+        # One broadcast for the whole batch
+        pubsub.broadcast_transaction(transaction)
+
+        return jsonify(transaction.to_json())
+
+    # GET
+    @app.route('/transaction/<transaction_id>')
+    def route_transaction(transaction_id):
+        with state_lock.read():
+            location = blockchain.find_transaction(transaction_id)
+
+            if location:
+                height, position = location
+                block = blockchain.chain[height]
+
+                return jsonify({
+                    'status': 'confirmed',
+                    # Pruned Block – Transaction confirmed, body no longer kept
+                    'transaction': None if block.data is None else block.data[position],
+                    'block_hash': block.hash,
+                    'height': height,
+                    'position': position,
+                    'confirmations': len(blockchain.chain) - height
+                })
+
+            transaction = transaction_pool.transaction_map.get(transaction_id)
+
+            if transaction:
+                return jsonify({'status': 'pending', 'transaction': transaction.to_json(), 'confirmations': 0})
+
+        return jsonify({'error': f'Transaction {transaction_id} not found'}), 404
+
+    # GET
+    @app.route('/wallet/info')
+    def route_wallet_info():
+        with state_lock.read():
+            return jsonify({'address': wallet.address, 'balance': wallet.balance})
+
+    # QUERY
+    @app.route('/wallet/history/<address>')
+    def route_wallet_history(address):
+        offset = int(request.args.get('offset', 0))
+        limit = min(int(request.args.get('limit', DEFAULT_HISTORY_LIMIT)), MAX_HISTORY_LIMIT)
+
+        def history():
+            total, history = blockchain.address_history(address, offset, limit)
+            return {'address': address, 'total': total, 'offset': offset, 'limit': limit, 'history': history}
+
+        return chain_response(history)
+
+    # GET
+    @app.route('/known-addresses')
+    def route_known_addresses():
+        return chain_response(lambda: blockchain.known_addresses())
+
+    # GET
+    @app.route('/transactions')
+    def route_transactions():
+        with state_lock.read():
+            return Response(transaction_pool.serialize(), mimetype='application/json')
+
+    # GET
+    @app.route('/events')
+    def route_events():
+        # Server-sent events: block, tip and pool changes as they happen
+        try:
+            subscription = event_bus.subscribe()
+        except Exception as e:
+            return jsonify({'error': str(e)}), 503
+
+        with state_lock.read():
+            tip = chain_events.tip()
+
+        def stream():
+            try:
+                yield encode_event('tip', tip)
+
+                while True:
+                    # Comment line keeps idle stream open (and detects closed clients)
+                    yield subscription.get(EVENTS_KEEPALIVE_SECONDS) or b': keepalive\n\n'
+            finally:
+                event_bus.unsubscribe(subscription)
+
+        response = Response(stream(), mimetype='text/event-stream')
+        response.cache_control.no_cache = True
+        return response
+
+    # GET
+    @app.route('/metrics')
+    def route_metrics():
+        if not REGISTRY.enabled:
+            return jsonify({'error': 'Metrics disabled (set METRICS_ENABLED=True)'}), 404
+
+        return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+    # QUERY
+    @app.route('/debug/profile')
+    def route_debug_profile():
+        if not PROFILING_ENABLED:
+            return jsonify({'error': 'Profiling disabled (set PROFILING_ENABLED=True)'}), 404
+
+        seconds = float(request.args.get('seconds', 5))
+        top = int(request.args.get('top', 20))
+        memory = request.args.get('memory') == 'true'
+
+        try:
+            return jsonify(profiler.profile(seconds, top, memory))
+        except Exception as e:
+            return jsonify({'error': str(e)}), 409
+
+    # GET
+    @app.route('/health')
+    def route_health():
+        # No state lock – answers even while startup tasks hold it
+        return jsonify({
+            'status': 'ok',
+            'uptime_s': (time_ns() - started_at) / SECONDS,
+            'pubsub_connected': pubsub.connected,
+            'startup': startup.to_json()
+        })
+
+    if start_background:
+        startup.start()
+
+    return app
@@ -0,0 +1,19 @@
+import os
+from random import randint
+from backend.app import ROOT_PORT, create_app
+
+
+PORT = ROOT_PORT
+
+# Run peers who can make requests
+if os.environ.get('PEER') == 'True':
+    PORT = randint(5001, 6000)
+
+# Fixed port (e.g. backend.scripts.benchmark_startup)
+if os.environ.get('PORT'):
+    PORT = int(os.environ['PORT'])
+
+app = create_app()
+
+# Threaded serving – read endpoints run in parallel under state_lock
+app.run(port=PORT, threaded=True)
@@ -0,0 +1,213 @@
+import os
+import json
+from collections import deque
+from random import randint
+from threading import Lock, Thread
+from time import time_ns
+from backend.blockchain.blockchain import Blockchain
+from backend.config import SECONDS
+
+
+# Broadcasts kept while PubSub is still connecting (oldest dropped first)
+MAX_QUEUED_BROADCASTS = 1000
+
+TASK_STATUS = {
+    'PENDING': 'pending',
+    'RUNNING': 'running',
+    'DONE': 'done',
+    'SKIPPED': 'skipped',
+    'FAILED': 'failed'
+}
+
+class BackgroundPubSub:
+    """
+    Stand-in for PubSub until PubNub is connected
+    - Broadcasts made before connect are queued and sent once connected
+    - pubnub is only imported by connect (keeps app import and startup fast)
+    """
+    def __init__(self, blockchain, transaction_pool, lock):
+        """
+        Initialize BackgroundPubSub (not connected)
+        :param lock: <ReadWriteLock> Lock guarding Blockchain and TransactionPool
+        """
+        self.blockchain = blockchain
+        self.transaction_pool = transaction_pool
+        self.lock = lock
+        self.pubsub = None
+        self.queue = deque(maxlen=MAX_QUEUED_BROADCASTS)
+        self.queue_lock = Lock()
+
+    @property
+    def connected(self):
+        return self.pubsub is not None
+
+    def connect(self):
+        """
+        Connect to PubNub and send queued broadcasts
+        :return: None
+        """
+        from backend.pubsub import PubSub
+
+        pubsub = PubSub(self.blockchain, self.transaction_pool, self.lock)
+
+        with self.queue_lock:
+            while self.queue:
+                method, item = self.queue.popleft()
+                getattr(pubsub, method)(item)
+
+            self.pubsub = pubsub
+
+    def broadcast(self, method, item):
+        """
+        Send broadcast now if connected, queue it if not
+        :param method: <str> PubSub broadcast method
+        :param item: <Block / Transaction> Item broadcast
+        :return: None
+        """
+        with self.queue_lock:
+            if self.pubsub is None:
+                self.queue.append((method, item))
+                return
+
+        getattr(self.pubsub, method)(item)
+
+    def broadcast_block(self, block):
+        self.broadcast('broadcast_block', block)
+
+    def broadcast_transaction(self, transaction):
+        self.broadcast('broadcast_transaction', transaction)
+
+
+class StartupTasks:
+    """
+    Node subsystems started after HTTP port is open (one background thread)
+    - Tasks run in order; a failing task does not stop the ones after it
+    - Status of every task is reported by /health
+    """
+    def __init__(self):
+        """
+        Initialize StartupTasks with no tasks
+        """
+        self.tasks = []
+        self.status = {}
+        self.thread = None
+
+    def add(self, name, task):
+        """
+        Add task run at startup
+        :param name: <str> Task name
+        :param task: <callable> Returns False if task skipped
+        :return: None
+        """
+        self.tasks.append((name, task))
+        self.status[name] = {'status': TASK_STATUS['PENDING']}
+
+    def run(self):
+        """
+        Run every task in order, recording status and duration
+        :return: None
+        """
+        for name, task in self.tasks:
+            self.status[name] = {'status': TASK_STATUS['RUNNING']}
+            start_time = time_ns()
+
+            try:
+                status = TASK_STATUS['SKIPPED'] if task() is False else TASK_STATUS['DONE']
+                self.status[name] = {'status': status}
+            except Exception as e:
+                print(f'\n-- Startup task {name} failed: {e}')
+                self.status[name] = {'status': TASK_STATUS['FAILED'], 'error': str(e)}
+
+            self.status[name]['seconds'] = (time_ns() - start_time) / SECONDS
+
+    def start(self):
+        """
+        Run tasks in background thread
+        :return: <Thread> Started thread
+        """
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def to_json(self):
+        return {name: dict(status) for name, status in self.status.items()}
+
+
+def connect_pubsub(pubsub):
+    """
+    Connect PubSub (skipped without PubNub keys)
+    :param pubsub: <BackgroundPubSub> PubSub of node
+    :return: <bool> False if skipped
+    """
+    if not os.environ.get('PUBNUB_SUBSCRIBE_KEY'):
+        return False
+
+    pubsub.connect()
+
+def sync_peers(blockchain, transaction_pool, lock, peer_urls):
+    """
+    Headers-first synchronization with known peers (PEER=True)
+    - Requests are not blocked while downloading – lock only held to switch chain
+    :param blockchain: <Blockchain> Local Blockchain
+    :param transaction_pool: <TransactionPool> Pool kept in step with switched chain
+    :param lock: <ReadWriteLock> Lock guarding Blockchain and TransactionPool
+    :param peer_urls: <list> Base URLs of peers
+    :return: <bool> False if skipped
+    """
+    if os.environ.get('PEER') != 'True':
+        return False
+
+    from backend.sync import SyncClient
+
+    sync_client = SyncClient(peer_urls)
+
+    try:
+        removed, added = sync_client.synchronize(blockchain, lock)
+    finally:
+        sync_client.close()
+
+    with lock.write():
+        transaction_pool.update_for_reorg(removed, added)
+        transaction_pool.clear_blockchain_transactions(blockchain)
+
+    print('\n-- Successfully synchronized the local chain')
+
+def load_chain_file(blockchain, lock):
+    """
+    Load chain generated by backend.scripts.generate_chain (CHAIN_FILE)
+    :return: <bool> False if skipped
+    """
+    if not os.environ.get('CHAIN_FILE'):
+        return False
+
+    with open(os.environ['CHAIN_FILE']) as chain_file:
+        chain = Blockchain.from_json(json.load(chain_file)).chain
+
+    with lock.write():
+        blockchain.replace_chain(chain)
+
+def seed_data(blockchain, transaction_pool, lock):
+    """
+    Seed Blockchain and TransactionPool with Transactions (SEED_DATA=True)
+    :return: <bool> False if skipped
+    """
+    if os.environ.get('SEED_DATA') != 'True':
+        return False
+
+    from backend.wallet.wallet import Wallet
+    from backend.wallet.transaction import Transaction
+
+    for i in range(10):
+        data = [
+            Transaction(Wallet(), Wallet().address, randint(2, 50)).to_json(),
+            Transaction(Wallet(), Wallet().address, randint(2, 50)).to_json()
+        ]
+
+        with lock.write():
+            blockchain.add_block(data)
+
+    for i in range(3):
+        transaction = Transaction(Wallet(), Wallet().address, randint(2, 50))
+
+        with lock.write():
+            transaction_pool.set_transaction(transaction)
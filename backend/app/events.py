@@ -0,0 +1,86 @@
+from json import dumps
+from threading import Lock
+
+
+# Blocks pushed one by one – larger jumps (e.g. peer sync) are announced by a single 'tip' event
+MAX_PUSHED_BLOCKS = 20
+
+class ChainEvents:
+    """
+    Publishes changes of Blockchain and TransactionPool to EventBus as they happen
+    - Checked after every exclusive section of state lock (O(1) when nothing changed)
+
+    Events:
+        - block: Block appended to main chain (Block JSON)
+        - tip: Main chain tip changed (height, hash, length; reset if Blocks were not pushed one by one)
+        - pool: TransactionPool changed (Transactions added or updated, ids of removed Transactions) –
+          cost follows number of changes, not pool size
+    """
+    def __init__(self, blockchain, transaction_pool, lock, bus):
+        """
+        Initialize ChainEvents and start listening to state lock
+        :param lock: <ReadWriteLock> Lock guarding Blockchain and TransactionPool
+        :param bus: <EventBus> EventBus events are published to
+        """
+        self.blockchain = blockchain
+        self.transaction_pool = transaction_pool
+        self.lock = lock
+        self.bus = bus
+        self.publish_lock = Lock()
+        self.length = len(blockchain.chain)
+        self.tip_hash = blockchain.chain[-1].hash
+        self.pool_version = transaction_pool.version
+
+        lock.add_release_listener(self.publish_changes)
+
+    def tip(self, reset=False):
+        """
+        Current main chain tip (call under state lock)
+        :param reset: <bool> Whether clients must refetch chain data
+        :return: <dict> Tip event data
+        """
+        chain = self.blockchain.chain
+        return {'height': len(chain) - 1, 'hash': chain[-1].hash, 'length': len(chain), 'reset': reset}
+
+    def publish_changes(self):
+        """
+        Publish Blocks, tip and pool changed since last call
+        :return: None
+        """
+        with self.publish_lock:
+            with self.lock.read():
+                chain = self.blockchain.chain
+                tip_changed = chain[-1].hash != self.tip_hash
+                pool_changed = self.transaction_pool.version != self.pool_version
+                blocks = []
+                tip = None
+                pool = None
+
+                if tip_changed:
+                    appended = len(chain) > self.length and chain[self.length - 1].hash == self.tip_hash
+
+                    if appended and len(chain) - self.length <= MAX_PUSHED_BLOCKS and self.bus.has_subscribers():
+                        blocks = [block.to_json() for block in chain[self.length:]]
+
+                    tip = self.tip(reset=not appended or len(chain) - self.length > MAX_PUSHED_BLOCKS)
+                    self.length = len(chain)
+                    self.tip_hash = chain[-1].hash
+
+                if pool_changed:
+                    self.pool_version = self.transaction_pool.version
+                    # Drained even without subscribers, so changes do not pile up
+                    updated, removed = self.transaction_pool.drain_changes()
+
+                    if self.bus.has_subscribers():
+                        # Reuses each Transaction's cached encoding
+                        pool = (b'{"updated": [' + b', '.join(map(lambda transaction: transaction.serialize(), updated))
+                                + b'], "removed": ' + dumps(removed).encode('utf-8') + b'}')
+
+            for block in blocks:
+                self.bus.publish('block', block)
+
+            if tip:
+                self.bus.publish('tip', tip)
+
+            if pool is not None:
+                self.bus.publish('pool', pool)
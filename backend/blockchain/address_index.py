@@ -0,0 +1,89 @@
+from backend.config import MINING_REWARD_INPUT
+
+
+class AddressIndex:
+    """
+    Inverted index of main chain: address -> (Block height, Transaction id) postings
+    - Postings of each address are in chain order
+    - Blocks are added and removed at the end of the chain only (append / reorg)
+    """
+    def __init__(self):
+        """
+        Initialize AddressIndex with no Blocks indexed
+        """
+        self.postings = {}
+
+    @staticmethod
+    def transaction_addresses(transaction):
+        """
+        Addresses taking part in Transaction (sender and recipients)
+        :param transaction: <dict> Transaction in JSON format
+        :return: <list> Addresses (each once)
+        """
+        addresses = list(transaction['output'])
+
+        if transaction['input'] != MINING_REWARD_INPUT and transaction['input']['address'] not in addresses:
+            addresses.append(transaction['input']['address'])
+
+        return addresses
+
+    @staticmethod
+    def block_transactions(block):
+        """
+        Transactions of Block (Block data other than a list of Transactions has none)
+        :param block: <Block> Block
+        :return: <list> Transactions in JSON format
+        """
+        if not isinstance(block.data, list):
+            return []
+
+        return [transaction for transaction in block.data if isinstance(transaction, dict)]
+
+    def add_block(self, block, height):
+        """
+        Add postings of Block appended to main chain
+        :param block: <Block> Block
+        :param height: <int> Height of Block
+        :return: None
+        """
+        for transaction in AddressIndex.block_transactions(block):
+            for address in AddressIndex.transaction_addresses(transaction):
+                self.postings.setdefault(address, []).append((height, transaction['id']))
+
+    def remove_block(self, block, height):
+        """
+        Remove postings of Block removed from end of main chain
+        :param block: <Block> Block
+        :param height: <int> Height of Block
+        :return: None
+        """
+        for transaction in AddressIndex.block_transactions(block):
+            for address in AddressIndex.transaction_addresses(transaction):
+                postings = self.postings.get(address)
+
+                while postings and postings[-1][0] == height:
+                    postings.pop()
+
+                if postings == []:
+                    del self.postings[address]
+
+    def history(self, address, offset=0, limit=None):
+        """
+        Postings of address, most recent first
+        :param address: <str> Address
+        :param offset: <int> Postings skipped
+        :param limit: <int> Maximum postings returned (None – all)
+        :return: <tuple> (<int> total postings, <list> (Block height, Transaction id) page)
+        """
+        postings = self.postings.get(address, [])
+        end = len(postings) - offset
+        start = 0 if limit is None else max(end - limit, 0)
+
+        return len(postings), postings[start:max(end, 0)][::-1]
+
+    def addresses(self):
+        """
+        Every address seen in main chain
+        :return: <list> Addresses
+        """
+        return list(self.postings)
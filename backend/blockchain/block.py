@@ -1,7 +1,12 @@
-from time import time_ns
-from backend.util.crypto_hash import crypto_hash
+from copy import deepcopy
+from time import time_ns, perf_counter
+from json import dumps
+from backend.util.crypto_hash import crypto_hash, pre_encode
 from backend.util.hex_to_binary import hex_to_binary
-from backend.config import MINE_RATE
+from backend.util.merkle import leaf_hash, merkle_root, merkle_root_of_hashes
+from backend.util.memory import deep_sizeof
+from backend.util.metrics import REGISTRY
+from backend.config import MINE_RATE, BLOCK_VERSION, LEGACY_BLOCK_VERSION, MERKLE_BLOCK_VERSION
 
 
 # Data to be included in genesis Block
@@ -14,11 +19,25 @@ GENESIS_DATA = {
     'nonce': 'genesis_nonce'
 }
 
+# Attributes serialized for every Block (in order)
+BLOCK_FIELDS = ('timestamp', 'prev_hash', 'hash', 'data', 'difficulty', 'nonce')
+
+# Attributes serialized for Merkle Blocks (in order)
+MERKLE_BLOCK_FIELDS = BLOCK_FIELDS + ('version', 'merkle_root')
+
+# Number of nonces tried between checks of mining interrupt
+MINE_INTERRUPT_INTERVAL = 1000
+
+MINE_ATTEMPTS = REGISTRY.counter('mine_attempts_total', 'Hashes computed while mining Blocks')
+MINE_SECONDS = REGISTRY.histogram('mine_block_seconds', 'Seconds spent mining each Block', 'result')
+MINE_HASHRATE = REGISTRY.gauge('mine_hashrate', 'Hashes per second while mining last Block')
+
 class Block:
     """
     Unit of Storage
     """
-    def __init__(self, timestamp, prev_hash, hash, data, difficulty, nonce):
+    def __init__(self, timestamp, prev_hash, hash, data, difficulty, nonce,
+                 version=LEGACY_BLOCK_VERSION, merkle_root=None):
         """
         Initializes a Block
         :param timestamp: <int> Current timestamps (ns since Epoch)
@@ -27,6 +46,8 @@ class Block:
         :param data: <any> Data stored in Block
         :param difficulty: <int> Number of leading 0's required in (binary representation of) hash
         :param nonce: <int> Arbitrary number to calculate hash
+        :param version: <int> Block format version (see config)
+        :param merkle_root: <str> Merkle root of data (Merkle Blocks only)
         """
         self.timestamp = timestamp
         self.prev_hash = prev_hash
@@ -34,6 +55,18 @@ class Block:
         self.data = data
         self.difficulty = difficulty
         self.nonce = nonce
+        self.version = version
+        self.merkle_root = merkle_root
+
+    def __setattr__(self, name, value):
+        """
+        Set attribute – changing any Block field drops cached serialization and hash
+        """
+        super().__setattr__(name, value)
+
+        if not name.startswith('_'):
+            super().__setattr__('_serialized', None)
+            super().__setattr__('_reconstructed_hash', None)
 
     def __repr__(self):
         """
@@ -53,14 +86,78 @@ class Block:
         """
         Define what it means for Blocks to be equal
         """
-        return self.__dict__ == other_block.__dict__
+        return self.to_json() == other_block.to_json()
 
     def to_json(self):
         """
         Serialize Block into dictionary of attributes
         :return: <dict> Block as dictionary
         """
-        return self.__dict__
+        return {field: getattr(self, field) for field in self.fields()}
+
+    def to_header_json(self):
+        """
+        Serialize Block header (every attribute except data)
+        :return: <dict> Block header as dictionary
+        """
+        return {field: getattr(self, field) for field in self.fields() if field != 'data'}
+
+    def fields(self):
+        """
+        Attributes serialized for Block format version
+        :return: <tuple> Attribute names (in order)
+        """
+        return MERKLE_BLOCK_FIELDS if self.version >= MERKLE_BLOCK_VERSION else BLOCK_FIELDS
+
+    def serialize(self):
+        """
+        Canonical JSON encoding of Block
+        Computed once and reused – Blocks are not modified once added to the chain
+        :return: <bytes> UTF-8 encoded JSON of Block
+        """
+        if self._serialized is None:
+            self._serialized = dumps(self.to_json()).encode('utf-8')
+
+        return self._serialized
+
+    def prune(self):
+        """
+        Drop data of Block, keeping header (pruned nodes)
+        Block can no longer be served in full or have its hash re-checked
+        :return: <int> Approximate bytes reclaimed (data and cached serialization)
+        """
+        reclaimed = deep_sizeof(self.data)
+
+        if self._serialized is not None:
+            reclaimed += deep_sizeof(self._serialized)
+
+        self.data = None
+        return reclaimed
+
+    def reconstructed_hash(self):
+        """
+        Hash of Block fields (what Block hash must equal)
+        Computed once and reused – Blocks are not modified once added to the chain
+        :return: <str> Hash string (hexadecimal representation)
+        """
+        if self._reconstructed_hash is None:
+            if self.version >= MERKLE_BLOCK_VERSION:
+                self._reconstructed_hash = Block.header_hash(
+                    self.version,
+                    self.timestamp,
+                    self.prev_hash,
+                    self.merkle_root,
+                    self.difficulty,
+                    self.nonce)
+            else:
+                self._reconstructed_hash = crypto_hash(
+                    self.timestamp,
+                    self.prev_hash,
+                    self.data,
+                    self.difficulty,
+                    self.nonce)
+
+        return self._reconstructed_hash
 
     @staticmethod
     def genesis():
@@ -80,62 +177,151 @@ class Block:
         return Block(**block_json)
 
     @staticmethod
-    def mine_block(prev_block, data):
+    def from_header_json(header_json):
+        """
+        Deserialize a JSON representation of a Block header into Block without data
+        :param header_json: <json> JSON representation of Block header
+        :return: <Block> Restored Block (data is None)
+        """
+        return Block(data=None, **header_json)
+
+    @staticmethod
+    def mine_block(prev_block, data, interrupt=None, version=BLOCK_VERSION, clock=time_ns):
         """
         Mine a Block until hash found meeting 'Proof of Work' difficulty requirement
         :param prev_block: <Block> Previous Block in Blockchain
-        :param data: <any> Data to be stored in new Block
-        :return: <Block> New Block to be added to Blockchain
+        :param data: <any> Data to be stored in new Block (<list> for Merkle Blocks)
+        :param interrupt: <callable> Optional check (called periodically) returning True to stop mining
+        :param version: <int> Block format version (see config)
+        :param clock: <callable> Source of Block timestamps (ns since Epoch)
+        :return: <Block / None> New Block to be added to Blockchain, None if interrupted
         """
-        timestamp = time_ns()
+        start_time = perf_counter() if REGISTRY.enabled else None
+        # Block owns its data – caller changing its copy later (e.g. updating a pool Transaction)
+        # cannot make Block data disagree with hash computed here
+        data = deepcopy(data)
+        timestamp = clock()
         prev_hash = prev_block.hash
         difficulty = Block.adjust_difficulty(prev_block, timestamp)
         nonce = 0
-        hash = crypto_hash(timestamp, prev_hash, data, difficulty, nonce)
+        # Fields fixed while mining – encode once instead of every attempt
+        encoded_prev_hash = pre_encode(prev_hash)
+
+        # Merkle Block – only fixed-size header hashed
+        if version >= MERKLE_BLOCK_VERSION:
+            if not isinstance(data, list):
+                raise Exception('Merkle Block data must be a list')
+
+            root = merkle_root(data)
+            encoded_version = pre_encode(version)
+            encoded_root = pre_encode(root)
+
+            def attempt_hash(timestamp, difficulty, nonce):
+                return Block.header_hash(encoded_version, timestamp, encoded_prev_hash, encoded_root, difficulty, nonce)
+        # Legacy Block – all data hashed
+        else:
+            root = None
+            encoded_data = pre_encode(data)
+
+            def attempt_hash(timestamp, difficulty, nonce):
+                return crypto_hash(timestamp, encoded_prev_hash, encoded_data, difficulty, nonce)
+
+        hash = attempt_hash(timestamp, difficulty, nonce)
 
         while hex_to_binary(hash)[0:difficulty] != '0' * difficulty:
             nonce += 1
-            timestamp = time_ns()
+
+            if interrupt and nonce % MINE_INTERRUPT_INTERVAL == 0 and interrupt():
+                Block.record_mining(start_time, nonce, 'interrupted')
+                return None
+
+            timestamp = clock()
             difficulty = Block.adjust_difficulty(prev_block, timestamp)
-            hash = crypto_hash(timestamp, prev_hash, data, difficulty, nonce)
-            
+            hash = attempt_hash(timestamp, difficulty, nonce)
 
-        return Block(timestamp, prev_hash, hash, data, difficulty, nonce)
+        block = Block(timestamp, prev_hash, hash, data, difficulty, nonce, version, root)
+        # Hash just computed from Block fields (of Block's own copy of data) – validation need not recompute it
+        block._reconstructed_hash = hash
+        Block.record_mining(start_time, nonce + 1, 'mined')
+        return block
 
     @staticmethod
-    def adjust_difficulty(prev_block, new_timestamp):
+    def record_mining(start_time, attempts, result):
+        """
+        Record mining metrics once per Block (never inside nonce loop)
+        :param start_time: <float> perf_counter when mining started (None – metrics disabled)
+        :param attempts: <int> Hashes computed
+        :param result: <str> 'mined' or 'interrupted'
+        :return: None
+        """
+        if start_time is None:
+            return
+
+        seconds = perf_counter() - start_time
+        MINE_ATTEMPTS.inc(attempts)
+        MINE_SECONDS.observe(seconds, result)
+
+        if seconds > 0:
+            MINE_HASHRATE.set(attempts / seconds)
+
+    @staticmethod
+    def header_hash(version, timestamp, prev_hash, merkle_root, difficulty, nonce):
+        """
+        Hash of Merkle Block header
+        :param version: <int> Block format version
+        :param timestamp: <int> Block timestamp (ns since Epoch)
+        :param prev_hash: <str> Hash of previous Block
+        :param merkle_root: <str> Merkle root of Block data
+        :param difficulty: <int> Block difficulty
+        :param nonce: <int> Block nonce
+        :return: <str> Hash string (hexadecimal representation)
+        """
+        return crypto_hash(version, timestamp, prev_hash, merkle_root, difficulty, nonce)
+
+    @staticmethod
+    def adjust_difficulty(prev_block, new_timestamp, mine_rate=MINE_RATE):
         """
         Calculate difficulty adjustment according to mine rate
         :param prev_block: <Block> Previous Block in Blockchain
         :param new_timestamp: <int> Timestamp of Block to be mined
+        :param mine_rate: <int> Target time between Blocks (ns) – overridden by simulations only
         :return: <int> Adjusted difficulty
         """
         # Block mined too slowly
-        if (new_timestamp - prev_block.timestamp) < MINE_RATE:
+        if (new_timestamp - prev_block.timestamp) < mine_rate:
             return prev_block.difficulty + 1
 
         # Block mined too quickly
         return max(prev_block.difficulty - 1, 1)
 
     @staticmethod
-    def is_valid_block(prev_block, block):
+    def is_valid_link(prev_block, block):
         """
-        Validate Block
-        
+        Validate how Block links to previous Block
+
         Requirements:
             - Block has correct prev_hash reference
-            - Block must meet 'Proof of Work' requirement
             - Difficulty must adjust by 1
-            - Block hash must be valid combination of Block fields
-        
+
         :param prev_block: <Block> Previous Block in Blockchain
-        :param block: <Block> Block being validated
+        :param block: <Block> Block (or header) being validated
         :return: None
-        :raises Exception: Throw if any field of Block incorrect
+        :raises Exception: Throw if Block does not link to previous Block
         """
         if block.prev_hash != prev_block.hash:
             raise Exception('Block prev_hash incorrect')
 
+        if abs(prev_block.difficulty - block.difficulty) > 1:
+            raise Exception('Block difficulty must only adjust by 1')
+
+    @staticmethod
+    def is_valid_proof_of_work(block):
+        """
+        Validate Block hash meets 'Proof of Work' requirement of its difficulty
+        :param block: <Block> Block (or header) being validated
+        :return: None
+        :raises Exception: Throw if hash malformed or 'Proof of Work' not met
+        """
         try:
             int(block.hash, 16)
         except Exception as e:
@@ -144,19 +330,73 @@ class Block:
         if hex_to_binary(block.hash)[0:block.difficulty] != '0' * block.difficulty:
             raise Exception("'Proof of Work' requirement not met")
 
-        if abs(prev_block.difficulty - block.difficulty) > 1:
-            raise Exception('Block difficulty must only adjust by 1')
+    @staticmethod
+    def is_valid_contents(block):
+        """
+        Validate Block hash against Block fields
+
+        Requirements:
+            - Merkle Blocks: data must not repeat an item, Merkle root must commit to Block data
+            - Block hash must be valid combination of Block fields (header fields for Merkle Blocks)
+
+        :param block: <Block> Block being validated
+        :return: None
+        :raises Exception: Throw if Block hash does not match Block fields
+        """
+        if block.version >= MERKLE_BLOCK_VERSION:
+            if not isinstance(block.data, list):
+                raise Exception('Block merkle_root incorrect')
+
+            leaf_hashes = list(map(leaf_hash, block.data))
 
-        reconstructed_hash = crypto_hash(
-            block.timestamp, 
-            block.prev_hash, 
-            block.data, 
-            block.difficulty,
-            block.nonce)
+            # Repeated last leaves keep Merkle root (odd levels pair last hash with itself)
+            if len(set(leaf_hashes)) != len(leaf_hashes):
+                raise Exception('Block data has duplicate items')
 
-        if block.hash != reconstructed_hash:
+            if block.merkle_root != merkle_root_of_hashes(leaf_hashes):
+                raise Exception('Block merkle_root incorrect')
+
+        if block.hash != block.reconstructed_hash():
+            raise Exception('Block hash incorrect')
+
+    @staticmethod
+    def is_valid_header(prev_block, block):
+        """
+        Validate Block header (does not require Block data)
+
+        Requirements:
+            - Block must link to previous Block (see Block.is_valid_link)
+            - Block must meet 'Proof of Work' requirement
+            - Merkle Blocks: hash must be hash of header fields, so 'Proof of Work' is verified
+              (legacy Block hash covers data – only checked with data, see Block.is_valid_contents)
+
+        :param prev_block: <Block> Previous Block in Blockchain
+        :param block: <Block> Block (or header) being validated
+        :return: None
+        :raises Exception: Throw if any header field of Block incorrect
+        """
+        Block.is_valid_link(prev_block, block)
+        Block.is_valid_proof_of_work(block)
+
+        if block.version >= MERKLE_BLOCK_VERSION and block.hash != block.reconstructed_hash():
             raise Exception('Block hash incorrect')
 
+    @staticmethod
+    def is_valid_block(prev_block, block):
+        """
+        Validate Block
+        
+        Requirements:
+            - Block header must be valid (see Block.is_valid_header)
+            - Block hash must match Block fields (see Block.is_valid_contents)
+        
+        :param prev_block: <Block> Previous Block in Blockchain
+        :param block: <Block> Block being validated
+        :return: None
+        :raises Exception: Throw if any field of Block incorrect
+        """
+        Block.is_valid_header(prev_block, block)
+        Block.is_valid_contents(block)
 
 # -- TESTING AND EXPERIMENTATION -- #
 
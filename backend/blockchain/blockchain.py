@@ -1,19 +1,208 @@
+from threading import RLock
 from backend.blockchain.block import Block
+from backend.blockchain.ledger import Ledger
+from backend.blockchain.address_index import AddressIndex
+from backend.blockchain.header_store import HeaderStore
 from backend.wallet.transaction import Transaction
-from backend.config import MINING_REWARD_INPUT
-from backend.wallet.wallet import Wallet
+from backend.config import MINING_REWARD_INPUT, VALIDATION_PROCESSES, PARALLEL_VALIDATION_MIN_BLOCKS
+from backend.util.metrics import REGISTRY, timed
 
 
+CHAIN_REPLACEMENTS = REGISTRY.counter('chain_replacements_total', 'Incoming chains considered', 'result')
+REPLACE_CHAIN_SECONDS = REGISTRY.histogram('replace_chain_seconds', 'Seconds spent in replace_chain')
+CHAIN_VALIDATION_SECONDS = REGISTRY.histogram('chain_validation_seconds', 'Seconds spent validating chains')
+
 class Blockchain:
     """
     Public ledger of transactions
+    - Keeps a hash-indexed tree of every known Block (main chain and competing forks)
+    - Main chain is the branch with most cumulative work
+    - Ledger (balances) and AddressIndex follow main chain, rolling back only Blocks after a fork point
     """
-    def __init__(self):
+    def __init__(self, prune_depth=0):
         """
         Initialize Blockchain with only genesis Block
+        :param prune_depth: <int> Main chain Blocks (from tip) whose data is kept – older Blocks keep
+                            header only, balances come from Ledger (0 – keep data of every Block)
         """
+        # Guards Block tree and Ledger while they catch up with chain
+        self.index_lock = RLock()
+        self.prune_depth = prune_depth
+        # Approximate bytes freed by pruning Block data
+        self.reclaimed_bytes = 0
         self.chain = [Block.genesis()]
 
+    @property
+    def chain(self):
+        """
+        Main chain (genesis first)
+        :return: <list> Blocks
+        """
+        return self._chain
+
+    @chain.setter
+    def chain(self, chain):
+        """
+        Set main chain – Block tree and Ledger rebuilt on next use
+        :param chain: <list> Blocks (genesis first)
+        """
+        with self.index_lock:
+            self._chain = chain
+            self.reset_index()
+            self.prune()
+
+    def reset_index(self):
+        """
+        Drop Block tree and Ledger (rebuilt from chain on next use)
+        :return: None
+        """
+        # Block hash -> (Block, height, cumulative work) for every known Block
+        self.tree = {}
+        self.ledger = Ledger()
+        self.address_index = AddressIndex()
+        self.header_store = HeaderStore()
+        # Undo record of every main chain Block (by height)
+        self.undo_records = []
+        # Main chain Blocks already in Block tree and Ledger
+        self.indexed_length = 0
+        self.indexed_tip_hash = None
+        # Main chain Blocks below this height (genesis excluded) have no data
+        self.pruned_height = 0
+
+    def sync_index(self):
+        """
+        Bring Block tree, Ledger, AddressIndex and HeaderStore up to date with chain
+        - Blocks appended directly to chain are indexed incrementally
+        - Chain changed any other way – everything rebuilt
+        :return: None
+        """
+        with self.index_lock:
+            chain = self._chain
+
+            if self.indexed_length and (
+                    self.indexed_length > len(chain)
+                    or chain[self.indexed_length - 1].hash != self.indexed_tip_hash):
+                # Ledger of pruned chain cannot be rebuilt from Blocks
+                if self.pruned_height:
+                    raise Exception('Cannot rebuild index – Block data pruned')
+
+                self.reset_index()
+
+            for height in range(self.indexed_length, len(chain)):
+                self.index_block(chain[height], height)
+                self.connect_block(chain[height], height)
+
+            self.indexed_length = len(chain)
+            self.indexed_tip_hash = chain[-1].hash
+
+    def index_block(self, block, height):
+        """
+        Add Block to Block tree
+        :param block: <Block> Block whose parent is already in tree (or genesis)
+        :param height: <int> Height of Block
+        :return: <int> Cumulative work of Block
+        """
+        parent_work = self.tree[block.prev_hash][2] if height and block.prev_hash in self.tree else 0
+        work = parent_work + Blockchain.block_work(block)
+        self.tree[block.hash] = (block, height, work)
+        return work
+
+    def connect_block(self, block, height):
+        """
+        Apply Block added to end of main chain to Ledger, AddressIndex and HeaderStore
+        :param block: <Block> Block
+        :param height: <int> Height of Block
+        :return: None
+        """
+        self.undo_records.append(self.ledger.apply_block(block, height))
+        self.address_index.add_block(block, height)
+        self.header_store.append(block)
+
+    def disconnect_block(self, block, height):
+        """
+        Roll back Block removed from end of main chain
+        :param block: <Block> Block
+        :param height: <int> Height of Block
+        :return: None
+        """
+        self.ledger.undo_block(self.undo_records.pop())
+        self.address_index.remove_block(block, height)
+        self.header_store.pop()
+
+    def prune(self):
+        """
+        Drop data of main chain Blocks more than prune_depth Blocks below tip
+        - Headers, Ledger, AddressIndex and HeaderStore are kept, so balances are still served
+          and new Blocks still validated
+        - Reorgs cannot reach below pruned height
+        :return: None
+        """
+        if not self.prune_depth:
+            return
+
+        with self.index_lock:
+            self.sync_index()
+            end = len(self._chain) - self.prune_depth
+
+            for height in range(max(self.pruned_height, 1), end):
+                self.reclaimed_bytes += self._chain[height].prune()
+                # Pruned Blocks are never disconnected
+                self.undo_records[height] = None
+
+            self.pruned_height = max(self.pruned_height, end)
+
+    def is_pruned(self, start, end):
+        """
+        Check whether any main chain Block in height range has no data
+        :param start: <int> First height
+        :param end: <int> Height after last
+        :return: <bool> True if range reaches pruned Blocks
+        """
+        with self.index_lock:
+            self.sync_index()
+            return max(start, 1) < min(end, self.pruned_height)
+
+    def prune_stats(self):
+        """
+        Pruning state of Blockchain
+        :return: <dict> Prune depth, pruned height, pruned Blocks and approximate bytes reclaimed
+        """
+        with self.index_lock:
+            self.sync_index()
+            return {
+                'prune_depth': self.prune_depth,
+                'pruned_height': self.pruned_height,
+                'pruned_blocks': max(self.pruned_height - 1, 0),
+                'reclaimed_bytes': self.reclaimed_bytes
+            }
+
+    def is_main_chain(self, block_hash):
+        """
+        Check whether Block is on main chain
+        :param block_hash: <str> Hash of Block in Block tree
+        :return: <bool> True if on main chain, False if on a competing fork
+        """
+        block, height, work = self.tree[block_hash]
+        return height < len(self._chain) and self._chain[height].hash == block_hash
+
+    def tip_work(self):
+        """
+        Cumulative work of main chain
+        :return: <int> Work
+        """
+        self.sync_index()
+        return self.tree[self._chain[-1].hash][2]
+
+    def balance(self, address):
+        """
+        Balance of address at end of main chain
+        :param address: <str> Address owning balance
+        :return: <float> Balance
+        """
+        with self.index_lock:
+            self.sync_index()
+            return self.ledger.balance(address)
+
     def __repr__(self):
         """
         String representation of Blockchain
@@ -28,29 +217,249 @@ class Blockchain:
         :return: None
         """
         self.chain.append(Block.mine_block(self.chain[-1], data))
+        self.prune()
+
+    def append_block(self, block):
+        """
+        Add already mined Block to end of Blockchain
+        :param block: <Block> Block mined on top of current last Block
+        :return: None
+        :raises Exception: Throw if Block does not extend end of Blockchain
+        """
+        try:
+            Block.is_valid_block(self.chain[-1], block)
+        except Exception as e:
+            raise Exception(f'Cannot append – Block does not extend chain: {e}')
+
+        # Indexed on next use (right away when pruning)
+        self.chain.append(block)
+        self.prune()
 
-    def replace_chain(self, chain):
+    def receive_block(self, block):
+        """
+        Add Block received from network to Block tree, switching main chain
+        if Block's branch now has most cumulative work
+
+        :param block: <Block> Block extending main chain or any known fork
+        :return: <tuple> (<list> Blocks removed from main chain, <list> Blocks added to main chain)
+        :raises Exception: Throw if Block already known, parent unknown or Block invalid
+        """
+        with self.index_lock:
+            self.sync_index()
+
+            if block.hash in self.tree:
+                raise Exception(f'Cannot add – Block {block.hash} already known')
+
+            if block.prev_hash not in self.tree:
+                raise Exception(f'Cannot add – Parent of Block {block.hash} unknown')
+
+            parent, parent_height, parent_work = self.tree[block.prev_hash]
+
+            try:
+                Block.is_valid_block(parent, block)
+            except Exception as e:
+                raise Exception(f'Cannot add – Block invalid: {e}')
+
+            work = self.index_block(block, parent_height + 1)
+
+            # Fork choice – ties keep Block seen first
+            if work <= self.tip_work():
+                return [], []
+
+            # Collect fork back to where it leaves main chain
+            fork = [block]
+
+            while not self.is_main_chain(fork[-1].prev_hash):
+                fork.append(self.tree[fork[-1].prev_hash][0])
+
+            fork.reverse()
+
+            try:
+                return self.reorganize(self.tree[fork[0].prev_hash][1], fork)
+            except Exception as e:
+                # Fork can never become main chain
+                for fork_block in fork:
+                    del self.tree[fork_block.hash]
+
+                raise Exception(f'Cannot add – Fork invalid: {e}')
+
+    @timed(REPLACE_CHAIN_SECONDS)
+    def replace_chain(self, chain, validated=False):
         """
         Determine if local chain should be replaced and
         Replace if conditions met
 
         Requirements:
-            - Incoming chain longer than local chain
+            - Incoming chain has more cumulative work than local chain
             - Incoming chain is valid
 
+        Only Blocks after the last Block shared with local chain are validated and applied
+
         :param chain: <list> Incoming chain
-        :return: None
+        :param validated: <bool> Whether hashes and 'Proof of Work' of incoming Blocks already verified
+                          (e.g. by sync.validate_blocks) – only links and Transactions checked then
+        :return: <tuple> (<list> Blocks removed from main chain, <list> Blocks added to main chain)
         :raises Exception: Throw if local chain not replaced
         """
-        if len(chain) <= len(self.chain):
-            raise Exception('Cannot replace – Incoming chain must be longer')
+        with self.index_lock:
+            self.sync_index()
+
+            # Last Block shared with local chain – cost depends on fork depth, not chain length
+            ancestor_height = min(len(chain), len(self.chain)) - 1
+
+            while ancestor_height >= 0 and chain[ancestor_height].hash != self.chain[ancestor_height].hash:
+                ancestor_height -= 1
+
+            if ancestor_height < 0:
+                CHAIN_REPLACEMENTS.inc(label_value='invalid')
+                raise Exception('Cannot replace - Incoming chain invalid: Genesis Block invalid')
+
+            suffix = chain[ancestor_height + 1:]
+            work = self.tree[chain[ancestor_height].hash][2] + sum(map(Blockchain.block_work, suffix))
+
+            if work <= self.tip_work():
+                CHAIN_REPLACEMENTS.inc(label_value='less_work')
+                raise Exception('Cannot replace – Incoming chain must have more cumulative work')
+
+            try:
+                # Shared Blocks already valid – link suffix to local copy of fork point
+                if validated:
+                    for prev_block, block in zip([self.chain[ancestor_height]] + suffix, suffix):
+                        Block.is_valid_link(prev_block, block)
+                else:
+                    Blockchain.is_valid_blocks(
+                        [self.chain[ancestor_height]] + suffix, Blockchain.validation_processes(suffix))
+                removed, added = self.reorganize(ancestor_height, suffix)
+            except Exception as e:
+                CHAIN_REPLACEMENTS.inc(label_value='invalid')
+                raise Exception(f'Cannot replace - Incoming chain invalid: {e}')
+
+            CHAIN_REPLACEMENTS.inc(label_value='replaced')
+            return removed, added
+
+    def reorganize(self, ancestor_height, blocks):
+        """
+        Switch main chain to Blocks on top of fork point
+        - Ledger and AddressIndex rolled back to fork point, then Transactions of new Blocks validated and applied
+        - Main chain, Ledger and AddressIndex unchanged if any new Block invalid
+        :param ancestor_height: <int> Height of last Block kept
+        :param blocks: <list> Already validated Blocks (links, 'Proof of Work') following fork point
+        :return: <tuple> (<list> Blocks removed from main chain, <list> Blocks added to main chain)
+        :raises Exception: Throw if Transactions of any new Block invalid
+        """
+        if ancestor_height + 1 < self.pruned_height:
+            raise Exception(f'Cannot reorganize – Fork point below pruned height {self.pruned_height}')
+
+        removed = self.chain[ancestor_height + 1:]
+
+        for height in range(len(self.chain) - 1, ancestor_height, -1):
+            self.disconnect_block(self.chain[height], height)
+
+        applied = 0
 
         try:
-            Blockchain.is_valid_chain(chain)
-        except Exception as e:
-            raise Exception(f'Cannot replace - Incoming chain invalid: {e}')
+            for block in blocks:
+                Blockchain.is_valid_block_transactions(block, self.ledger)
+                self.connect_block(block, ancestor_height + 1 + applied)
+                applied += 1
+        except Exception:
+            for height in range(ancestor_height + applied, ancestor_height, -1):
+                self.disconnect_block(blocks[height - ancestor_height - 1], height)
+
+            for height, block in enumerate(removed, ancestor_height + 1):
+                self.connect_block(block, height)
+
+            raise
+
+        for height, block in enumerate(blocks, ancestor_height + 1):
+            if block.hash not in self.tree:
+                self.index_block(block, height)
+
+        del self._chain[ancestor_height + 1:]
+        self._chain.extend(blocks)
+        self.indexed_length = len(self._chain)
+        self.indexed_tip_hash = self._chain[-1].hash
+        self.prune()
+
+        return removed, list(blocks)
+
+    def address_history(self, address, offset=0, limit=None):
+        """
+        Transactions of address in main chain, most recent first
+        :param address: <str> Address
+        :param offset: <int> Transactions skipped
+        :param limit: <int> Maximum Transactions returned (None – all)
+        :return: <tuple> (<int> total Transactions, <list> history page)
+        """
+        with self.index_lock:
+            self.sync_index()
+            total, postings = self.address_index.history(address, offset, limit)
+            history = []
+
+            for height, transaction_id in postings:
+                block = self.chain[height]
+                history.append({
+                    'height': height,
+                    'block_hash': block.hash,
+                    'timestamp': block.timestamp,
+                    # Pruned Block – Transaction id only
+                    'transaction_id': transaction_id,
+                    'transaction': None if block.data is None
+                        else block.data[self.ledger.transaction_location(transaction_id)[1]]
+                })
 
-        self.chain = chain
+            return total, history
+
+    def stats(self, window, segments=10):
+        """
+        Mine time, difficulty and throughput statistics of most recent Blocks (see HeaderStore.stats)
+        :param window: <int> Number of most recent Blocks covered
+        :param segments: <int> Number of segments throughput is reported for
+        :return: <dict> Stats
+        """
+        with self.index_lock:
+            self.sync_index()
+            return self.header_store.stats(window, segments)
+
+    def known_addresses(self):
+        """
+        Every address seen in main chain
+        :return: <list> Addresses
+        """
+        with self.index_lock:
+            self.sync_index()
+            return self.address_index.addresses()
+
+    def find_transaction(self, transaction_id):
+        """
+        Find Transaction in main chain (Ledger index lookup)
+        :param transaction_id: <str> Id of Transaction
+        :return: <tuple / None> (Block height, position in Block data) if found, None if not
+        """
+        with self.index_lock:
+            self.sync_index()
+            return self.ledger.transaction_location(transaction_id)
+
+    def has_transaction(self, transaction_id):
+        """
+        Check whether Transaction already in main chain
+        :param transaction_id: <str> Id of Transaction
+        :return: <bool> True if in main chain, False if not
+        """
+        return self.find_transaction(transaction_id) is not None
+
+    def find_block(self, block_hash):
+        """
+        Find Block in chain by hash
+        :param block_hash: <str> Hash of Block
+        :return: <Block / None> Block if found, None if not
+        """
+        with self.index_lock:
+            self.sync_index()
+            entry = self.tree.get(block_hash)
+
+            if entry and self.is_main_chain(block_hash):
+                return entry[0]
 
     def to_json(self):
         """
@@ -59,6 +468,22 @@ class Blockchain:
         """
         return list(map(lambda block: block.to_json(), self.chain))
 
+    def serialize(self):
+        """
+        Canonical JSON encoding of chain (reuses each Block's cached encoding)
+        :return: <bytes> UTF-8 encoded JSON list of Blocks
+        """
+        return Blockchain.serialize_blocks(self.chain)
+
+    @staticmethod
+    def serialize_blocks(blocks):
+        """
+        Canonical JSON encoding of list of Blocks (reuses each Block's cached encoding)
+        :param blocks: <list> Blocks to encode
+        :return: <bytes> UTF-8 encoded JSON list of Blocks
+        """
+        return b'[' + b', '.join(map(lambda block: block.serialize(), blocks)) + b']'
+
     @staticmethod
     def from_json(chain_json):
         """
@@ -71,13 +496,34 @@ class Blockchain:
         return blockchain
 
     @staticmethod
-    def is_valid_chain(chain):
+    def block_work(block):
+        """
+        Expected number of hashes needed to mine Block (2^difficulty)
+        :param block: <Block> Block
+        :return: <int> Work
+        """
+        return 2 ** block.difficulty
+
+    @staticmethod
+    def validation_processes(chain):
+        """
+        Number of worker processes worth using to validate chain
+        :param chain: <list> Chain being validated
+        :return: <int / None> Worker processes, None to validate serially
+        """
+        if VALIDATION_PROCESSES > 1 and len(chain) >= PARALLEL_VALIDATION_MIN_BLOCKS:
+            return VALIDATION_PROCESSES
+
+    @staticmethod
+    @timed(CHAIN_VALIDATION_SECONDS)
+    def is_valid_chain(chain, processes=None):
         """
         Validate chain
         Requirements:
             - Chain must begin with genesis Block
             - Each Block must be valid (see Block.is_valid_block)
         :param chain: <list> Chain being validated
+        :param processes: <int> Verify Block hashes across this many worker processes (None – serially)
         :return: None
         :raises Exception: Throw if any Block invalid
         """
@@ -86,14 +532,86 @@ class Blockchain:
             raise Exception('Genesis Block invalid')
 
         # Mined Blocks
-        for i in range (1, len(chain)):
-            block = chain[i]
-            prev_block = chain[i - 1]
-            Block.is_valid_block(prev_block, block)
+        Blockchain.is_valid_blocks(chain, processes)
 
         # Validate all Transactions
         Blockchain.is_valid_transaction_chain(chain)
 
+    @staticmethod
+    def is_valid_blocks(chain, processes=None):
+        """
+        Validate every Block after the first against the Block before it (see Block.is_valid_block)
+        :param chain: <list> Blocks being validated (first Block already trusted)
+        :param processes: <int> Verify Block hashes across this many worker processes (None – serially)
+        :return: None
+        :raises Exception: Throw if any Block invalid
+        """
+        if processes and processes > 1:
+            # Cheap serial pass over links, expensive hash checks in parallel
+            for i in range(1, len(chain)):
+                Block.is_valid_link(chain[i - 1], chain[i])
+
+            Blockchain.is_valid_blocks_parallel(chain[1:], processes)
+        else:
+            for i in range (1, len(chain)):
+                block = chain[i]
+                prev_block = chain[i - 1]
+                Block.is_valid_block(prev_block, block)
+
+    @staticmethod
+    def is_valid_blocks_parallel(blocks, processes):
+        """
+        Verify 'Proof of Work' and hash of each Block across worker processes
+        (checks that do not depend on any other Block)
+        :param blocks: <list> Blocks being validated
+        :param processes: <int> Number of worker processes
+        :return: None
+        :raises Exception: Throw if any Block invalid
+        """
+        # Imported here – process pools are only needed for long chains
+        from concurrent.futures import ProcessPoolExecutor
+
+        # A few chunks per worker keeps workers busy when chunks take uneven time
+        chunk_size = max(len(blocks) // (processes * 4), 1)
+        chunks = [blocks[i:i + chunk_size] for i in range(0, len(blocks), chunk_size)]
+
+        with ProcessPoolExecutor(processes) as executor:
+            for result in executor.map(Blockchain.is_valid_proofs, chunks):
+                pass
+
+    @staticmethod
+    def is_valid_proofs(blocks):
+        """
+        Verify 'Proof of Work' and hash of each Block (runs in worker process)
+        :param blocks: <list> Blocks being validated
+        :return: None
+        :raises Exception: Throw if any Block invalid
+        """
+        for block in blocks:
+            Block.is_valid_proof_of_work(block)
+            Block.is_valid_contents(block)
+
+    @staticmethod
+    def is_valid_header_chain(headers):
+        """
+        Validate chain of Block headers (without downloading Block data)
+        Requirements:
+            - Chain must begin with genesis Block header
+            - Each header must be valid (see Block.is_valid_header)
+        'Proof of Work' of legacy headers is only checked for leading zeros – their hash covers
+        Block data, so it is verified when the data is (see Block.is_valid_contents)
+        :param headers: <list> Chain of headers (Blocks without data) being validated
+        :return: None
+        :raises Exception: Throw if any header invalid
+        """
+        # Genesis Block
+        if headers[0].to_header_json() != Block.genesis().to_header_json():
+            raise Exception('Genesis Block invalid')
+
+        # Mined Blocks
+        for i in range(1, len(headers)):
+            Block.is_valid_header(headers[i - 1], headers[i])
+
     @staticmethod
     def is_valid_transaction_chain(chain):
         """
@@ -101,44 +619,63 @@ class Blockchain:
         Requirements:
             - Each Transaction only appears once in chain
             - Only one mining reward per Block
+            - Only one Transaction per sender per Block
             - Each Transaction must be valid
         :param chain: <list> Chain being validated
         :return: None
         :raises Exception: Throw if any requirement violated
         """
+        # Historic balances kept up to date Block by Block
+        ledger = Ledger()
+
+        for height, block in enumerate(chain):
+            Blockchain.is_valid_block_transactions(block, ledger)
+            ledger.apply_block(block, height)
+
+    @staticmethod
+    def is_valid_block_transactions(block, ledger):
+        """
+        Enforce rules of chain on Transactions of one Block
+        (see is_valid_transaction_chain)
+        :param block: <Block> Block being validated
+        :param ledger: <Ledger> Ledger of chain before Block
+        :return: None
+        :raises Exception: Throw if any requirement violated
+        """
         transaction_ids = set()
+        senders = set()
+        has_mining_reward = False
 
-        for i in range(len(chain)):
-            block = chain[i]
-            has_mining_reward = False
+        for transaction_json in block.data:
+            transaction = Transaction.from_json(transaction_json)
 
-            for transaction_json in block.data:
-                transaction = Transaction.from_json(transaction_json)
-                
-                # Duplicate Transaction
-                if transaction.id in transaction_ids:
-                    raise Exception(f'Invalid chain – Transaction {transaction.id} is not unique')
+            # Duplicate Transaction
+            if transaction.id in transaction_ids or ledger.has_transaction(transaction.id):
+                raise Exception(f'Invalid chain – Transaction {transaction.id} is not unique')
 
-                transaction_ids.add(transaction.id)
+            transaction_ids.add(transaction.id)
 
-                # Mining reward
-                if transaction.input == MINING_REWARD_INPUT:
-                    # Extra mining rewards
-                    if has_mining_reward:
-                        raise Exception(f'Invalid chain – Block {block.hash} has more than one mining reward')
+            # Mining reward
+            if transaction.input == MINING_REWARD_INPUT:
+                # Extra mining rewards
+                if has_mining_reward:
+                    raise Exception(f'Invalid chain – Block {block.hash} has more than one mining reward')
 
-                    has_mining_reward = True
-                # Normal Transaction
-                else:
-                    historic_blockchain = Blockchain() 
-                    historic_blockchain.chain = chain[:i]
-                    historic_balance = Wallet.calculate_balance(historic_blockchain, transaction.input['address'])
+                has_mining_reward = True
+            # Normal Transaction
+            else:
+                # Double spend – every input amount is checked against balance before Block
+                if transaction.input['address'] in senders:
+                    raise Exception(f'Invalid chain – Block {block.hash} spends balance of sender more than once')
+
+                senders.add(transaction.input['address'])
+                historic_balance = ledger.balance(transaction.input['address'])
 
-                    # Sender balance modified
-                    if historic_balance != transaction.input['amount']:
-                        raise Exception(f'Invalid chain - Transaction {transaction.id} has invalid input amount')
+                # Sender balance modified
+                if historic_balance != transaction.input['amount']:
+                    raise Exception(f'Invalid chain - Transaction {transaction.id} has invalid input amount')
 
-                Transaction.is_valid_transaction(transaction)
+            Transaction.is_valid_transaction(transaction)
 
 
 # -- TESTING AND EXPERIMENTATION -- #
@@ -0,0 +1,183 @@
+from array import array
+from backend.config import SECONDS
+
+try:
+    import numpy
+except ImportError:
+    # Aggregates fall back to plain Python over the same columns
+    numpy = None
+
+
+# Mine time percentiles reported by stats
+STATS_PERCENTILES = (50, 90, 99)
+
+def percentile(sorted_values, percent):
+    """
+    Percentile with linear interpolation (same as numpy.percentile default)
+    :param sorted_values: <list> Values in ascending order
+    :param percent: <float> Percentile (0-100)
+    :return: <float> Percentile value
+    """
+    rank = (len(sorted_values) - 1) * percent / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class HeaderStore:
+    """
+    Columnar copy of main chain Block metadata
+    - One array('q') per field (timestamp, difficulty, nonce, Transaction count), indexed by height
+    - Columns are contiguous 64-bit integers, viewed without copying by NumPy when installed
+    """
+    def __init__(self):
+        """
+        Initialize HeaderStore with no Blocks
+        """
+        self.timestamps = array('q')
+        self.difficulties = array('q')
+        self.nonces = array('q')
+        self.transaction_counts = array('q')
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, block):
+        """
+        Add metadata of Block appended to main chain
+        :param block: <Block> Block
+        :return: None
+        """
+        self.timestamps.append(block.timestamp)
+        self.difficulties.append(block.difficulty)
+        # Genesis nonce is not a number
+        self.nonces.append(block.nonce if isinstance(block.nonce, int) else 0)
+        self.transaction_counts.append(len(block.data) if isinstance(block.data, list) else 0)
+
+    def pop(self):
+        """
+        Remove metadata of Block removed from end of main chain
+        :return: None
+        """
+        self.timestamps.pop()
+        self.difficulties.pop()
+        self.nonces.pop()
+        self.transaction_counts.pop()
+
+    def stats(self, window, segments=10):
+        """
+        Aggregates over most recent Blocks
+        - Genesis timestamp is fixed, so the first mined Block has no meaningful mine time –
+          aggregates start at height 2
+        :param window: <int> Number of most recent Blocks covered
+        :param segments: <int> Number of equal segments throughput is reported for (at least 1)
+        :return: <dict> Mine time, difficulty and throughput statistics
+        """
+        end = len(self)
+        start = max(end - window, 2)
+        segments = max(segments, 1)
+
+        if start >= end:
+            return {'blocks': 0}
+
+        if numpy:
+            return HeaderStore.stats_numpy(self, start, end, segments)
+
+        return HeaderStore.stats_python(self, start, end, segments)
+
+    @staticmethod
+    def stats_numpy(store, start, end, segments):
+        """
+        Vectorized aggregates (zero-copy views of columns)
+        """
+        timestamps = numpy.frombuffer(store.timestamps, dtype=numpy.int64)
+        difficulties = numpy.frombuffer(store.difficulties, dtype=numpy.int64)[start:end]
+        transaction_counts = numpy.frombuffer(store.transaction_counts, dtype=numpy.int64)
+        mine_times = numpy.diff(timestamps[start - 1:end]) / SECONDS
+        values, counts = numpy.unique(difficulties, return_counts=True)
+        bounds = numpy.linspace(start, end, min(segments, end - start) + 1).astype(numpy.int64)
+        cumulative_counts = numpy.concatenate(([0], numpy.cumsum(transaction_counts)))
+
+        return HeaderStore.stats_json(
+            start, end,
+            mine_times={
+                'mean_s': float(mine_times.mean()),
+                'min_s': float(mine_times.min()),
+                'max_s': float(mine_times.max()),
+                **{f'p{percent}_s': float(numpy.percentile(mine_times, percent)) for percent in STATS_PERCENTILES}
+            },
+            difficulty={
+                'current': int(difficulties[-1]),
+                'min': int(difficulties.min()),
+                'max': int(difficulties.max()),
+                'mean': float(difficulties.mean()),
+                'histogram': {int(value): int(count) for value, count in zip(values, counts)}
+            },
+            segments=[
+                (int(segment_start), int(segment_end),
+                 int(cumulative_counts[segment_end] - cumulative_counts[segment_start]),
+                 int(timestamps[segment_end - 1] - timestamps[segment_start - 1]))
+                for segment_start, segment_end in zip(bounds[:-1], bounds[1:])
+            ])
+
+    @staticmethod
+    def stats_python(store, start, end, segments):
+        """
+        Same aggregates as stats_numpy without NumPy
+        """
+        timestamps = store.timestamps
+        difficulties = store.difficulties[start:end]
+        mine_times = sorted((timestamps[i] - timestamps[i - 1]) / SECONDS for i in range(start, end))
+        histogram = {}
+
+        for difficulty in difficulties:
+            histogram[difficulty] = histogram.get(difficulty, 0) + 1
+
+        count = min(segments, end - start)
+        bounds = [start + (end - start) * i // count for i in range(count + 1)]
+
+        return HeaderStore.stats_json(
+            start, end,
+            mine_times={
+                'mean_s': sum(mine_times) / len(mine_times),
+                'min_s': mine_times[0],
+                'max_s': mine_times[-1],
+                **{f'p{percent}_s': percentile(mine_times, percent) for percent in STATS_PERCENTILES}
+            },
+            difficulty={
+                'current': difficulties[-1],
+                'min': min(difficulties),
+                'max': max(difficulties),
+                'mean': sum(difficulties) / len(difficulties),
+                'histogram': dict(sorted(histogram.items()))
+            },
+            segments=[
+                (segment_start, segment_end,
+                 sum(store.transaction_counts[segment_start:segment_end]),
+                 timestamps[segment_end - 1] - timestamps[segment_start - 1])
+                for segment_start, segment_end in zip(bounds[:-1], bounds[1:])
+            ])
+
+    @staticmethod
+    def stats_json(start, end, mine_times, difficulty, segments):
+        """
+        Assemble stats response
+        :param segments: <list> (start height, end height, Transactions, elapsed ns) per segment
+        :return: <dict> Stats
+        """
+        return {
+            'blocks': end - start,
+            'start_height': start,
+            'end_height': end - 1,
+            'mine_time': mine_times,
+            'difficulty': difficulty,
+            'throughput': [
+                {
+                    'start_height': segment_start,
+                    'end_height': segment_end - 1,
+                    'transactions': transactions,
+                    'transactions_per_second': transactions / (elapsed / SECONDS) if elapsed > 0 else None
+                }
+                for segment_start, segment_end, transactions, elapsed in segments
+            ]
+        }
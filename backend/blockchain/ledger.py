@@ -0,0 +1,101 @@
+from backend.config import STARTING_BALANCE, MINING_REWARD_INPUT
+
+
+class Ledger:
+    """
+    Balance of every address and location of every Transaction in a chain
+    - Built Block by Block (same rules as Wallet.calculate_balance)
+    - Every applied Block returns an undo record, so a reorg only
+      rolls back the Blocks after the fork point
+    """
+    def __init__(self):
+        """
+        Initialize Ledger with no Blocks applied
+        """
+        self.balances = {}
+        # Transaction id -> (Block height, position in Block data)
+        self.transactions = {}
+
+    def balance(self, address):
+        """
+        Current balance of address
+        :param address: <str> Address owning balance
+        :return: <float> Balance (STARTING_BALANCE if address never seen)
+        """
+        return self.balances.get(address, STARTING_BALANCE)
+
+    def has_transaction(self, transaction_id):
+        """
+        Check whether Transaction already recorded
+        :param transaction_id: <str> Id of Transaction
+        :return: <bool> True if recorded, False if not
+        """
+        return transaction_id in self.transactions
+
+    def transaction_location(self, transaction_id):
+        """
+        Location of recorded Transaction
+        :param transaction_id: <str> Id of Transaction
+        :return: <tuple / None> (Block height, position in Block data) if recorded, None if not
+        """
+        return self.transactions.get(transaction_id)
+
+    def apply_block(self, block, height=None):
+        """
+        Apply Transactions of Block to balances
+        Block data other than a list of Transactions holds no balances (e.g. test data)
+        :param block: <Block> Block extending chain already applied
+        :param height: <int> Height of Block (recorded with its Transactions)
+        :return: <tuple> Undo record (previous balances, added Transaction ids)
+        """
+        previous_balances = {}
+        added_ids = []
+
+        if not isinstance(block.data, list):
+            return previous_balances, added_ids
+
+        for position, transaction in enumerate(block.data):
+            if not isinstance(transaction, dict):
+                continue
+
+            sender = transaction['input']['address']
+
+            for address, amount in transaction['output'].items():
+                if address not in previous_balances:
+                    previous_balances[address] = self.balances.get(address)
+
+                # Address conducts transaction (payment) – reset balance to 'change'
+                if address == sender:
+                    self.balances[address] = amount
+                else:
+                    self.balances[address] = self.balance(address) + amount
+
+            # Payment without 'change' entry – sender spent whole balance
+            if transaction['input'] != MINING_REWARD_INPUT and sender not in transaction['output']:
+                if sender not in previous_balances:
+                    previous_balances[sender] = self.balances.get(sender)
+
+                self.balances[sender] = 0
+
+            if transaction['id'] not in self.transactions:
+                self.transactions[transaction['id']] = (height, position)
+                added_ids.append(transaction['id'])
+
+        return previous_balances, added_ids
+
+    def undo_block(self, undo_record):
+        """
+        Roll back Block applied last
+        :param undo_record: <tuple> Undo record returned by apply_block
+        :return: None
+        """
+        previous_balances, added_ids = undo_record
+
+        for address, balance in previous_balances.items():
+            if balance is None:
+                del self.balances[address]
+            else:
+                self.balances[address] = balance
+
+        for transaction_id in added_ids:
+            del self.transactions[transaction_id]
@@ -1,3 +1,5 @@
+import os
+
 NANOSECONDS = 1
 MICROSECONDS = 1000 * NANOSECONDS
 MILLISECONDS = 1000 * MICROSECONDS
@@ -10,3 +12,27 @@ STARTING_BALANCE = 1000
 
 MINING_REWARD = 50
 MINING_REWARD_INPUT = {'address': '*--official-mining-reward--*'}
+
+# Block format versions
+# - 1: legacy – Block hash covers all Block data
+# - 2: Block hash covers fixed-size header committing to Merkle root of Transactions
+LEGACY_BLOCK_VERSION = 1
+MERKLE_BLOCK_VERSION = 2
+
+# Version of newly mined Blocks (opt in to Merkle Blocks with BLOCK_VERSION=2)
+BLOCK_VERSION = int(os.environ.get('BLOCK_VERSION', LEGACY_BLOCK_VERSION))
+
+# Worker processes for parallel Block verification (0 – verify serially)
+VALIDATION_PROCESSES = int(os.environ.get('VALIDATION_PROCESSES', os.cpu_count() or 0))
+
+# Chains shorter than this are always verified serially (process start-up not worth it)
+PARALLEL_VALIDATION_MIN_BLOCKS = 1000
+
+# Main chain Blocks (from tip) whose data a node keeps – older Blocks keep header only (0 – keep every Block)
+PRUNE_DEPTH = int(os.environ.get('PRUNE_DEPTH', 0))
+
+# Record metrics served at /metrics (enable with METRICS_ENABLED=True)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED') == 'True'
+
+# Serve on-demand profiles at /debug/profile (enable with PROFILING_ENABLED=True)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED') == 'True'
@@ -0,0 +1,210 @@
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+from time import time_ns
+from uuid import uuid4
+from backend.blockchain.block import Block
+from backend.wallet.transaction import Transaction
+from backend.util.rwlock import ReadWriteLock
+from backend.config import SECONDS
+
+
+# Number of finished MiningJobs kept for status queries
+MAX_FINISHED_JOBS = 100
+
+# Block data refreshed at most this often – a stream of pool changes would otherwise restart mining forever
+MIN_TEMPLATE_AGE = 1 * SECONDS
+
+JOB_STATUS = {
+    'MINING': 'mining',
+    'MINED': 'mined',
+    'CANCELLED': 'cancelled',
+    'ABORTED': 'aborted',
+    'FAILED': 'failed'
+}
+
+class MiningJob:
+    """
+    Background job mining one Block of the TransactionPool
+    """
+    def __init__(self):
+        """
+        Initialize MiningJob in mining state
+        """
+        self.id = str(uuid4())[:8]
+        self.status = JOB_STATUS['MINING']
+        self.started_at = time_ns()
+        self.finished_at = None
+        self.template_refreshes = 0
+        self.block = None
+        self.error = None
+        self.cancel_requested = Event()
+        self.finished = Event()
+
+    def cancel(self):
+        """
+        Request MiningJob to stop mining
+        :return: None
+        """
+        self.cancel_requested.set()
+
+    def finish(self, status, block=None, error=None):
+        """
+        Record outcome of MiningJob
+        :param status: <str> Final status (see JOB_STATUS)
+        :param block: <Block> Mined Block (if any)
+        :param error: <str> Reason job did not mine a Block (if any)
+        :return: None
+        """
+        self.status = status
+        self.block = block
+        self.error = error
+        self.finished_at = time_ns()
+        self.finished.set()
+
+    def wait(self, timeout=None):
+        """
+        Block until MiningJob finishes
+        :param timeout: <float> Seconds to wait (None waits forever)
+        :return: <bool> True if job finished
+        """
+        return self.finished.wait(timeout)
+
+    def to_json(self):
+        """
+        Serialize MiningJob status
+        :return: <dict> MiningJob as dictionary
+        """
+        return {
+            'id': self.id,
+            'status': self.status,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'template_refreshes': self.template_refreshes,
+            'block': self.block.to_json() if self.block else None,
+            'error': self.error
+        }
+
+
+class Miner:
+    """
+    Runs MiningJobs in background threads
+    - Refreshes Block data when TransactionPool changes
+    - Aborts when another Block extends the Blockchain first
+    """
+    def __init__(self, blockchain, transaction_pool, wallet, pubsub, lock=None):
+        """
+        Initialize Miner with node state
+        :param lock: <ReadWriteLock> Lock guarding Blockchain and TransactionPool
+        """
+        self.blockchain = blockchain
+        self.transaction_pool = transaction_pool
+        self.wallet = wallet
+        self.pubsub = pubsub
+        self.state_lock = lock or ReadWriteLock()
+        self.jobs = OrderedDict()
+        self.lock = Lock()
+
+    def start_job(self):
+        """
+        Start MiningJob (or return MiningJob already mining)
+        :return: <MiningJob> Job mining next Block
+        """
+        with self.lock:
+            for job in self.jobs.values():
+                if job.status == JOB_STATUS['MINING']:
+                    return job
+
+            job = MiningJob()
+            self.jobs[job.id] = job
+            self.prune_jobs()
+
+        Thread(target=self.run_job, args=(job,), daemon=True).start()
+        return job
+
+    def get_job(self, job_id):
+        """
+        Find MiningJob by id
+        :param job_id: <str> Id of MiningJob
+        :return: <MiningJob / None> MiningJob if found, None if not
+        """
+        return self.jobs.get(job_id)
+
+    def cancel_job(self, job_id):
+        """
+        Cancel MiningJob by id
+        :param job_id: <str> Id of MiningJob
+        :return: <MiningJob / None> Cancelled MiningJob if found, None if not
+        """
+        job = self.get_job(job_id)
+
+        if job:
+            job.cancel()
+
+        return job
+
+    def prune_jobs(self):
+        """
+        Forget oldest finished MiningJobs beyond MAX_FINISHED_JOBS
+        :return: None
+        """
+        finished = [job.id for job in self.jobs.values() if job.finished.is_set()]
+
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job_id]
+
+    def block_data(self):
+        """
+        Build Block data template from TransactionPool plus mining reward
+        Only Transactions valid on current chain tip – peers would reject the Block otherwise
+        :return: <list> Transactions in JSON format
+        """
+        with self.state_lock.read():
+            transaction_data = self.transaction_pool.valid_transaction_data(self.blockchain)
+
+        transaction_data.append(Transaction.reward_transaction(self.wallet).to_json())
+        return transaction_data
+
+    def run_job(self, job):
+        """
+        Mine Block for MiningJob and add it to Blockchain
+        :param job: <MiningJob> Job being run
+        :return: None
+        """
+        try:
+            with self.state_lock.read():
+                prev_block = self.blockchain.chain[-1]
+
+            while True:
+                pool_version = self.transaction_pool.version
+                template_time = time_ns()
+                data = self.block_data()
+
+                def interrupt():
+                    return (job.cancel_requested.is_set()
+                            or self.blockchain.chain[-1].hash != prev_block.hash
+                            or (self.transaction_pool.version != pool_version
+                                and time_ns() - template_time >= MIN_TEMPLATE_AGE))
+
+                block = Block.mine_block(prev_block, data, interrupt)
+
+                if block:
+                    break
+
+                if job.cancel_requested.is_set():
+                    return job.finish(JOB_STATUS['CANCELLED'])
+
+                if self.blockchain.chain[-1].hash != prev_block.hash:
+                    return job.finish(JOB_STATUS['ABORTED'], error='Blockchain extended by another Block')
+
+                # TransactionPool changed – restart with fresh Block data
+                job.template_refreshes += 1
+
+            # Commit with exclusive access – mining itself holds no lock
+            with self.state_lock.write():
+                self.blockchain.append_block(block)
+                self.transaction_pool.clear_blockchain_transactions(self.blockchain)
+
+            self.pubsub.broadcast_block(block)
+            job.finish(JOB_STATUS['MINED'], block=block)
+        except Exception as e:
+            job.finish(JOB_STATUS['FAILED'], error=str(e))
@@ -1,14 +1,21 @@
+import os
+from queue import Queue, Full
+from threading import Lock, Thread
 from time import sleep
 from pubnub.pubnub import PubNub
 from pubnub.pnconfiguration import PNConfiguration
 from pubnub.callbacks import SubscribeCallback
 from backend.blockchain.block import Block
 from backend.wallet.transaction import Transaction
+from backend.util.rwlock import ReadWriteLock
+from backend.util.metrics import REGISTRY
+from backend.util.rate_limit import TokenBucket, KeyedTokenBuckets
+from backend.util.seen_cache import SeenCache
 
 
 pnconfig = PNConfiguration()
-pnconfig.subscribe_key = # Subscribe Key from PubNub
-pnconfig.publish_key = # Publish Key from PubNub
+pnconfig.subscribe_key = os.environ.get('PUBNUB_SUBSCRIBE_KEY') # Subscribe Key from PubNub
+pnconfig.publish_key = os.environ.get('PUBNUB_PUBLISH_KEY') # Publish Key from PubNub
 
 CHANNELS = {
     'TEST': 'TEST',
@@ -16,65 +23,284 @@ CHANNELS = {
     'TRANSACTION': 'TRANSACTION'
 }
 
+# Recently seen Block hashes and Transaction versions (duplicates dropped unprocessed)
+SEEN_CACHE_SIZE = 10000
+SEEN_CACHE_TTL = 10 * 60
+
+# Inbound admission control (rate in messages per second, burst)
+# - Transaction channel rate stays below global budget, so a Transaction flood never starves Blocks
+SENDER_RATE = (5, 20)
+PUBLISHER_RATE = (50, 100)
+CHANNEL_RATES = {
+    'BLOCK': (20, 50),
+    'TRANSACTION': (200, 400)
+}
+GLOBAL_RATE = (500, 1000)
+# Senders and publishers tracked at once (least recently seen forgotten)
+MAX_TRACKED_ORIGINS = 10000
+
+# Transactions shed while pool or processing queue is full
+MAX_POOL_SIZE = 5000
+MAX_QUEUED_TRANSACTIONS = 1000
+
+MESSAGE_SECONDS = REGISTRY.histogram('pubsub_message_seconds', 'Seconds spent handling PubSub messages', 'channel')
+DUPLICATES_SKIPPED = REGISTRY.counter(
+    'pubsub_duplicates_skipped_total', 'Already seen PubSub messages dropped unprocessed', 'channel')
+MESSAGES_SHED = REGISTRY.counter('pubsub_messages_shed_total', 'PubSub messages refused by admission control', 'reason')
+
+def message_key(channel, message):
+    """
+    Identity of gossiped Block or Transaction, read without deserializing message
+    - Updated Transactions keep their id but are signed anew, so input timestamp is part of key
+    :param channel: <str> Channel of message
+    :param message: <dict> Block or Transaction in JSON format
+    :return: <str / None> Key (None if message has no identity)
+    """
+    try:
+        if channel == CHANNELS['BLOCK']:
+            return f'block:{message["hash"]}'
+
+        if channel == CHANNELS['TRANSACTION']:
+            return f'transaction:{message["id"]}:{message["input"]["timestamp"]}'
+    except (KeyError, TypeError):
+        return None
+
+class AdmissionControl:
+    """
+    Decides which inbound messages are processed
+    - Transactions: shed while pool full, then per-publisher, per-channel and global token buckets
+    - Blocks: per-channel and global token buckets only (never shed for pool load or by origin)
+    - Sender of a Transaction only charged once its signature is verified (see admit_sender) –
+      otherwise unsigned copies claiming an address would silence its owner
+    """
+    def __init__(self, clock=None):
+        """
+        Initialize AdmissionControl with full buckets
+        :param clock: <callable> Returns current time in seconds (default monotonic)
+        """
+        options = {'clock': clock} if clock else {}
+        self.senders = KeyedTokenBuckets(*SENDER_RATE, MAX_TRACKED_ORIGINS, **options)
+        self.publishers = KeyedTokenBuckets(*PUBLISHER_RATE, MAX_TRACKED_ORIGINS, **options)
+        self.channels = {CHANNELS[name]: TokenBucket(*rate, **options) for name, rate in CHANNEL_RATES.items()}
+        self.budget = TokenBucket(*GLOBAL_RATE, **options)
+        self.lock = Lock()
+
+    def admit(self, channel, message, publisher=None, pool_size=0):
+        """
+        Check whether message may be processed
+        :param channel: <str> Channel of message
+        :param message: <dict> Message
+        :param publisher: <str> PubNub id of publishing client (if known)
+        :param pool_size: <int> Transactions in pool
+        :return: <str / None> Reason message refused, None if admitted
+        """
+        with self.lock:
+            if channel == CHANNELS['TRANSACTION']:
+                if pool_size >= MAX_POOL_SIZE:
+                    return 'pool_full'
+
+                if publisher and not self.publishers.allow(publisher):
+                    return 'publisher_rate'
+
+            bucket = self.channels.get(channel)
+
+            if bucket and not bucket.allow():
+                return 'channel_rate'
+
+            if not self.budget.allow():
+                return 'global_rate'
+
+    def admit_sender(self, sender):
+        """
+        Check whether sender of verified Transaction may add to pool
+        :param sender: <str> Address of sender (signature already verified)
+        :return: <str / None> Reason Transaction refused, None if admitted
+        """
+        with self.lock:
+            if not self.senders.allow(sender):
+                return 'sender_rate'
+
 class Listener(SubscribeCallback):
     """
     Custom Listener object to override methods in PubNub SubscribeCallback class
     """
-    def __init__(self, blockchain, transaction_pool):
+    def __init__(self, blockchain, transaction_pool, lock, seen=None, admission=None):
         """
-        Initialize Listener with Blockchain
+        Initialize Listener with Blockchain, TransactionPool and lock guarding both
+        :param seen: <SeenCache> Keys of messages already seen (shared with PubSub broadcasts)
+        :param admission: <AdmissionControl> Admission control of inbound messages
         """
         self.blockchain = blockchain
         self.transaction_pool = transaction_pool
+        self.lock = lock
+        self.seen = seen or SeenCache(SEEN_CACHE_SIZE, SEEN_CACHE_TTL)
+        self.admission = admission or AdmissionControl()
+        # Transactions are applied by a worker thread, so Blocks never wait behind a Transaction flood
+        self.transaction_queue = Queue(MAX_QUEUED_TRANSACTIONS)
+        self.worker = None
+        self.worker_lock = Lock()
 
     def message(self, pubnub, message_object):
         """
-        Print message object to console
+        Admit message object – Blocks handled right away, Transactions queued for worker thread
         :param pubnub: <PubNub> PubNum object being listened to
         :param message_object: <Message> Message object recieved
         :return: None
         """
+        channel = message_object.channel
+        key = message_key(channel, message_object.message)
+
+        # Own broadcast echoed back or copy re-gossiped by peer
+        if key and self.seen.seen(key, remember=False):
+            DUPLICATES_SKIPPED.inc(label_value=channel)
+            return
+
+        reason = self.admission.admit(
+            channel, message_object.message, getattr(message_object, 'publisher', None),
+            len(self.transaction_pool.transaction_map))
+
+        if reason:
+            MESSAGES_SHED.inc(label_value=reason)
+            return
+
+        # Only admitted messages remembered – shed ones are processed if gossiped again
+        if key:
+            self.seen.add(key)
+
+        if channel == CHANNELS['TRANSACTION']:
+            self.start_worker()
+
+            try:
+                self.transaction_queue.put_nowait(message_object)
+            except Full:
+                MESSAGES_SHED.inc(label_value='queue_full')
+                self.forget(message_object)
+
+            return
+
+        with MESSAGE_SECONDS.time(channel):
+            self.handle_message(message_object)
+
+    def start_worker(self):
+        """
+        Start thread applying queued Transactions (once)
+        :return: None
+        """
+        with self.worker_lock:
+            if self.worker is None:
+                self.worker = Thread(target=self.process_transactions, daemon=True)
+                self.worker.start()
+
+    def process_transactions(self):
+        """
+        Apply queued Transaction messages one by one (runs in worker thread)
+        :return: None
+        """
+        while True:
+            message_object = self.transaction_queue.get()
+
+            try:
+                with MESSAGE_SECONDS.time(message_object.channel):
+                    self.handle_message(message_object)
+            except Exception as e:
+                print(f'\n-- Did not add Transaction: {e}')
+            finally:
+                self.transaction_queue.task_done()
+
+    def handle_message(self, message_object):
+        """
+        Apply message to Blockchain or TransactionPool
+        Key of message not applied is forgotten – a forged copy seen first, or a Block whose
+        parent is not known yet, must not suppress copies gossiped later
+        :param message_object: <Message> Message object recieved
+        :return: None
+        """
         print(f'\n-- Channel: {message_object.channel} | Message: {message_object.message}')
 
-        # Add Block to Blockchain (if new chain valid)
+        # Add Block to Blockchain's Block tree (main chain switches if fork has more work)
         if message_object.channel == CHANNELS['BLOCK']:
-            block = Block.from_json(message_object.message)
-            potential_chain = self.blockchain.chain[:]
-            potential_chain.append(block)
-
             try:
-                self.blockchain.replace_chain(potential_chain)
-                self.transaction_pool.clear_blockchain_transactions(self.blockchain)
-                print(f'\n-- Successfully replaced local chain')
+                block = Block.from_json(message_object.message)
+
+                with self.lock.write():
+                    removed, added = self.blockchain.receive_block(block)
+                    self.transaction_pool.update_for_reorg(removed, added)
+
+                    # Pool Transactions re-checked against new balances
+                    if added:
+                        self.transaction_pool.clear_blockchain_transactions(self.blockchain)
+
+                if removed:
+                    print(f'\n-- Reorganized local chain ({len(removed)} Blocks replaced by {len(added)})')
+                elif added:
+                    print(f'\n-- Successfully extended local chain')
+                else:
+                    print(f'\n-- Stored Block on competing fork')
             except Exception as e:
-                print(f'\n-- Did not replace chain: {e}')
+                self.forget(message_object)
+                print(f'\n-- Did not add Block: {e}')
         # Add Transaction to TransactionPool
         elif message_object.channel == CHANNELS['TRANSACTION']:
-            transaction = Transaction.from_json(message_object.message)
-            self.transaction_pool.set_transaction(transaction)
+            try:
+                transaction = Transaction.from_json(message_object.message)
+
+                # Signature verified outside lock – balance checked against chain state under it
+                Transaction.is_valid_transaction(transaction)
+
+                reason = self.admission.admit_sender(transaction.input['address'])
+
+                if reason:
+                    MESSAGES_SHED.inc(label_value=reason)
+                    raise Exception('Sender rate limit exceeded')
+
+                with self.lock.write():
+                    self.transaction_pool.admit_transaction(transaction, self.blockchain, verified=True)
+            except Exception as e:
+                self.forget(message_object)
+                print(f'\n-- Did not add Transaction: {e}')
+                return
+
             print(f'\n-- New transaction added to pool')
 
+    def forget(self, message_object):
+        """
+        Drop key of message from seen cache (processed again if gossiped again)
+        :param message_object: <Message> Message object recieved
+        :return: None
+        """
+        key = message_key(message_object.channel, message_object.message)
+
+        if key:
+            self.seen.forget(key)
+
 
 class PubSub:
     """
     Handles Publish/Subscribe layer of app
     Provides communication between nodes of Blockchain network
     """
-    def __init__(self, blockchain, transaction_pool):
+    def __init__(self, blockchain, transaction_pool, lock=None):
         """
         Initialize PubSub with PNConfig, channels, and Listener (with Blockchain)
+        :param lock: <ReadWriteLock> Lock guarding Blockchain and TransactionPool
         """
         self.pubnub = PubNub(pnconfig)
         self.pubnub.subscribe().channels(CHANNELS.values()).execute()
-        self.pubnub.add_listener(Listener(blockchain, transaction_pool))
+        self.seen = SeenCache(SEEN_CACHE_SIZE, SEEN_CACHE_TTL)
+        self.pubnub.add_listener(Listener(blockchain, transaction_pool, lock or ReadWriteLock(), self.seen))
 
     def publish(self, channel, message):
         """
-        Publish message object to channel
+        Publish message object to channel (its echo back to this node is dropped by Listener)
         :param channel: <Channel> Channel to publish to
         :param message: <Message> Message to publish
         :return: None
         """
+        key = message_key(channel, message)
+
+        if key:
+            self.seen.add(key)
+
         self.pubnub.publish().channel(channel).message(message).sync()
 
     def broadcast_block(self, block):
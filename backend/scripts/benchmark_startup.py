@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from time import perf_counter, sleep
+from urllib.error import URLError
+from urllib.request import urlopen
+
+
+# Measures how fast the node starts: import time of backend.app, time to
+# create the app, and time until a launched node answers /health
+#
+# Example:
+#   python3 -m backend.scripts.benchmark_startup --runs 5 --port 5999
+
+def measure_import(module, runs):
+    """
+    Seconds to import module in a fresh interpreter
+    :param module: <str> Module imported
+    :param runs: <int> Number of interpreters started
+    :return: <list> Seconds per run
+    """
+    code = f'from time import perf_counter; start = perf_counter(); import {module}; print(perf_counter() - start)'
+
+    return [
+        float(subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout)
+        for run in range(runs)
+    ]
+
+def measure_create_app(runs):
+    """
+    Seconds to import backend.app and create the app (background tasks not started)
+    :param runs: <int> Number of interpreters started
+    :return: <list> Seconds per run
+    """
+    code = ('from time import perf_counter; start = perf_counter(); '
+            'from backend.app import create_app; create_app(start_background=False); '
+            'print(perf_counter() - start)')
+
+    return [
+        float(subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout)
+        for run in range(runs)
+    ]
+
+def measure_health(port, runs, timeout):
+    """
+    Seconds from launching node until /health answers
+    :param port: <int> Port node listens on
+    :param runs: <int> Number of nodes launched (one after another)
+    :param timeout: <float> Seconds to wait for each node
+    :return: <list> Seconds per run
+    """
+    times = []
+    environment = dict(os.environ, PORT=str(port))
+
+    for run in range(runs):
+        start = perf_counter()
+        node = subprocess.Popen([sys.executable, '-m', 'backend.app'], env=environment,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        try:
+            while True:
+                if perf_counter() - start > timeout:
+                    raise Exception(f'Node did not answer /health within {timeout}s')
+
+                try:
+                    with urlopen(f'http://localhost:{port}/health', timeout=1) as response:
+                        if response.status == 200:
+                            break
+                except (URLError, ConnectionError):
+                    sleep(0.005)
+
+            times.append(perf_counter() - start)
+        finally:
+            node.terminate()
+            node.wait()
+
+    return times
+
+def summarize(times):
+    return {'runs': len(times), 'min_s': min(times), 'mean_s': sum(times) / len(times), 'max_s': max(times)}
+
+def main():
+    parser = ArgumentParser(description='Benchmark node startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Measurements per step')
+    parser.add_argument('--port', type=int, default=5999, help='Port of launched node')
+    parser.add_argument('--timeout', type=float, default=30, help='Seconds to wait for /health')
+    args = parser.parse_args()
+
+    print(json.dumps({
+        'import_backend_app': summarize(measure_import('backend.app', args.runs)),
+        'create_app': summarize(measure_create_app(args.runs)),
+        'time_to_health': summarize(measure_health(args.port, args.runs, args.timeout))
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+import json
+import os
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from random import Random
+from time import time_ns
+from backend.blockchain.block import Block
+from backend.blockchain.blockchain import Blockchain
+from backend.config import (
+    SECONDS, MINE_RATE, STARTING_BALANCE, MINING_REWARD, MINING_REWARD_INPUT, BLOCK_VERSION)
+from backend.wallet.wallet import Wallet
+
+
+# Generates large valid chains and Transaction streams from a fixed seed
+# - Reusable pool of deterministic keys instead of fresh keys per Transaction
+# - Synthetic timestamps MINE_RATE apart, so difficulty falls to its floor of 1
+# - Transactions signed across worker processes
+# Everything except the ECDSA signatures (random nonce) is reproducible from the seed
+
+# Timestamp of genesis' first successor (fixed so output only depends on seed)
+START_TIMESTAMP = 1_600_000_000 * SECONDS
+
+# Order of SECP256K1 group – private key secrets must be below it
+SECP256K1_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Largest amount of a generated Transaction
+MAX_AMOUNT = 50
+
+def random_id(rng, used_ids):
+    """
+    Deterministic id or address (same shape as Transaction ids)
+    - Drawn again on collision (32-bit ids collide within ~100k draws)
+    :param rng: <Random> Seeded random number generator
+    :param used_ids: <set> Ids and addresses already taken – new id added to it
+    :return: <str> Id
+    """
+    while True:
+        id = f'{rng.getrandbits(32):08x}'
+
+        if id not in used_ids:
+            used_ids.add(id)
+            return id
+
+def key_pool(rng, size, used_ids):
+    """
+    Deterministic pool of wallet keys
+    :param rng: <Random> Seeded random number generator
+    :param size: <int> Number of keys
+    :param used_ids: <set> Ids already taken (see random_id) – addresses added to it
+    :return: <list> (private key secret, address) pairs
+    """
+    return [(rng.randrange(1, SECP256K1_ORDER), random_id(rng, used_ids)) for i in range(size)]
+
+def plan_transactions(rng, keys, balances, count, timestamp, used_ids):
+    """
+    Plan unsigned Transactions from distinct senders against current balances
+    :param rng: <Random> Seeded random number generator
+    :param keys: <list> Key pool
+    :param balances: <dict> Balance of each address (not modified)
+    :param count: <int> Number of Transactions wanted
+    :param timestamp: <int> Input timestamp of Transactions
+    :param used_ids: <set> Ids and addresses already taken (see random_id)
+    :return: <list> Unsigned Transactions (id, sender index, output, input amount, timestamp)
+    """
+    unsigned = []
+
+    for sender_index in rng.sample(range(len(keys)), min(count, len(keys))):
+        sender = keys[sender_index][1]
+        balance = balances.get(sender, STARTING_BALANCE)
+
+        if balance < 1:
+            continue
+
+        recipient = keys[rng.randrange(len(keys))][1]
+        if recipient == sender:
+            recipient = random_id(rng, used_ids)
+
+        amount = rng.randint(1, min(balance, MAX_AMOUNT))
+        output = {recipient: amount, sender: balance - amount}
+        unsigned.append((random_id(rng, used_ids), sender_index, output, balance, timestamp))
+
+    return unsigned
+
+def apply_transactions(balances, transaction_jsons):
+    """
+    Update balances exactly as Wallet.calculate_balance would
+    :param balances: <dict> Balance of each address (modified)
+    :param transaction_jsons: <list> Transactions in JSON format (in Block order)
+    :return: None
+    """
+    for transaction in transaction_jsons:
+        sender = transaction['input']['address']
+
+        for address, amount in transaction['output'].items():
+            if address == sender:
+                balances[address] = amount
+            else:
+                balances[address] = balances.get(address, STARTING_BALANCE) + amount
+
+# Wallets of worker process (built once per worker from key pool)
+worker_wallets = []
+
+def init_worker(keys):
+    """
+    Build wallets of key pool in worker process
+    :param keys: <list> Key pool
+    :return: None
+    """
+    worker_wallets.extend(Wallet(private_value=secret, address=address) for secret, address in keys)
+
+def sign_transactions(unsigned):
+    """
+    Sign planned Transactions (runs in worker process)
+    :param unsigned: <list> Unsigned Transactions from plan_transactions
+    :return: <list> Transactions in JSON format
+    """
+    transaction_jsons = []
+
+    for id, sender_index, output, amount, timestamp in unsigned:
+        wallet = worker_wallets[sender_index]
+        transaction_jsons.append({
+            'id': id,
+            'output': output,
+            'input': {
+                'timestamp': timestamp,
+                'amount': amount,
+                'address': wallet.address,
+                'public_key': wallet.public_key,
+                'signature': wallet.sign(output)
+            }
+        })
+
+    return transaction_jsons
+
+def generate(blocks, transactions_per_block, wallets, stream_size, seed, processes, version):
+    """
+    Generate valid chain and stream of Transactions valid on top of it
+    :return: <tuple> (<Blockchain> chain, <list> stream Transactions, <list> key pool)
+    """
+    rng = Random(seed)
+    used_ids = set()
+    keys = key_pool(rng, wallets, used_ids)
+    miner = keys[0][1]
+    balances = {}
+    planned_blocks = []
+
+    # Plan every Block first (cheap, sequential) – balances follow chain order
+    for height in range(1, blocks + 1):
+        timestamp = START_TIMESTAMP + height * MINE_RATE
+        unsigned = plan_transactions(rng, keys, balances, transactions_per_block, timestamp - 1, used_ids)
+        reward = {'id': random_id(rng, used_ids), 'output': {miner: MINING_REWARD}, 'input': MINING_REWARD_INPUT}
+        planned_blocks.append((timestamp, unsigned, reward))
+
+        # Inputs of a Block use balances from before the Block
+        apply_transactions(balances, [
+            {'output': output, 'input': {'address': keys[sender_index][1]}}
+            for id, sender_index, output, amount, timestamp in unsigned
+        ] + [reward])
+
+    stream = plan_transactions(rng, keys, balances, stream_size, START_TIMESTAMP + (blocks + 1) * MINE_RATE, used_ids)
+
+    # Sign everything across worker processes
+    with Pool(processes, initializer=init_worker, initargs=(keys,)) as pool:
+        signed_blocks = pool.map(sign_transactions, [unsigned for timestamp, unsigned, reward in planned_blocks],
+                                 chunksize=max(blocks // (processes * 8), 1))
+        stream_jsons = pool.apply(sign_transactions, (stream,)) if stream else []
+
+    # Mine sequentially – synthetic timestamps keep difficulty at its floor
+    blockchain = Blockchain()
+
+    for (timestamp, unsigned, reward), transaction_jsons in zip(planned_blocks, signed_blocks):
+        data = transaction_jsons + [reward]
+        blockchain.chain.append(Block.mine_block(blockchain.chain[-1], data, version=version, clock=lambda: timestamp))
+
+    return blockchain, stream_jsons, keys
+
+def main():
+    parser = ArgumentParser(description='Generate a large valid chain and Transaction stream from a fixed seed')
+    parser.add_argument('--blocks', type=int, default=1000, help='number of Blocks after genesis')
+    parser.add_argument('--transactions-per-block', type=int, default=10)
+    parser.add_argument('--wallets', type=int, default=100, help='size of reusable key pool')
+    parser.add_argument('--stream', type=int, default=100, help='Transactions in stream (at most one per wallet)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--version', type=int, default=BLOCK_VERSION, help='Block format version')
+    parser.add_argument('--validate', action='store_true', help='validate generated chain before writing')
+    parser.add_argument('--out', default='generated_chain', help='output directory')
+    args = parser.parse_args()
+
+    start_time = time_ns()
+    blockchain, stream, keys = generate(
+        args.blocks, args.transactions_per_block, args.wallets, args.stream,
+        args.seed, args.processes, args.version)
+    print(f'Generated {len(blockchain.chain)} Blocks in {(time_ns() - start_time) / SECONDS:.2f}s')
+
+    if args.validate:
+        Blockchain.is_valid_chain(blockchain.chain, Blockchain.validation_processes(blockchain.chain))
+        print('Chain valid')
+
+    os.makedirs(args.out, exist_ok=True)
+
+    # Chain – load with Blockchain.from_json
+    with open(os.path.join(args.out, 'chain.json'), 'wb') as file:
+        file.write(blockchain.serialize())
+
+    # Transaction stream – one JSON Transaction per line
+    with open(os.path.join(args.out, 'transactions.jsonl'), 'w') as file:
+        for transaction_json in stream:
+            file.write(json.dumps(transaction_json) + '\n')
+
+    # Key pool – test data only, lets load tests sign as generated wallets
+    with open(os.path.join(args.out, 'wallets.json'), 'w') as file:
+        json.dump([{'address': address, 'private_value': secret} for secret, address in keys], file)
+
+    print(f'Wrote chain, {len(stream)} stream Transactions and {len(keys)} wallets to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
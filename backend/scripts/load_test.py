@@ -0,0 +1,185 @@
+import json
+import math
+from argparse import ArgumentParser
+from random import Random
+from threading import Event, Thread
+from time import perf_counter, sleep
+import requests
+
+
+# Drives the node API with concurrent clients and reports throughput and
+# p50/p95/p99 latency per endpoint as JSON
+#
+# Example:
+#   python3 -m backend.scripts.load_test --concurrency 16 --duration 30 \
+#       --mix wallet_info=40,blockchain_range=40,wallet_transact=19,blockchain_mine=1
+
+DEFAULT_MIX = 'wallet_info=40,blockchain_range=40,wallet_transact=19,blockchain_mine=1'
+
+# Blocks per /blockchain/range page (same as frontend)
+PAGE_RANGE = 3
+
+def wallet_transact(session, base_url, rng):
+    return session.post(f'{base_url}/wallet/transact',
+                        json={'recipient': f'load-{rng.getrandbits(32):08x}', 'amount': 1})
+
+def blockchain_mine(session, base_url, rng):
+    return session.get(f'{base_url}/blockchain/mine')
+
+def blockchain_mine_job(session, base_url, rng):
+    return session.post(f'{base_url}/blockchain/mine/jobs')
+
+def blockchain_range(session, base_url, rng):
+    start = rng.randrange(10) * PAGE_RANGE
+    return session.get(f'{base_url}/blockchain/range', params={'start': start, 'end': start + PAGE_RANGE})
+
+def blockchain_length(session, base_url, rng):
+    return session.get(f'{base_url}/blockchain/length')
+
+def wallet_info(session, base_url, rng):
+    return session.get(f'{base_url}/wallet/info')
+
+def transactions(session, base_url, rng):
+    return session.get(f'{base_url}/transactions')
+
+ENDPOINTS = {
+    'wallet_transact': wallet_transact,
+    'blockchain_mine': blockchain_mine,
+    'blockchain_mine_job': blockchain_mine_job,
+    'blockchain_range': blockchain_range,
+    'blockchain_length': blockchain_length,
+    'wallet_info': wallet_info,
+    'transactions': transactions
+}
+
+def parse_mix(mix):
+    """
+    Parse request mix ('name=weight,...')
+    :param mix: <str> Request mix
+    :return: <dict> Endpoint name to weight
+    """
+    weights = {}
+
+    for entry in mix.split(','):
+        name, weight = entry.split('=')
+
+        if name not in ENDPOINTS:
+            raise Exception(f'Unknown endpoint {name} (choose from {", ".join(ENDPOINTS)})')
+
+        weights[name] = float(weight)
+
+    return weights
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile
+    :param sorted_values: <list> Values in ascending order
+    :param percent: <float> Percentile (0-100)
+    :return: <float> Percentile value (None if no values)
+    """
+    if not sorted_values:
+        return None
+
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+def run_client(base_url, weights, seed, stop, results):
+    """
+    Send requests until stopped, recording latency per endpoint
+    :param results: <dict> Endpoint name to list of (latency in seconds, ok) – filled by client
+    :return: None
+    """
+    rng = Random(seed)
+    names = list(weights)
+    endpoint_weights = list(weights.values())
+    session = requests.Session()
+
+    while not stop.is_set():
+        name = rng.choices(names, endpoint_weights)[0]
+        start_time = perf_counter()
+
+        try:
+            ok = ENDPOINTS[name](session, base_url, rng).ok
+        except requests.RequestException:
+            ok = False
+
+        results.setdefault(name, []).append((perf_counter() - start_time, ok))
+
+    session.close()
+
+def summarize(results, duration):
+    """
+    Build JSON report from client results
+    :param results: <list> Results of every client
+    :param duration: <float> Length of run in seconds
+    :return: <dict> Report
+    """
+    endpoints = {}
+
+    for client_results in results:
+        for name, samples in client_results.items():
+            endpoints.setdefault(name, []).extend(samples)
+
+    report = {
+        'duration_s': duration,
+        'requests': sum(len(samples) for samples in endpoints.values()),
+        'endpoints': {}
+    }
+    report['throughput_rps'] = report['requests'] / duration
+
+    for name, samples in sorted(endpoints.items()):
+        latencies = sorted(latency * 1000 for latency, ok in samples)
+        report['endpoints'][name] = {
+            'requests': len(samples),
+            'errors': sum(1 for latency, ok in samples if not ok),
+            'throughput_rps': len(samples) / duration,
+            'mean_ms': sum(latencies) / len(latencies),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'max_ms': latencies[-1]
+        }
+
+    return report
+
+def main():
+    parser = ArgumentParser(description='Load test a local node API')
+    parser.add_argument('--url', default='http://localhost:5000', help='base URL of node')
+    parser.add_argument('--concurrency', type=int, default=8, help='number of concurrent clients')
+    parser.add_argument('--duration', type=float, default=10, help='seconds to run')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='request mix (endpoint=weight,...)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='write JSON report to file (default: stdout)')
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    stop = Event()
+    results = [{} for i in range(args.concurrency)]
+    clients = [
+        Thread(target=run_client, args=(args.url, weights, args.seed + i, stop, results[i]))
+        for i in range(args.concurrency)
+    ]
+
+    start_time = perf_counter()
+    for client in clients:
+        client.start()
+
+    sleep(args.duration)
+    stop.set()
+
+    for client in clients:
+        client.join()
+
+    report = summarize(results, perf_counter() - start_time)
+    report['concurrency'] = args.concurrency
+    report['mix'] = weights
+
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
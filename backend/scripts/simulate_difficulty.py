@@ -0,0 +1,160 @@
+import json
+import statistics
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+from backend.blockchain.block import Block, MINE_INTERRUPT_INTERVAL
+from backend.config import SECONDS, MINE_RATE
+
+
+# Simulates Block.adjust_difficulty dynamics without hashing
+# - A hash meets difficulty d with probability 2^-d, so with hashrate h the time
+#   to find a Block at fixed difficulty is exponential with rate h * 2^-d
+# - mine_block recomputes difficulty from the elapsed time on every attempt:
+#   prev difficulty + 1 before the mine rate has elapsed, prev difficulty - 1 after.
+#   Both phases are simulated exactly (exponential waiting times are memoryless)
+# - Miners racing on the same difficulty find Blocks exactly like one miner with their
+#   total hashrate (no propagation delay is modelled), so only the total is simulated
+#
+# Example:
+#   python3 -m backend.scripts.simulate_difficulty --blocks 10000 --measure --miners 4 \
+#       --schedule 0:1,5000:4
+
+# Difficulty of Block used to measure hashrate (never met, so mining runs until stopped)
+MEASURE_DIFFICULTY = 250
+
+def measure_hashrate(seconds=2):
+    """
+    Measure hashrate of this machine with the real mining loop
+    :param seconds: <float> Time spent mining
+    :return: <float> Hashes per second
+    """
+    prev_block = Block(0, 'measure_prev_hash', 'measure_hash', [], MEASURE_DIFFICULTY, 0)
+    checks = []
+    start_time = perf_counter()
+
+    def interrupt():
+        checks.append(1)
+        return perf_counter() - start_time >= seconds
+
+    Block.mine_block(prev_block, 'measure_data', interrupt)
+    return len(checks) * MINE_INTERRUPT_INTERVAL / (perf_counter() - start_time)
+
+def parse_schedule(schedule):
+    """
+    Parse hashrate schedule ('height:multiplier,...')
+    :param schedule: <str> Schedule
+    :return: <list> (height, multiplier) pairs sorted by height
+    """
+    pairs = [entry.split(':') for entry in schedule.split(',')]
+    return sorted((int(height), float(multiplier)) for height, multiplier in pairs)
+
+def multiplier_at(schedule, height):
+    """
+    Hashrate multiplier in effect at Block height
+    :param schedule: <list> (height, multiplier) pairs sorted by height
+    :param height: <int> Block height
+    :return: <float> Multiplier (1 before first entry)
+    """
+    multiplier = 1
+
+    for start_height, start_multiplier in schedule:
+        if height < start_height:
+            break
+        multiplier = start_multiplier
+
+    return multiplier
+
+def simulate(blocks, hashrate, schedule=(), mine_rate=MINE_RATE, seed=0, adjust=Block.adjust_difficulty):
+    """
+    Simulate difficulty adjustment over many Blocks
+    :param blocks: <int> Blocks mined after genesis
+    :param hashrate: <float> Hashes per second of all miners together
+    :param schedule: <list> (height, multiplier) pairs scaling hashrate
+    :param mine_rate: <int> Target time between Blocks (ns)
+    :param seed: <int> Seed of random number generator
+    :param adjust: <callable> Difficulty policy (prev_block, timestamp, mine_rate) – difficulty
+                   may only change once mine_rate has elapsed since previous Block
+    :return: <list> (height, timestamp, time to mine in seconds, difficulty) per Block
+    """
+    rng = Random(seed)
+    prev_block = Block.genesis()
+    results = []
+
+    for height in range(1, blocks + 1):
+        current_hashrate = hashrate * multiplier_at(schedule, height)
+        start = prev_block.timestamp
+
+        # Phase 1 – before mine rate has elapsed
+        difficulty = adjust(prev_block, start, mine_rate)
+        elapsed = rng.expovariate(current_hashrate / 2 ** difficulty) * SECONDS
+
+        # Phase 2 – mine rate elapsed without a Block
+        if elapsed >= mine_rate:
+            difficulty = adjust(prev_block, start + mine_rate, mine_rate)
+            elapsed = mine_rate + rng.expovariate(current_hashrate / 2 ** difficulty) * SECONDS
+
+        timestamp = start + max(int(elapsed), 1)
+        results.append((height, timestamp, elapsed / SECONDS, difficulty))
+        prev_block = Block(timestamp, prev_block.hash, f'simulated_{height}', [], difficulty, 0)
+
+    return results
+
+def summarize(results, hashrate, mine_rate):
+    """
+    Summary statistics of simulated Blocks
+    :return: <dict> Summary
+    """
+    times = [time for height, timestamp, time, difficulty in results]
+    difficulties = [difficulty for height, timestamp, time, difficulty in results]
+    settled = times[len(times) // 2:]
+
+    return {
+        'blocks': len(results),
+        'target_s': mine_rate / SECONDS,
+        'hashrate': hashrate,
+        'mean_time_s': statistics.fmean(times),
+        'mean_time_second_half_s': statistics.fmean(settled),
+        'stdev_time_s': statistics.pstdev(times),
+        'median_time_s': statistics.median(times),
+        'max_time_s': max(times),
+        'difficulty': {
+            'min': min(difficulties),
+            'max': max(difficulties),
+            'mean': statistics.fmean(difficulties),
+            'final': difficulties[-1]
+        }
+    }
+
+def main():
+    parser = ArgumentParser(description='Simulate difficulty adjustment without mining')
+    parser.add_argument('--blocks', type=int, default=10000)
+    parser.add_argument('--hashrate', type=float, default=100_000, help='hashes per second of one unit miner')
+    parser.add_argument('--measure', action='store_true', help='measure unit hashrate on this machine')
+    parser.add_argument('--miners', type=int, default=1, help='number of unit miners (total hashrate simulated)')
+    parser.add_argument('--schedule', default='', help='hashrate multiplier from Block height (e.g. 0:1,5000:4)')
+    parser.add_argument('--mine-rate', type=float, default=MINE_RATE / SECONDS, help='target seconds per Block')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='write per-Block results as JSON lines')
+    args = parser.parse_args()
+
+    unit_hashrate = measure_hashrate() if args.measure else args.hashrate
+    hashrate = unit_hashrate * args.miners
+    schedule = parse_schedule(args.schedule) if args.schedule else []
+    mine_rate = int(args.mine_rate * SECONDS)
+
+    start_time = perf_counter()
+    results = simulate(args.blocks, hashrate, schedule, mine_rate, args.seed)
+    summary = summarize(results, hashrate, mine_rate)
+    summary['simulation_s'] = perf_counter() - start_time
+    print(json.dumps(summary, indent=2))
+
+    if args.out:
+        with open(args.out, 'w') as file:
+            for height, timestamp, time, difficulty in results:
+                file.write(json.dumps(
+                    {'height': height, 'timestamp': timestamp, 'time_s': time, 'difficulty': difficulty}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from backend.blockchain.block import Block
+from backend.blockchain.blockchain import Blockchain
+from backend.util.rwlock import ReadWriteLock
+from backend.config import VALIDATION_PROCESSES
+
+
+# Number of Blocks requested per body download
+SYNC_RANGE_SIZE = 100
+
+# Number of body ranges downloaded in parallel
+SYNC_WORKERS = 4
+
+def validate_blocks(headers, start, blocks, process_pool=None):
+    """
+    Validate downloaded Blocks against already validated header chain
+    - Header fields of legacy Blocks are not covered by the header chain check (their hash
+      covers data), so each Block is linked to the header below it and its hash recomputed
+    :param headers: <list> Validated header chain
+    :param start: <int> Height of first Block in range
+    :param blocks: <list> Downloaded Blocks
+    :param process_pool: <ProcessPoolExecutor> Optional pool verifying Block hashes off this process
+    :return: None
+    :raises Exception: Throw if any Block does not match its header or is invalid
+    """
+    for offset, block in enumerate(blocks):
+        height = start + offset
+
+        if height >= len(headers) or block.hash != headers[height].hash:
+            raise Exception(f'Block at height {height} does not match header chain')
+
+        # Header below has the hash of Block below (validated here or shared with local chain)
+        Block.is_valid_link(headers[height - 1], block)
+
+    # Hash recomputed from Block's own fields – a matching hash proves they are the header's
+    if process_pool:
+        process_pool.submit(Blockchain.is_valid_proofs, blocks).result()
+    else:
+        Blockchain.is_valid_proofs(blocks)
+
+
+class SyncClient:
+    """
+    Synchronizes local Blockchain with several known peers
+    - Keeps a pooled persistent HTTP session per peer
+    - Splits Block ranges across peers, retrying failed ranges on another peer
+    """
+    def __init__(self, peer_urls, processes=VALIDATION_PROCESSES):
+        """
+        Initialize SyncClient with one pooled session per peer
+        :param peer_urls: <list> Base URLs of peers (e.g. http://localhost:5000)
+        :param processes: <int> Worker processes verifying Block hashes (0 – verify in this process)
+        """
+        self.peer_urls = list(peer_urls)
+        self.sessions = {peer_url: SyncClient.create_session() for peer_url in self.peer_urls}
+        self.processes = processes
+        self.process_pool = None
+
+    def close(self):
+        """
+        Close all peer sessions
+        :return: None
+        """
+        for session in self.sessions.values():
+            session.close()
+
+    def get(self, peer_url, path, params=None):
+        """
+        GET JSON from peer over its persistent session
+        :param peer_url: <str> Base URL of peer
+        :param path: <str> Path of endpoint
+        :param params: <dict> Query parameters
+        :return: <json> Response body
+        """
+        result = self.sessions[peer_url].get(f'{peer_url}{path}', params=params)
+        result.raise_for_status()
+        return result.json()
+
+    def fetch_work(self, peer_url):
+        """
+        Get cumulative work of peer chain
+        :param peer_url: <str> Base URL of peer
+        :return: <int> Work of peer chain (see Blockchain.block_work)
+        """
+        return self.get(peer_url, '/blockchain/work')
+
+    def fetch_headers(self, peer_url):
+        """
+        Download header chain of peer
+        :param peer_url: <str> Base URL of peer
+        :return: <list> Headers (Blocks without data) in chain order
+        """
+        return list(map(lambda header_json: Block.from_header_json(header_json),
+                        self.get(peer_url, '/blockchain/headers')))
+
+    def fetch_blocks(self, peer_url, start, end):
+        """
+        Download range of full Blocks from peer
+        :param peer_url: <str> Base URL of peer
+        :param start: <int> Height of first Block in range
+        :param end: <int> Height after last Block in range
+        :return: <list> Blocks in chain order
+        """
+        return list(map(lambda block_json: Block.from_json(block_json),
+                        self.get(peer_url, '/blockchain/blocks', {'start': start, 'end': end})))
+
+    def fetch_range(self, headers, start, end, peer_urls):
+        """
+        Download and validate range of Blocks, trying each peer in turn
+        :param headers: <list> Validated header chain
+        :param start: <int> Height of first Block in range
+        :param end: <int> Height after last Block in range
+        :param peer_urls: <list> Peers to try (in order)
+        :return: <list> Validated Blocks in chain order
+        :raises Exception: Throw if no peer returned a valid range
+        """
+        errors = []
+
+        for peer_url in peer_urls:
+            try:
+                blocks = self.fetch_blocks(peer_url, start, end)
+
+                if len(blocks) != end - start:
+                    raise Exception(f'Incomplete Block range {start}-{end}')
+
+                validate_blocks(headers, start, blocks, self.process_pool)
+                return blocks
+            except Exception as e:
+                errors.append(f'{peer_url}: {e}')
+
+        raise Exception(f'Block range {start}-{end} failed on every peer ({"; ".join(errors)})')
+
+    def heaviest_peer(self):
+        """
+        Find reachable peer whose chain has most cumulative work
+        :return: <tuple> (peer URL, chain work) or (None, 0) if no peer reachable
+        """
+        best_peer, best_work = None, 0
+
+        for peer_url in self.peer_urls:
+            try:
+                work = self.fetch_work(peer_url)
+            except Exception:
+                continue
+
+            if work > best_work:
+                best_peer, best_work = peer_url, work
+
+        return best_peer, best_work
+
+    def synchronize(self, blockchain, lock=None):
+        """
+        Synchronize local Blockchain with peers (headers-first)
+
+        Steps:
+            - Download and validate header chain of peer with most cumulative work
+              (difficulty, prev_hash, leading zeros of hash – hash recomputed for Merkle Blocks only,
+              legacy Block hashes are verified once their data arrives)
+            - Download Block bodies after last Block shared with local chain, in parallel
+              ranges spread across all peers, validating each range as it arrives
+            - Switch local chain to downloaded Blocks (see Blockchain.replace_chain – only
+              Blocks after fork point rolled back and applied)
+
+        Nothing is locked while downloading – local chain may change meanwhile
+
+        :param blockchain: <Blockchain> Local Blockchain
+        :param lock: <ReadWriteLock> Lock guarding local Blockchain
+        :return: <tuple> (<list> Blocks removed from main chain, <list> Blocks added to main chain)
+        :raises Exception: Throw if local chain not replaced
+        """
+        lock = lock or ReadWriteLock()
+        header_peer, work = self.heaviest_peer()
+
+        if header_peer is None:
+            raise Exception('Cannot synchronize – No peer reachable')
+
+        with lock.read():
+            local_chain = list(blockchain.chain)
+            local_work = blockchain.tip_work()
+
+        if work <= local_work:
+            raise Exception('Cannot synchronize – Peer chain must have more cumulative work')
+
+        headers = self.fetch_headers(header_peer)
+
+        if sum(map(Blockchain.block_work, headers)) <= local_work:
+            raise Exception('Cannot synchronize – Peer chain must have more cumulative work')
+
+        # Reject broken chain (and forged Merkle headers) before downloading any Block data
+        try:
+            Blockchain.is_valid_header_chain(headers)
+        except Exception as e:
+            raise Exception(f'Cannot synchronize - Peer header chain invalid: {e}')
+
+        # Last Block shared with local chain – only Blocks after it are downloaded
+        ancestor_height = min(len(headers), len(local_chain)) - 1
+
+        while headers[ancestor_height].hash != local_chain[ancestor_height].hash:
+            ancestor_height -= 1
+
+        chain = local_chain[:ancestor_height + 1] + [None] * (len(headers) - ancestor_height - 1)
+
+        if self.processes > 1 and Blockchain.validation_processes(headers[ancestor_height + 1:]):
+            self.process_pool = ProcessPoolExecutor(self.processes)
+
+        with ThreadPoolExecutor(SYNC_WORKERS * len(self.peer_urls)) as executor:
+            futures = {}
+
+            for i, start in enumerate(range(ancestor_height + 1, len(headers), SYNC_RANGE_SIZE)):
+                end = min(start + SYNC_RANGE_SIZE, len(headers))
+                # Round-robin ranges across peers – remaining peers are retried on failure
+                first = i % len(self.peer_urls)
+                peer_urls = self.peer_urls[first:] + self.peer_urls[:first]
+                futures[executor.submit(self.fetch_range, headers, start, end, peer_urls)] = (start, end)
+
+            try:
+                for future in as_completed(futures):
+                    start, end = futures[future]
+                    chain[start:end] = future.result()
+            except Exception as e:
+                # Stop downloading remaining ranges of invalid chain
+                for future in futures:
+                    future.cancel()
+                raise Exception(f'Cannot synchronize - Peer chain invalid: {e}')
+            finally:
+                if self.process_pool:
+                    self.process_pool.shutdown(cancel_futures=True)
+                    self.process_pool = None
+
+        # Work compared again and Transactions validated against local balances
+        # (local chain may have grown while downloading) – Block hashes not verified again
+        with lock.write():
+            try:
+                return blockchain.replace_chain(chain, validated=True)
+            except Exception as e:
+                raise Exception(f'Cannot synchronize - {e}')
+
+    @staticmethod
+    def create_session():
+        """
+        Create persistent HTTP session with connection pool sized for parallel downloads
+        :return: <requests.Session> Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SYNC_WORKERS, max_retries=1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
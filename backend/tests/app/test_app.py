@@ -0,0 +1,204 @@
+import json
+import pytest
+from backend.app import create_app
+from backend.app.events import ChainEvents
+from backend.app.background import BackgroundPubSub, StartupTasks, TASK_STATUS
+from backend.blockchain.blockchain import Blockchain
+from backend.util.event_bus import EventBus
+from backend.util.rwlock import ReadWriteLock
+from backend.wallet.transaction import Transaction
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction_pool import TransactionPool
+
+
+class FakePubSub:
+    def __init__(self, *args):
+        self.blocks = []
+
+    def broadcast_block(self, block):
+        self.blocks.append(block)
+
+@pytest.fixture
+def client():
+    return create_app(start_background=False).test_client()
+
+def test_health(client):
+    response = client.get('/health')
+
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'ok'
+    # Startup tasks not started
+    assert all(task['status'] == TASK_STATUS['PENDING'] for task in response.get_json()['startup'].values())
+
+def test_wallet_info(client):
+    wallet_info = client.get('/wallet/info').get_json()
+
+    assert wallet_info['balance'] == 1000
+    assert client.get(f'/wallet/history/{wallet_info["address"]}').get_json()['total'] == 0
+
+def test_transaction_not_found(client):
+    assert client.get('/transaction/unknown').status_code == 404
+
+def test_wallet_transact_batch(client):
+    payments = [{'recipient': f'recipient_{i}', 'amount': 1} for i in range(100)]
+    transaction = client.post('/wallet/transact/batch', json={'payments': payments}).get_json()
+
+    # One Transaction paying every recipient
+    assert len(transaction['output']) == 101
+
+    assert client.post('/wallet/transact/batch', json={'payments': []}).status_code == 400
+
+def test_wallet_transact_batch_malformed(client):
+    # Missing fields or non-numeric amounts refused, not server errors
+    for body in ({}, {'payments': [{'amount': 1}]}, {'payments': [{'recipient': 'foo'}]},
+                 {'payments': [{'recipient': 'foo', 'amount': True}]}, {'payments': [{'recipient': 'foo', 'amount': '1'}]}):
+        assert client.post('/wallet/transact/batch', json=body).status_code == 400
+
+    assert client.get('/transactions').get_json() == []
+
+def test_blockchain_work(client):
+    # Cumulative work of genesis-only chain
+    assert client.get('/blockchain/work').get_json() == Blockchain().tip_work()
+
+def test_blockchain_stats_window_capped(monkeypatch):
+    monkeypatch.setattr('backend.app.MAX_STATS_WINDOW', 2)
+    client = create_app(start_background=False).test_client()
+
+    for i in range(3):
+        client.get('/blockchain/mine')
+
+    assert client.get('/blockchain/stats?window=10000000').get_json() == client.get('/blockchain/stats?window=2').get_json()
+
+def test_blockchain_stats_segments_clamped(client):
+    for i in range(3):
+        client.get('/blockchain/mine')
+
+    for segments in (0, -5):
+        response = client.get(f'/blockchain/stats?segments={segments}')
+
+        assert response.status_code == 200
+        assert len(response.get_json()['throughput']) == 1
+
+def test_pruned_blocks(monkeypatch):
+    monkeypatch.setattr('backend.app.PRUNE_DEPTH', 1)
+    client = create_app(start_background=False).test_client()
+
+    for i in range(2):
+        client.get('/blockchain/mine')
+
+    # Only most recent Block served in full
+    assert client.get('/blockchain/blocks?start=2&end=3').status_code == 200
+    assert client.get('/blockchain/blocks?start=0&end=3').status_code == 410
+    assert client.get('/blockchain/range?start=0&end=1').status_code == 200
+    assert client.get('/blockchain/pruning').get_json()['pruned_blocks'] == 1
+
+def test_create_app_twice():
+    create_app(start_background=False)
+
+    # Gauges of earlier app replaced
+    assert create_app(start_background=False).test_client().get('/blockchain/length').get_json() == 1
+
+def test_background_pubsub_queues_until_connected(monkeypatch):
+    monkeypatch.setattr('backend.pubsub.PubSub', FakePubSub)
+    pubsub = BackgroundPubSub(Blockchain(), TransactionPool(), ReadWriteLock())
+    pubsub.broadcast_block('block_1')
+
+    assert not pubsub.connected
+
+    # Queued broadcasts sent once connected, later ones sent directly
+    pubsub.connect()
+    pubsub.broadcast_block('block_2')
+
+    assert pubsub.connected
+    assert pubsub.pubsub.blocks == ['block_1', 'block_2']
+
+def test_startup_tasks():
+    def fail():
+        raise Exception('unreachable')
+
+    startup = StartupTasks()
+    startup.add('skipped', lambda: False)
+    startup.add('failed', fail)
+    startup.add('done', lambda: None)
+    startup.run()
+    status = startup.to_json()
+
+    # Failing task does not stop the ones after it
+    assert status['skipped']['status'] == TASK_STATUS['SKIPPED']
+    assert status['failed'] == {'status': TASK_STATUS['FAILED'], 'error': 'unreachable', 'seconds': status['failed']['seconds']}
+    assert status['done']['status'] == TASK_STATUS['DONE']
+
+def read_events(subscription):
+    events = []
+
+    while True:
+        message = subscription.get(0)
+
+        if message is None:
+            return events
+
+        event, data = message.decode('utf-8').strip().split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+
+def test_chain_events():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    lock = ReadWriteLock()
+    bus = EventBus()
+    ChainEvents(blockchain, transaction_pool, lock, bus)
+    subscription = bus.subscribe()
+    transaction = Transaction(Wallet(), 'recipient', 1)
+
+    with lock.write():
+        blockchain.add_block(['foo'])
+        transaction_pool.set_transaction(transaction)
+
+    # Appended Block, new tip and pool pushed
+    assert read_events(subscription) == [
+        ('block', blockchain.chain[-1].to_json()),
+        ('tip', {'height': 1, 'hash': blockchain.chain[-1].hash, 'length': 2, 'reset': False}),
+        ('pool', {'updated': json.loads(json.dumps([transaction.to_json()])), 'removed': []})
+    ]
+
+    # Nothing changed – nothing pushed
+    with lock.write():
+        pass
+
+    assert read_events(subscription) == []
+
+    # Only changes pushed, not whole pool
+    other_transaction = Transaction(Wallet(), 'recipient', 2)
+
+    with lock.write():
+        transaction_pool.set_transaction(other_transaction)
+        transaction_pool.remove_transaction(transaction.id)
+
+    assert read_events(subscription) == [
+        ('pool', {'updated': json.loads(json.dumps([other_transaction.to_json()])), 'removed': [transaction.id]})
+    ]
+
+def test_chain_events_reset(monkeypatch):
+    monkeypatch.setattr('backend.app.events.MAX_PUSHED_BLOCKS', 1)
+    blockchain = Blockchain()
+    lock = ReadWriteLock()
+    bus = EventBus()
+    ChainEvents(blockchain, TransactionPool(), lock, bus)
+    subscription = bus.subscribe()
+
+    with lock.write():
+        blockchain.add_block(['foo'])
+        blockchain.add_block(['bar'])
+
+    # Large jump announced by tip alone
+    assert read_events(subscription) == [
+        ('tip', {'height': 2, 'hash': blockchain.chain[-1].hash, 'length': 3, 'reset': True})
+    ]
+
+def test_events_stream(client):
+    response = client.get('/events', buffered=False)
+
+    assert response.mimetype == 'text/event-stream'
+    # Stream opens with current tip
+    assert next(response.response).startswith(b'event: tip\n')
+
+    response.close()
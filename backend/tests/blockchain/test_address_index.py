@@ -0,0 +1,33 @@
+from backend.blockchain.address_index import AddressIndex
+from backend.blockchain.block import Block
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction import Transaction
+
+
+def test_add_and_remove_block():
+    address_index = AddressIndex()
+    wallet = Wallet()
+    transaction = Transaction(wallet, 'recipient', 10)
+    reward = Transaction.reward_transaction(wallet)
+    block = Block.mine_block(Block.genesis(), [transaction.to_json(), reward.to_json()])
+
+    address_index.add_block(block, 1)
+
+    # Sender and recipients indexed (not mining reward input)
+    assert address_index.history(wallet.address) == (2, [(1, reward.id), (1, transaction.id)])
+    assert address_index.history('recipient') == (1, [(1, transaction.id)])
+    assert sorted(address_index.addresses()) == sorted([wallet.address, 'recipient'])
+
+    address_index.remove_block(block, 1)
+
+    assert address_index.postings == {}
+
+def test_history_pages():
+    address_index = AddressIndex()
+    address_index.postings['address'] = [(height, f'id_{height}') for height in range(1, 6)]
+
+    # Most recent first
+    assert address_index.history('address', 0, 2) == (5, [(5, 'id_5'), (4, 'id_4')])
+    assert address_index.history('address', 4, 2) == (5, [(1, 'id_1')])
+    assert address_index.history('address', 10, 2) == (5, [])
+    assert address_index.history('unknown') == (0, [])
@@ -1,7 +1,9 @@
+import json
 from time import sleep, time_ns
 import pytest
 from backend.blockchain.block import Block, GENESIS_DATA
-from backend.config import MINE_RATE, SECONDS
+from backend.config import MINE_RATE, SECONDS, LEGACY_BLOCK_VERSION, MERKLE_BLOCK_VERSION
+from backend.util.merkle import merkle_root
 from backend.util.hex_to_binary import hex_to_binary
 
 
@@ -53,6 +55,13 @@ def test_block_difficulty_floored_at_1():
     # Difficulty cannot go below 1
     assert mined_block.difficulty == 1
 
+def test_adjust_difficulty_mine_rate():
+    prev_block = Block(0, 'test_prev_hash', 'test_hash', 'test_data', 5, 0)
+
+    # Same elapsed time is too quick for a slow target, too slow for a fast one
+    assert Block.adjust_difficulty(prev_block, 2 * SECONDS, mine_rate=4 * SECONDS) == 6
+    assert Block.adjust_difficulty(prev_block, 2 * SECONDS, mine_rate=1 * SECONDS) == 4
+
 @pytest.fixture
 def prev_block():
     return Block.genesis()
@@ -61,6 +70,18 @@ def prev_block():
 def block(prev_block):
     return Block.mine_block(prev_block, 'test_data')
 
+def test_prune(prev_block, block):
+    header = block.to_header_json()
+    block.serialize()
+
+    # Data dropped, header kept
+    assert block.prune() > 0
+    assert block.data is None
+    assert block.to_header_json() == header
+
+    # Next Block still validated against pruned Block
+    Block.is_valid_block(block, Block.mine_block(block, 'next_data'))
+
 def test_is_valid_block(prev_block, block):
     # Valid
     Block.is_valid_block(prev_block, block)
@@ -90,3 +111,117 @@ def test_is_valid_block_bad_hash(prev_block, block):
     block.hash = '00000000000000000000000123abc'
     with pytest.raises(Exception, match='Block hash incorrect'):
         Block.is_valid_block(prev_block, block)
+
+def test_to_header_json(block):
+    header_json = block.to_header_json()
+
+    # Header contains every field except data
+    assert 'data' not in header_json
+    assert header_json['hash'] == block.hash
+
+    # Header restored without data
+    header = Block.from_header_json(header_json)
+    assert header.data is None
+    assert header.to_header_json() == header_json
+
+def test_is_valid_header(prev_block, block):
+    # Valid without Block data
+    Block.is_valid_header(prev_block, Block.from_header_json(block.to_header_json()))
+
+def test_is_valid_header_bad_proof_of_work(prev_block, block):
+    # 'Proof of Work' requirement not met
+    header = Block.from_header_json(block.to_header_json())
+    header.hash = 'fff'
+    with pytest.raises(Exception, match="'Proof of Work' requirement not met"):
+        Block.is_valid_header(prev_block, header)
+
+def test_mine_block_interrupted():
+    # Unreachable difficulty – mining stops when interrupted
+    prev_block = Block(time_ns(), 'test_prev_hash', 'test_hash', 'test_data', 64, 0)
+    assert Block.mine_block(prev_block, 'foo', lambda: True) is None
+
+def test_serialize(block):
+    serialized = block.serialize()
+
+    # Canonical JSON of Block fields
+    assert json.loads(serialized) == block.to_json()
+
+    # Encoded once and reused
+    assert block.serialize() is serialized
+
+    # Changing a field drops cached encoding
+    block.nonce = 'changed'
+    assert json.loads(block.serialize())['nonce'] == 'changed'
+
+def test_reconstructed_hash(block):
+    # Mined Block hash reused without rehashing
+    assert block.reconstructed_hash() == block.hash
+
+    block.data = 'changed_data'
+    assert block.reconstructed_hash() != block.hash
+
+def test_mine_block_copies_data(prev_block):
+    data = [{'id': 'a', 'output': {'recipient': 1}}]
+    block = Block.mine_block(prev_block, data)
+
+    # Caller changing its data in place afterwards leaves Block (and its cached hash) consistent
+    data[0]['output']['recipient'] = 2
+
+    assert block.data == [{'id': 'a', 'output': {'recipient': 1}}]
+    Block.is_valid_block(prev_block, Block.from_json(json.loads(block.serialize())))
+
+@pytest.fixture
+def merkle_block(prev_block):
+    return Block.mine_block(prev_block, [{'id': 'a'}, {'id': 'b'}], version=MERKLE_BLOCK_VERSION)
+
+def test_mine_merkle_block(prev_block, merkle_block):
+    # Header commits to Merkle root of data
+    assert merkle_block.version == MERKLE_BLOCK_VERSION
+    assert merkle_block.merkle_root == merkle_root(merkle_block.data)
+    assert merkle_block.to_header_json()['merkle_root'] == merkle_block.merkle_root
+
+    # Block hash covers header only
+    assert merkle_block.hash == Block.header_hash(
+        merkle_block.version, merkle_block.timestamp, merkle_block.prev_hash,
+        merkle_block.merkle_root, merkle_block.difficulty, merkle_block.nonce)
+
+    # Valid, including after round trip through JSON
+    Block.is_valid_block(prev_block, merkle_block)
+    Block.is_valid_block(prev_block, Block.from_json(json.loads(merkle_block.serialize())))
+
+def test_legacy_block_format(block):
+    # Legacy Blocks serialize without version fields
+    assert block.version == LEGACY_BLOCK_VERSION
+    assert 'merkle_root' not in block.to_json()
+
+def test_is_valid_merkle_block_bad_data(prev_block, merkle_block):
+    # Data no longer matches Merkle root
+    merkle_block.data = [{'id': 'evil'}]
+    with pytest.raises(Exception, match='Block merkle_root incorrect'):
+        Block.is_valid_block(prev_block, merkle_block)
+
+def test_is_valid_merkle_block_bad_merkle_root(prev_block, merkle_block):
+    # Merkle root changed – header hash no longer matches
+    merkle_block.data = [{'id': 'evil'}]
+    merkle_block.merkle_root = merkle_root(merkle_block.data)
+    with pytest.raises(Exception, match='Block hash incorrect'):
+        Block.is_valid_block(prev_block, merkle_block)
+
+def test_is_valid_merkle_header_forged_hash(prev_block, merkle_block):
+    header = Block.from_header_json(merkle_block.to_header_json())
+    Block.is_valid_header(prev_block, header)
+
+    # Leading zeros alone do not pass – hash recomputed from header fields
+    header.hash = '0' * 64
+    with pytest.raises(Exception, match='Block hash incorrect'):
+        Block.is_valid_header(prev_block, header)
+
+def test_is_valid_merkle_block_duplicate_last_item(prev_block):
+    block = Block.mine_block(prev_block, [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}], version=MERKLE_BLOCK_VERSION)
+
+    # Repeating last item keeps Merkle root and hash
+    block.data = block.data + [{'id': 'c'}]
+    assert merkle_root(block.data) == block.merkle_root
+
+    with pytest.raises(Exception, match='duplicate items'):
+        Block.is_valid_block(prev_block, block)
@@ -1,8 +1,10 @@
+import json
 import pytest
 from backend.blockchain.blockchain import Blockchain
-from backend.blockchain.block import GENESIS_DATA
+from backend.blockchain.block import Block, GENESIS_DATA
 from backend.wallet.wallet import Wallet
 from backend.wallet.transaction import Transaction
+from backend.config import MINE_RATE, STARTING_BALANCE, MINING_REWARD, SECONDS
 
 
 def test_blockchain_instance():
@@ -20,6 +22,22 @@ def test_add_block():
     # (New Block should be added to end of chain)
     assert blockchain.chain[-1].data == data
 
+def test_append_block():
+    blockchain = Blockchain()
+    block = Block.mine_block(blockchain.chain[-1], 'test-data')
+    blockchain.append_block(block)
+
+    # Mined Block added to end of chain
+    assert blockchain.chain[-1] == block
+
+def test_append_block_not_extending_chain():
+    blockchain = Blockchain()
+    block = Block.mine_block(blockchain.chain[-1], 'test-data')
+    blockchain.add_block('other-data')
+
+    with pytest.raises(Exception, match='Block does not extend chain'):
+        blockchain.append_block(block)
+
 @pytest.fixture
 def blockchain_seven_blocks():
     blockchain = Blockchain()
@@ -29,10 +47,43 @@ def blockchain_seven_blocks():
 
     return blockchain
 
+def test_serialize(blockchain_seven_blocks):
+    # Same content as JSON of every Block
+    assert json.loads(blockchain_seven_blocks.serialize()) == json.loads(json.dumps(blockchain_seven_blocks.to_json()))
+
+def test_find_transaction(blockchain_seven_blocks):
+    transaction_json = blockchain_seven_blocks.chain[3].data[0]
+
+    # Block height and position of Transaction
+    assert blockchain_seven_blocks.find_transaction(transaction_json['id']) == (3, 0)
+    assert blockchain_seven_blocks.find_transaction('unknown') is None
+
+def test_find_block(blockchain_seven_blocks):
+    block = blockchain_seven_blocks.chain[5]
+
+    assert blockchain_seven_blocks.find_block(block.hash) is block
+    assert blockchain_seven_blocks.find_block('unknown') is None
+
 def test_is_valid_chain(blockchain_seven_blocks):
     # Valid
     Blockchain.is_valid_chain(blockchain_seven_blocks.chain)
 
+def test_is_valid_chain_parallel(blockchain_seven_blocks):
+    # Valid – Block hashes verified across worker processes
+    Blockchain.is_valid_chain(blockchain_seven_blocks.chain, processes=2)
+
+def test_is_valid_chain_parallel_bad_hash(blockchain_seven_blocks):
+    # Invalid hash found by worker process
+    blockchain_seven_blocks.chain[5].nonce = 'bad_nonce'
+    with pytest.raises(Exception, match='Block hash incorrect'):
+        Blockchain.is_valid_chain(blockchain_seven_blocks.chain, processes=2)
+
+def test_is_valid_chain_parallel_bad_link(blockchain_seven_blocks):
+    # Invalid link found by serial pass
+    blockchain_seven_blocks.chain[3].prev_hash = 'abc123'
+    with pytest.raises(Exception, match='Block prev_hash incorrect'):
+        Blockchain.is_valid_chain(blockchain_seven_blocks.chain, processes=2)
+
 def test_is_valid_chain_bad_genesis(blockchain_seven_blocks):
     # Invalid genesis Block
     blockchain_seven_blocks.chain[0].hash = 'bad_hash'
@@ -45,6 +96,18 @@ def test_is_valid_chain_bad_mined(blockchain_seven_blocks):
     with pytest.raises(Exception, match='Block prev_hash incorrect'):
         Blockchain.is_valid_chain(blockchain_seven_blocks.chain)
 
+def test_is_valid_header_chain(blockchain_seven_blocks):
+    # Valid
+    headers = [Block.from_header_json(block.to_header_json()) for block in blockchain_seven_blocks.chain]
+    Blockchain.is_valid_header_chain(headers)
+
+def test_is_valid_header_chain_bad_prev_hash(blockchain_seven_blocks):
+    # Invalid header link
+    headers = [Block.from_header_json(block.to_header_json()) for block in blockchain_seven_blocks.chain]
+    headers[4].prev_hash = 'abc123'
+    with pytest.raises(Exception, match='Block prev_hash incorrect'):
+        Blockchain.is_valid_header_chain(headers)
+
 def test_replace_chain(blockchain_seven_blocks):
     # Replaced
     blockchain = Blockchain()
@@ -52,12 +115,12 @@ def test_replace_chain(blockchain_seven_blocks):
 
     assert blockchain.chain == blockchain_seven_blocks.chain
 
-def test_replace_chain_not_longer(blockchain_seven_blocks):
+def test_replace_chain_not_more_work(blockchain_seven_blocks):
     # NOT Replaced
     blockchain = Blockchain()
     blockchain.replace_chain(blockchain_seven_blocks.chain)
 
-    with pytest.raises(Exception, match='Cannot replace – Incoming chain must be longer'):
+    with pytest.raises(Exception, match='Cannot replace – Incoming chain must have more cumulative work'):
         blockchain_seven_blocks.replace_chain(blockchain.chain)
 
 def test_replace_chain_bad_chain(blockchain_seven_blocks):
@@ -68,6 +131,13 @@ def test_replace_chain_bad_chain(blockchain_seven_blocks):
     with pytest.raises(Exception, match='Incoming chain invalid'):
         blockchain.replace_chain(blockchain_seven_blocks.chain)
 
+def test_replace_chain_validated_checks_links(blockchain_seven_blocks):
+    # Hashes trusted, links still checked
+    blockchain_seven_blocks.chain[3].prev_hash = 'abc123'
+
+    with pytest.raises(Exception, match='Block prev_hash incorrect'):
+        Blockchain().replace_chain(blockchain_seven_blocks.chain, validated=True)
+
 def test_valid_transaction_chain(blockchain_seven_blocks):
     # Valid
    Blockchain.is_valid_transaction_chain(blockchain_seven_blocks.chain)
@@ -81,6 +151,46 @@ def test_valid_transaction_chain_duplicate_transactions(blockchain_seven_blocks)
     with pytest.raises(Exception, match='is not unique'):
         Blockchain.is_valid_transaction_chain(blockchain_seven_blocks.chain)
 
+def test_valid_transaction_chain_double_spend(blockchain_seven_blocks):
+    # Invalid – both Transactions spend sender's balance before Block
+    wallet = Wallet()
+
+    blockchain_seven_blocks.add_block([Transaction(wallet, 'foo', 900).to_json(), Transaction(wallet, 'bar', 900).to_json()])
+
+    with pytest.raises(Exception, match='spends balance of sender more than once'):
+        Blockchain.is_valid_transaction_chain(blockchain_seven_blocks.chain)
+
+def test_valid_transaction_chain_one_transaction_per_sender():
+    # Valid – several senders per Block, each sender spending again in later Blocks
+    blockchain = Blockchain()
+    wallets = [Wallet(blockchain) for i in range(3)]
+
+    for i in range(3):
+        blockchain.add_block([Transaction(wallet, 'recipient', 10 + i).to_json() for wallet in wallets]
+                             + [Transaction.reward_transaction(wallets[0]).to_json()])
+
+    Blockchain.is_valid_chain(blockchain.chain)
+    Blockchain().replace_chain(blockchain.chain)
+
+    assert [wallet.balance for wallet in wallets] == [STARTING_BALANCE - 33 + 3 * MINING_REWARD, STARTING_BALANCE - 33, STARTING_BALANCE - 33]
+
+def test_valid_transaction_chain_no_change_entry(blockchain_seven_blocks):
+    # Invalid – whole balance paid out without sender's change entry, then spent again
+    wallet = Wallet(blockchain_seven_blocks)
+    output = {'foo': STARTING_BALANCE}
+    spend = Transaction(output=output, input=Transaction.create_input(wallet, output))
+    blockchain_seven_blocks.add_block([spend.to_json()])
+    blockchain_seven_blocks.add_block([Transaction(Wallet(), 'bar', 1).to_json()])
+
+    with pytest.raises(Exception, match='Output has no entry for sender'):
+        Blockchain.is_valid_transaction_chain(blockchain_seven_blocks.chain)
+
+    with pytest.raises(Exception, match='Output has no entry for sender'):
+        Blockchain().replace_chain(blockchain_seven_blocks.chain)
+
+    # Ledger no longer credits the spent balance
+    assert wallet.balance == 0
+
 def test_valid_transaction_chain_multiple_rewards(blockchain_seven_blocks):
     # Invalid
     reward_1 = Transaction.reward_transaction(Wallet()).to_json()
@@ -113,4 +223,197 @@ def test_valid_transaction_chain_bad_historic_balance(blockchain_seven_blocks):
 
     with pytest.raises(Exception, match='invalid input amount'):
         Blockchain.is_valid_transaction_chain(blockchain_seven_blocks.chain)
-        
\ No newline at end of file
+        
+def mine_fork_block(prev_block, data, quick):
+    # Quick Blocks raise difficulty (more work), slow Blocks lower it
+    timestamp = prev_block.timestamp + (1 if quick else MINE_RATE)
+    return Block.mine_block(prev_block, data, clock=lambda: timestamp)
+
+@pytest.fixture
+def forked_blockchain():
+    # Main chain: genesis -> a1 (slow) -> a2 (slow)
+    blockchain = Blockchain()
+    wallet = Wallet(blockchain)
+    transaction = Transaction(wallet, 'recipient', 10)
+    a1 = mine_fork_block(blockchain.chain[-1], [transaction.to_json()], quick=False)
+    a2 = mine_fork_block(a1, [], quick=False)
+    blockchain.receive_block(a1)
+    blockchain.receive_block(a2)
+
+    return blockchain, wallet, transaction
+
+def test_receive_block_extends_chain():
+    blockchain = Blockchain()
+    block = mine_fork_block(blockchain.chain[-1], [], quick=False)
+
+    assert blockchain.receive_block(block) == ([], [block])
+    assert blockchain.chain[-1] == block
+
+def test_receive_block_fork_with_less_work(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+    main_chain = blockchain.chain[:]
+    b1 = mine_fork_block(blockchain.chain[0], [], quick=False)
+
+    # Stored as candidate – equal work keeps Block seen first
+    assert blockchain.receive_block(b1) == ([], [])
+    assert blockchain.chain == main_chain
+    assert b1.hash in blockchain.tree
+
+def test_receive_block_fork_with_more_work(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+    a1, a2 = blockchain.chain[1:]
+    b1 = mine_fork_block(blockchain.chain[0], [], quick=True)
+
+    # Shorter fork with more cumulative work wins
+    assert blockchain.receive_block(b1) == ([a1, a2], [b1])
+    assert blockchain.chain == [Block.genesis(), b1]
+
+    # Balances rolled back with Blocks removed from main chain
+    assert wallet.balance == STARTING_BALANCE
+    assert blockchain.find_block(a1.hash) is None
+    assert blockchain.find_block(b1.hash) is b1
+
+def test_receive_block_invalid_fork(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+    main_chain = blockchain.chain[:]
+    # Fork with more work repeats a Transaction
+    b1 = mine_fork_block(blockchain.chain[0], [transaction.to_json(), transaction.to_json()], quick=True)
+
+    with pytest.raises(Exception, match='Fork invalid'):
+        blockchain.receive_block(b1)
+
+    # Main chain, balances and Block tree unchanged
+    assert blockchain.chain == main_chain
+    assert wallet.balance == STARTING_BALANCE - 10
+    assert b1.hash not in blockchain.tree
+
+def test_receive_block_unknown_parent():
+    blockchain = Blockchain()
+    orphan = mine_fork_block(mine_fork_block(blockchain.chain[-1], [], quick=False), [], quick=False)
+
+    with pytest.raises(Exception, match='unknown'):
+        blockchain.receive_block(orphan)
+
+def test_replace_chain_validates_only_suffix(forked_blockchain, monkeypatch):
+    blockchain, wallet, transaction = forked_blockchain
+    incoming_chain = blockchain.chain + [mine_fork_block(blockchain.chain[-1], [], quick=False)]
+    validated = []
+    is_valid_block = Block.is_valid_block
+    monkeypatch.setattr(Block, 'is_valid_block', staticmethod(
+        lambda prev_block, block: validated.append(block) or is_valid_block(prev_block, block)))
+
+    blockchain.replace_chain(incoming_chain)
+
+    # Only Block after last shared Block validated
+    assert validated == incoming_chain[-1:]
+    assert blockchain.chain == incoming_chain
+
+def test_replace_chain_shorter_fork_with_more_work(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+    incoming_chain = [Block.genesis(), mine_fork_block(blockchain.chain[0], [], quick=True)]
+
+    removed, added = blockchain.replace_chain(incoming_chain)
+
+    assert blockchain.chain == incoming_chain
+    assert len(removed) == 2
+    assert wallet.balance == STARTING_BALANCE
+
+def test_address_history_follows_reorg(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+    total, history = blockchain.address_history(wallet.address)
+
+    assert total == 1
+    assert history[0]['height'] == 1
+    assert history[0]['transaction'] == transaction.to_json()
+
+    # Fork without wallet's Transaction takes over
+    blockchain.receive_block(mine_fork_block(blockchain.chain[0], [], quick=True))
+
+    assert blockchain.address_history(wallet.address) == (0, [])
+    assert blockchain.known_addresses() == []
+
+def test_find_transaction_follows_reorg(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+
+    assert blockchain.find_transaction(transaction.id) == (1, 0)
+
+    # Fork without Transaction takes over, then Transaction mined again on top of it
+    b1 = mine_fork_block(blockchain.chain[0], [], quick=True)
+    blockchain.receive_block(b1)
+
+    assert not blockchain.has_transaction(transaction.id)
+
+    blockchain.receive_block(mine_fork_block(b1, [transaction.to_json()], quick=True))
+
+    assert blockchain.find_transaction(transaction.id) == (2, 0)
+
+def test_stats_follow_reorg(forked_blockchain):
+    blockchain, wallet, transaction = forked_blockchain
+
+    # First mined Block has no mine time – only a2 covered
+    assert blockchain.stats(window=10)['blocks'] == 1
+    assert blockchain.stats(window=10)['mine_time']['mean_s'] == MINE_RATE / SECONDS
+
+    # Quick b2 replaces a2 (more work)
+    b2 = mine_fork_block(blockchain.chain[1], [], quick=True)
+    blockchain.receive_block(b2)
+
+    assert blockchain.chain[-1] == b2
+    assert blockchain.stats(window=10)['mine_time']['mean_s'] == 1 / SECONDS
+    assert blockchain.stats(window=10)['difficulty']['current'] == b2.difficulty
+
+@pytest.fixture
+def pruned_blockchain():
+    # Data of Blocks more than 2 below tip dropped
+    blockchain = Blockchain(prune_depth=2)
+    wallet = Wallet(blockchain)
+
+    for i in range(4):
+        blockchain.receive_block(mine_fork_block(
+            blockchain.chain[-1], [Transaction(wallet, 'recipient', 10).to_json()], quick=False))
+
+    return blockchain, wallet
+
+def test_prune(pruned_blockchain):
+    blockchain, wallet = pruned_blockchain
+
+    # Headers of every Block kept, data of recent Blocks only
+    assert len(blockchain.chain) == 5
+    assert [block.data is None for block in blockchain.chain] == [False, True, True, False, False]
+    assert blockchain.is_pruned(0, 5)
+    assert not blockchain.is_pruned(3, 5)
+
+    stats = blockchain.prune_stats()
+    assert stats['pruned_blocks'] == 2
+    assert stats['reclaimed_bytes'] > 0
+
+    # Balances and Transaction locations still served from Ledger
+    assert wallet.balance == STARTING_BALANCE - 40
+    assert blockchain.address_history('recipient', limit=1)[1][0]['transaction'] is not None
+    assert blockchain.address_history('recipient')[1][-1]['transaction'] is None
+
+def test_prune_validates_new_blocks(pruned_blockchain):
+    blockchain, wallet = pruned_blockchain
+    block = mine_fork_block(blockchain.chain[-1], [Transaction(wallet, 'recipient', 10).to_json()], quick=False)
+    blockchain.receive_block(block)
+
+    assert blockchain.chain[-1] == block
+    assert blockchain.chain[3].data is None
+
+    # Transaction spending balance already spent
+    stale = Transaction(wallet, 'recipient', 10).to_json()
+    stale['input']['amount'] += 10
+
+    with pytest.raises(Exception, match='Fork invalid'):
+        blockchain.receive_block(mine_fork_block(blockchain.chain[-1], [stale], quick=False))
+
+def test_prune_rejects_reorg_below_pruned_height(pruned_blockchain):
+    blockchain, wallet = pruned_blockchain
+    # Fork with more work leaving main chain at pruned Block
+    fork = [mine_fork_block(blockchain.chain[1], [], quick=True)]
+
+    for i in range(3):
+        fork.append(mine_fork_block(fork[-1], [], quick=True))
+
+    with pytest.raises(Exception, match='below pruned height'):
+        blockchain.replace_chain(blockchain.chain[:2] + fork)
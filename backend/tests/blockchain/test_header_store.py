@@ -0,0 +1,81 @@
+import pytest
+from backend.blockchain import header_store
+from backend.blockchain.header_store import HeaderStore, percentile
+from backend.blockchain.block import Block
+from backend.config import SECONDS
+
+
+@pytest.fixture
+def store():
+    store = HeaderStore()
+    store.append(Block.genesis())
+
+    # First Block long after genesis, then Blocks 2, 3 and 4 seconds apart
+    # Difficulty 3, 4, 4, 5, 2 Transactions each
+    timestamp = Block.genesis().timestamp
+    for i, gap in enumerate([1000, 2, 3, 4]):
+        timestamp += gap * SECONDS
+        store.append(Block(timestamp, 'prev_hash', 'hash', [{}, {}], [3, 4, 4, 5][i], i))
+
+    return store
+
+def test_append_and_pop(store):
+    assert len(store) == 5
+    assert list(store.difficulties) == [10, 3, 4, 4, 5]
+
+    store.pop()
+
+    assert len(store) == 4
+
+def test_percentile():
+    # Linear interpolation between ranks
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([1, 2, 3, 4], 100) == 4
+
+def test_stats(store):
+    stats = store.stats(window=10, segments=2)
+
+    # Genesis interval skipped – aggregates cover heights 2 to 4
+    assert stats['blocks'] == 3
+    assert stats['start_height'] == 2
+    assert stats['mine_time'] == {'mean_s': 3, 'min_s': 2, 'max_s': 4, 'p50_s': 3, 'p90_s': 3.8, 'p99_s': 3.98}
+    assert stats['difficulty'] == {'current': 5, 'min': 4, 'max': 5, 'mean': 13 / 3, 'histogram': {4: 2, 5: 1}}
+
+    # First segment: 2 Transactions in 2 seconds, second: 4 Transactions in 7 seconds
+    assert [segment['transactions'] for segment in stats['throughput']] == [2, 4]
+    assert [segment['transactions_per_second'] for segment in stats['throughput']] == [1, 4 / 7]
+
+def test_stats_window(store):
+    stats = store.stats(window=2)
+
+    # Only most recent Blocks
+    assert stats['start_height'] == 3
+    assert stats['mine_time']['mean_s'] == 3.5
+
+def test_stats_segments_clamped(store):
+    # Fewer than one segment reported as one
+    for segments in (0, -5):
+        stats = store.stats(window=10, segments=segments)
+
+        assert len(stats['throughput']) == 1
+        assert stats['throughput'][0]['transactions'] == 6
+
+def test_stats_no_blocks():
+    store = HeaderStore()
+    store.append(Block.genesis())
+
+    assert store.stats(window=10) == {'blocks': 0}
+
+    # First mined Block has no mine time
+    store.append(Block(Block.genesis().timestamp + 1000 * SECONDS, 'prev_hash', 'hash', [], 3, 0))
+
+    assert store.stats(window=10) == {'blocks': 0}
+
+@pytest.mark.skipif(header_store.numpy is None, reason='NumPy not installed')
+def test_stats_numpy_matches_python(store):
+    numpy_stats = HeaderStore.stats_numpy(store, 2, 5, 2)
+    python_stats = HeaderStore.stats_python(store, 2, 5, 2)
+
+    # Same up to floating point rounding
+    assert numpy_stats.pop('mine_time') == pytest.approx(python_stats.pop('mine_time'))
+    assert numpy_stats == python_stats
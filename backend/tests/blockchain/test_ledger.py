@@ -0,0 +1,46 @@
+from backend.blockchain.block import Block
+from backend.blockchain.ledger import Ledger
+from backend.config import STARTING_BALANCE
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction import Transaction
+
+
+def test_apply_and_undo_block():
+    ledger = Ledger()
+    wallet = Wallet()
+    transaction = Transaction(wallet, 'recipient', 10)
+    block = Block.mine_block(Block.genesis(), [transaction.to_json()])
+
+    undo_record = ledger.apply_block(block, 1)
+
+    # Sender left with change, recipient credited
+    assert ledger.balance(wallet.address) == STARTING_BALANCE - 10
+    assert ledger.balance('recipient') == STARTING_BALANCE + 10
+    assert ledger.has_transaction(transaction.id)
+    assert ledger.transaction_location(transaction.id) == (1, 0)
+
+    ledger.undo_block(undo_record)
+
+    # Back to state before Block
+    assert ledger.balances == {}
+    assert not ledger.has_transaction(transaction.id)
+
+def test_apply_block_without_transactions():
+    ledger = Ledger()
+    ledger.apply_block(Block.mine_block(Block.genesis(), 'test-data'))
+
+    assert ledger.balances == {}
+
+def test_apply_block_without_change_entry():
+    ledger = Ledger()
+    wallet = Wallet()
+    output = {'recipient': STARTING_BALANCE}
+    transaction = Transaction(output=output, input=Transaction.create_input(wallet, output, STARTING_BALANCE))
+    undo_record = ledger.apply_block(Block.mine_block(Block.genesis(), [transaction.to_json()]), 1)
+
+    # Whole balance spent
+    assert ledger.balance(wallet.address) == 0
+
+    ledger.undo_block(undo_record)
+
+    assert ledger.balances == {}
@@ -0,0 +1,47 @@
+from backend.scripts.generate_chain import generate, random_id
+from backend.blockchain.blockchain import Blockchain
+from backend.config import LEGACY_BLOCK_VERSION, MERKLE_BLOCK_VERSION
+
+
+class CollidingRandom:
+    """
+    Random number generator drawing every value twice
+    """
+    def __init__(self):
+        self.draws = 0
+
+    def getrandbits(self, bits):
+        self.draws += 1
+        return self.draws // 2
+
+def test_random_id_draws_again_on_collision():
+    rng = CollidingRandom()
+    used_ids = set()
+
+    ids = [random_id(rng, used_ids) for i in range(5)]
+
+    assert len(set(ids)) == 5
+    assert used_ids == set(ids)
+
+def test_generate_valid_chain():
+    for version in (LEGACY_BLOCK_VERSION, MERKLE_BLOCK_VERSION):
+        blockchain, stream, keys = generate(20, 5, 10, 5, 0, 1, version)
+
+        assert len(blockchain.chain) == 21
+        Blockchain.is_valid_chain(blockchain.chain)
+
+def test_generate_unique_ids():
+    blockchain, stream, keys = generate(20, 5, 10, 5, 0, 1, LEGACY_BLOCK_VERSION)
+
+    ids = [transaction['id'] for block in blockchain.chain[1:] for transaction in block.data]
+    ids += [transaction['id'] for transaction in stream]
+
+    assert len(ids) == len(set(ids))
+    assert len(set(address for secret, address in keys)) == len(keys)
+
+def test_generate_stream_valid_on_chain():
+    blockchain, stream, keys = generate(20, 5, 10, 5, 0, 1, LEGACY_BLOCK_VERSION)
+
+    assert stream
+    for transaction in stream:
+        assert blockchain.balance(transaction['input']['address']) == transaction['input']['amount']
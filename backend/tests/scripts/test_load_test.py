@@ -0,0 +1,25 @@
+import pytest
+from backend.scripts.load_test import parse_mix, percentile, summarize
+
+
+def test_parse_mix():
+    assert parse_mix('wallet_info=40,blockchain_mine=1') == {'wallet_info': 40, 'blockchain_mine': 1}
+
+    with pytest.raises(Exception, match='Unknown endpoint'):
+        parse_mix('unknown=1')
+
+def test_percentile():
+    # Nearest rank
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4], 99) == 4
+    assert percentile([], 50) is None
+
+def test_summarize():
+    results = [{'wallet_info': [(0.001, True), (0.003, False)]}, {'wallet_info': [(0.002, True)]}]
+    report = summarize(results, 2)
+
+    assert report['requests'] == 3
+    assert report['throughput_rps'] == 1.5
+    assert report['endpoints']['wallet_info']['errors'] == 1
+    assert report['endpoints']['wallet_info']['p50_ms'] == pytest.approx(2)
+    assert report['endpoints']['wallet_info']['max_ms'] == pytest.approx(3)
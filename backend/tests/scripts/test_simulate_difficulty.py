@@ -0,0 +1,33 @@
+import statistics
+from backend.scripts.simulate_difficulty import simulate, summarize, parse_schedule, multiplier_at
+from backend.config import MINE_RATE, SECONDS
+
+
+def test_parse_schedule():
+    schedule = parse_schedule('5000:4,0:1')
+
+    assert schedule == [(0, 1), (5000, 4)]
+    assert multiplier_at(schedule, 4999) == 1
+    assert multiplier_at(schedule, 5000) == 4
+    assert multiplier_at([(10, 2)], 5) == 1
+
+def test_simulate_deterministic():
+    assert simulate(100, 100_000, seed=3) == simulate(100, 100_000, seed=3)
+
+def test_simulate_converges_to_mine_rate():
+    results = simulate(2000, 100_000, mine_rate=MINE_RATE, seed=0)
+    summary = summarize(results, 100_000, MINE_RATE)
+
+    # Settled mean time within 15% of target
+    assert abs(summary['mean_time_second_half_s'] - MINE_RATE / SECONDS) < 0.15 * MINE_RATE / SECONDS
+    assert summary['blocks'] == 2000
+
+def test_simulate_follows_hashrate_change():
+    # 4x hashrate from height 1000 – difficulty settles 2 higher (2^2 more hashes per Block)
+    results = simulate(2000, 100_000, [(1000, 4)], MINE_RATE, seed=0)
+    before = statistics.fmean(difficulty for height, timestamp, time, difficulty in results[500:1000])
+    after = statistics.fmean(difficulty for height, timestamp, time, difficulty in results[1500:])
+
+    assert 1.5 < after - before < 2.5
+    assert abs(statistics.fmean(time for height, timestamp, time, difficulty in results[1500:]) - MINE_RATE / SECONDS) \
+        < 0.15 * MINE_RATE / SECONDS
@@ -0,0 +1,114 @@
+from time import time_ns
+import pytest
+from backend.miner import Miner, JOB_STATUS
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.block import Block
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+
+
+class FakePubSub:
+    def __init__(self):
+        self.blocks = []
+
+    def broadcast_block(self, block):
+        self.blocks.append(block)
+
+@pytest.fixture
+def blockchain():
+    return Blockchain()
+
+@pytest.fixture
+def transaction_pool():
+    return TransactionPool()
+
+@pytest.fixture
+def pubsub():
+    return FakePubSub()
+
+@pytest.fixture
+def miner(blockchain, transaction_pool, pubsub):
+    return Miner(blockchain, transaction_pool, Wallet(blockchain), pubsub)
+
+@pytest.fixture
+def hard_blockchain(blockchain):
+    # Last Block so difficult that mining never finishes during test
+    blockchain.chain.append(Block(time_ns(), blockchain.chain[-1].hash, 'hard_hash', [], 64, 0))
+    return blockchain
+
+def test_mining_job(miner, blockchain, transaction_pool, pubsub):
+    transaction = Transaction(Wallet(), 'recipient', 5)
+    transaction_pool.set_transaction(transaction)
+
+    job = miner.start_job()
+
+    # Job finishes with mined Block added to Blockchain
+    assert job.wait(30)
+    assert job.status == JOB_STATUS['MINED']
+    assert blockchain.chain[-1] == job.block
+    assert pubsub.blocks == [job.block]
+
+    # Block contains pool Transactions and mining reward
+    assert job.block.data[0] == transaction.to_json()
+    assert len(job.block.data) == 2
+
+    # Mined Transactions cleared from pool
+    assert transaction_pool.transaction_map == {}
+
+def test_mining_job_skips_invalid_transactions(miner, blockchain, transaction_pool):
+    wallet = Wallet(blockchain)
+    stale = Transaction(wallet, 'recipient', 5)
+    blockchain.add_block([Transaction(wallet, 'recipient', 1).to_json()])
+    transaction_pool.set_transaction(stale)
+
+    job = miner.start_job()
+
+    # Block peers would reject never mined – only mining reward included
+    assert job.wait(30)
+    assert len(job.block.data) == 1
+    Blockchain.is_valid_chain(blockchain.chain)
+
+def test_mining_job_reused_while_mining(miner, hard_blockchain):
+    job = miner.start_job()
+
+    # Only one job mines at a time
+    assert miner.start_job() is job
+    assert miner.get_job(job.id) is job
+
+    miner.cancel_job(job.id)
+    assert job.wait(10)
+
+def test_mining_job_cancel(miner, hard_blockchain):
+    length = len(hard_blockchain.chain)
+    job = miner.start_job()
+    miner.cancel_job(job.id)
+
+    assert job.wait(10)
+    assert job.status == JOB_STATUS['CANCELLED']
+    assert len(hard_blockchain.chain) == length
+
+def test_mining_job_aborted_by_new_block(miner, hard_blockchain):
+    job = miner.start_job()
+
+    # Peer Block extends chain first
+    hard_blockchain.chain = hard_blockchain.chain + [
+        Block(time_ns(), hard_blockchain.chain[-1].hash, 'peer_hash', [], 64, 0)]
+
+    assert job.wait(10)
+    assert job.status == JOB_STATUS['ABORTED']
+
+def test_mining_job_refreshes_block_data(miner, hard_blockchain, transaction_pool):
+    job = miner.start_job()
+    transaction_pool.set_transaction(Transaction(Wallet(), 'recipient', 5))
+
+    # Pool change picked up by running job
+    for i in range(100):
+        if job.template_refreshes:
+            break
+        job.wait(0.05)
+
+    assert job.template_refreshes == 1
+
+    miner.cancel_job(job.id)
+    assert job.wait(10)
@@ -0,0 +1,207 @@
+from copy import deepcopy
+from types import SimpleNamespace
+from backend.pubsub import Listener, AdmissionControl, CHANNELS, CHANNEL_RATES, message_key, SENDER_RATE, MAX_POOL_SIZE
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.block import Block
+from backend.util.rwlock import ReadWriteLock
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+
+
+def message(channel, item, publisher=None):
+    # Copy – gossiped message does not share state with sender's item
+    return SimpleNamespace(channel=channel, message=deepcopy(item.to_json()), publisher=publisher)
+
+def receive(listener, message_object):
+    # Wait until queued Transactions applied
+    listener.message(None, message_object)
+    listener.transaction_queue.join()
+
+def test_message_key():
+    transaction = Transaction(Wallet(), 'recipient', 1)
+    key = message_key(CHANNELS['TRANSACTION'], transaction.to_json())
+
+    assert key == f'transaction:{transaction.id}:{transaction.input["timestamp"]}'
+    assert message_key(CHANNELS['TRANSACTION'], {'id': 'foo'}) is None
+    assert message_key(CHANNELS['TEST'], {'foo': 'bar'}) is None
+
+def test_listener_skips_duplicates(monkeypatch):
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool, ReadWriteLock())
+    block = Block.mine_block(blockchain.chain[-1], [])
+    transaction = Transaction(Wallet(), 'recipient', 1)
+
+    receive(listener, message(CHANNELS['BLOCK'], block))
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    # Duplicates dropped before deserialization
+    monkeypatch.setattr(Block, 'from_json', None)
+    monkeypatch.setattr(Transaction, 'from_json', None)
+    receive(listener, message(CHANNELS['BLOCK'], block))
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    assert blockchain.chain[-1] == block
+    assert list(transaction_pool.transaction_map) == [transaction.id]
+    assert listener.seen.hits == 2
+
+def test_listener_accepts_updated_transaction():
+    transaction_pool = TransactionPool()
+    listener = Listener(Blockchain(), transaction_pool, ReadWriteLock())
+    wallet = Wallet()
+    transaction = Transaction(wallet, 'recipient', 1)
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    # Same id, signed anew
+    transaction.update(wallet, 'next_recipient', 2)
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    assert transaction_pool.transaction_map[transaction.id].output['next_recipient'] == 2
+
+def test_admission_sender_rate():
+    now = [0]
+    admission = AdmissionControl(clock=lambda: now[0])
+    rate, burst = SENDER_RATE
+    sender = Wallet().address
+
+    # Burst admitted, then sender limited until bucket refills
+    assert [admission.admit_sender(sender) for i in range(burst)] == [None] * burst
+    assert admission.admit_sender(sender) == 'sender_rate'
+
+    # Other senders unaffected
+    assert admission.admit_sender(Wallet().address) is None
+
+    now[0] = 1 / rate
+    assert admission.admit_sender(sender) is None
+
+def test_admission_does_not_charge_sender_before_verification():
+    admission = AdmissionControl()
+    rate, burst = SENDER_RATE
+    transaction = Transaction(Wallet(), 'recipient', 1).to_json()
+
+    for i in range(burst + 1):
+        admission.admit(CHANNELS['TRANSACTION'], transaction)
+
+    assert admission.admit_sender(transaction['input']['address']) is None
+
+def test_admission_sheds_transactions_when_pool_full():
+    admission = AdmissionControl()
+    transaction = Transaction(Wallet(), 'recipient', 1).to_json()
+
+    assert admission.admit(CHANNELS['TRANSACTION'], transaction, pool_size=MAX_POOL_SIZE) == 'pool_full'
+
+    # Blocks still admitted
+    assert admission.admit(CHANNELS['BLOCK'], Block.genesis().to_json(), pool_size=MAX_POOL_SIZE) is None
+
+def test_admission_transaction_flood_leaves_budget_for_blocks():
+    now = [0]
+    admission = AdmissionControl(clock=lambda: now[0])
+
+    # Flood from many senders exhausts Transaction channel only
+    results = [admission.admit(CHANNELS['TRANSACTION'], {'input': {'address': str(i)}}) for i in range(2000)]
+
+    assert 'channel_rate' in results
+    assert 'global_rate' not in results
+    assert admission.admit(CHANNELS['BLOCK'], Block.genesis().to_json()) is None
+
+def test_listener_sheds_refused_transactions():
+    transaction_pool = TransactionPool()
+    listener = Listener(Blockchain(), transaction_pool, ReadWriteLock())
+    wallet = Wallet()
+    rate, burst = SENDER_RATE
+    transaction = Transaction(wallet, 'recipient', 1)
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    # Each update pays recipient 1 more
+    for i in range(burst + 4):
+        transaction.update(wallet, 'recipient', 1)
+        receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    # Only sender's burst reaches pool
+    assert transaction_pool.transaction_map[transaction.id].output['recipient'] == burst
+
+def test_listener_forged_transactions_do_not_silence_sender():
+    transaction_pool = TransactionPool()
+    listener = Listener(Blockchain(), transaction_pool, ReadWriteLock())
+    victim = Wallet()
+    rate, burst = SENDER_RATE
+
+    # Unsigned copies claiming victim's address (distinct keys, so none are duplicates)
+    for i in range(burst + 4):
+        forged = message(CHANNELS['TRANSACTION'], Transaction(victim, 'attacker', 1))
+        forged.message['input']['timestamp'] = i
+        forged.message['input']['signature'] = Wallet().sign(forged.message['output'])
+        receive(listener, forged)
+
+    assert transaction_pool.transaction_map == {}
+
+    transaction = Transaction(victim, 'recipient', 1)
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+
+    assert list(transaction_pool.transaction_map) == [transaction.id]
+
+def test_listener_rejects_double_spend():
+    transaction_pool = TransactionPool()
+    listener = Listener(Blockchain(), transaction_pool, ReadWriteLock())
+    wallet = Wallet()
+    transaction = Transaction(wallet, 'foo', 900)
+
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+    receive(listener, message(CHANNELS['TRANSACTION'], Transaction(wallet, 'bar', 900)))
+
+    # First Transaction seen kept
+    assert list(transaction_pool.transaction_map) == [transaction.id]
+
+def test_listener_processes_shed_block_gossiped_again():
+    now = [0]
+    blockchain = Blockchain()
+    listener = Listener(blockchain, TransactionPool(), ReadWriteLock(), admission=AdmissionControl(clock=lambda: now[0]))
+    rate, burst = CHANNEL_RATES['BLOCK']
+    block = Block.mine_block(blockchain.chain[-1], [])
+
+    # Block channel bucket exhausted – Block shed, not remembered as seen
+    listener.admission.channels[CHANNELS['BLOCK']].tokens = 0
+    receive(listener, message(CHANNELS['BLOCK'], block))
+
+    assert blockchain.chain[-1] != block
+
+    # Copy gossiped again once bucket refilled
+    now[0] = 1 / rate
+    receive(listener, message(CHANNELS['BLOCK'], block))
+
+    assert blockchain.chain[-1] == block
+
+def test_listener_processes_real_copy_after_forgery():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool, ReadWriteLock())
+    transaction = Transaction(Wallet(), 'recipient', 1)
+    block = Block.mine_block(blockchain.chain[-1], [])
+
+    # Forged copies (same key, bad body) arrive first
+    forged_transaction = message(CHANNELS['TRANSACTION'], transaction)
+    forged_transaction.message['output']['recipient'] = 999
+    forged_block = message(CHANNELS['BLOCK'], block)
+    forged_block.message['data'] = ['forged']
+    receive(listener, forged_transaction)
+    receive(listener, forged_block)
+
+    receive(listener, message(CHANNELS['TRANSACTION'], transaction))
+    receive(listener, message(CHANNELS['BLOCK'], block))
+
+    assert transaction_pool.transaction_map[transaction.id].output['recipient'] == 1
+    assert blockchain.chain[-1] == block
+
+def test_listener_retries_block_with_unknown_parent():
+    blockchain = Blockchain()
+    listener = Listener(blockchain, TransactionPool(), ReadWriteLock())
+    parent = Block.mine_block(blockchain.chain[-1], [])
+    child = Block.mine_block(parent, [])
+
+    # Parent unknown – child refused, but not remembered
+    receive(listener, message(CHANNELS['BLOCK'], child))
+    receive(listener, message(CHANNELS['BLOCK'], parent))
+    receive(listener, message(CHANNELS['BLOCK'], child))
+
+    assert blockchain.chain[-1] == child
@@ -0,0 +1,147 @@
+import pytest
+from backend import sync
+from backend.sync import SyncClient, validate_blocks
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.block import Block
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction import Transaction
+from backend.config import MINE_RATE, LEGACY_BLOCK_VERSION
+
+
+@pytest.fixture
+def peer_blockchain():
+    blockchain = Blockchain()
+
+    for i in range(5):
+        blockchain.add_block([Transaction(Wallet(), 'recipient', i).to_json()])
+
+    return blockchain
+
+@pytest.fixture
+def peers(monkeypatch, peer_blockchain):
+    # Every peer serves the same chain unless listed in 'bad'
+    peers = {'requests': [], 'bad': set()}
+
+    def fetch_work(self, peer_url):
+        return peer_blockchain.tip_work()
+
+    def fetch_headers(self, peer_url):
+        return [Block.from_header_json(block.to_header_json()) for block in peer_blockchain.chain]
+
+    def fetch_blocks(self, peer_url, start, end):
+        peers['requests'].append((peer_url, start, end))
+        blocks = [Block.from_json(dict(block.to_json())) for block in peer_blockchain.chain[start:end]]
+
+        if peer_url in peers['bad']:
+            blocks[0].data = []
+
+        return blocks
+
+    monkeypatch.setattr(SyncClient, 'fetch_work', fetch_work)
+    monkeypatch.setattr(SyncClient, 'fetch_headers', fetch_headers)
+    monkeypatch.setattr(SyncClient, 'fetch_blocks', fetch_blocks)
+    monkeypatch.setattr(sync, 'SYNC_RANGE_SIZE', 2)
+
+    return peers
+
+def test_synchronize(peers, peer_blockchain):
+    blockchain = Blockchain()
+    SyncClient(['http://peer-a', 'http://peer-b']).synchronize(blockchain)
+
+    # Local chain replaced by peer chain
+    assert blockchain.chain == peer_blockchain.chain
+
+    # Block ranges split across peers
+    assert sorted(peers['requests']) == [
+        ('http://peer-a', 1, 3), ('http://peer-a', 5, 6), ('http://peer-b', 3, 5)]
+
+def test_synchronize_retries_range_on_other_peer(peers, peer_blockchain):
+    peers['bad'].add('http://peer-b')
+    blockchain = Blockchain()
+    SyncClient(['http://peer-a', 'http://peer-b']).synchronize(blockchain)
+
+    # Range served invalid by peer-b fetched again from peer-a
+    assert blockchain.chain == peer_blockchain.chain
+    assert ('http://peer-a', 3, 5) in peers['requests']
+
+def test_synchronize_downloads_suffix_only(peers, peer_blockchain):
+    # Local chain already holds first Blocks of peer chain
+    blockchain = Blockchain()
+    blockchain.chain = peer_blockchain.chain[:3]
+    shared = blockchain.chain[2]
+    removed, added = SyncClient(['http://peer-a']).synchronize(blockchain)
+
+    # Only Blocks after last shared Block downloaded and applied
+    assert sorted(peers['requests']) == [('http://peer-a', 3, 5), ('http://peer-a', 5, 6)]
+    assert (removed, added) == ([], peer_blockchain.chain[3:])
+    assert blockchain.chain == peer_blockchain.chain
+    assert blockchain.chain[2] is shared
+
+def test_synchronize_not_more_work(peers, peer_blockchain):
+    with pytest.raises(Exception, match='Peer chain must have more cumulative work'):
+        SyncClient(['http://peer-a']).synchronize(peer_blockchain)
+
+def test_synchronize_shorter_chain_with_more_work(peers, peer_blockchain):
+    # Longer local chain of slowly mined Blocks (falling difficulty, less work)
+    blockchain = Blockchain()
+
+    for i in range(len(peer_blockchain.chain) + 2):
+        prev_block = blockchain.chain[-1]
+        blockchain.append_block(Block.mine_block(prev_block, [], clock=lambda: prev_block.timestamp + MINE_RATE))
+
+    local_chain = list(blockchain.chain)
+    removed, added = SyncClient(['http://peer-a']).synchronize(blockchain)
+
+    # Fork choice by cumulative work, not length
+    assert (removed, added) == (local_chain[1:], peer_blockchain.chain[1:])
+    assert blockchain.chain == peer_blockchain.chain
+
+def test_synchronize_bad_header_chain(peers, peer_blockchain):
+    # Invalid chain rejected before any Block data downloaded
+    peer_blockchain.chain[3].prev_hash = 'abc123'
+
+    with pytest.raises(Exception, match='Peer header chain invalid'):
+        SyncClient(['http://peer-a']).synchronize(Blockchain())
+
+    assert peers['requests'] == []
+
+def test_synchronize_bad_block_data(peers, peer_blockchain):
+    # Block data does not match header hash on every peer
+    peers['bad'].update(['http://peer-a', 'http://peer-b'])
+    blockchain = Blockchain()
+
+    with pytest.raises(Exception, match='failed on every peer'):
+        SyncClient(['http://peer-a', 'http://peer-b']).synchronize(blockchain)
+
+    # Local chain unchanged
+    assert len(blockchain.chain) == 1
+
+def test_synchronize_verifies_hashes_once(peers, peer_blockchain, monkeypatch):
+    verified = []
+    is_valid_contents = Block.is_valid_contents
+    monkeypatch.setattr(Block, 'is_valid_contents', staticmethod(
+        lambda block: verified.append(block.hash) or is_valid_contents(block)))
+    blockchain = Blockchain()
+    SyncClient(['http://peer-a']).synchronize(blockchain)
+
+    # Verified while downloading, not again when local chain replaced
+    assert sorted(verified) == sorted(block.hash for block in peer_blockchain.chain[1:])
+
+def test_validate_blocks_bad_legacy_link(peer_blockchain):
+    # Legacy Block mined on another parent, served with a header claiming the real one
+    # (legacy header hash covers data, so header chain check cannot catch it)
+    headers = [Block.from_header_json(block.to_header_json()) for block in peer_blockchain.chain]
+    block = Block.mine_block(peer_blockchain.chain[1], ['forged'], version=LEGACY_BLOCK_VERSION)
+    headers[3] = Block.from_header_json(block.to_header_json())
+    headers[3].prev_hash = headers[2].hash
+
+    with pytest.raises(Exception, match='Block prev_hash incorrect'):
+        validate_blocks(headers, 3, [block])
+
+def test_synchronize_parallel_validation(peers, peer_blockchain, monkeypatch):
+    # Block hashes verified in worker processes for long chains
+    monkeypatch.setattr(Blockchain, 'validation_processes', staticmethod(lambda chain: 2))
+    blockchain = Blockchain()
+    SyncClient(['http://peer-a'], processes=2).synchronize(blockchain)
+
+    assert blockchain.chain == peer_blockchain.chain
@@ -1,4 +1,6 @@
-from backend.util.crypto_hash import crypto_hash
+from hashlib import sha256
+from json import dumps
+from backend.util.crypto_hash import crypto_hash, encode, pre_encode
 
 
 def test_crypto_hash():
@@ -10,4 +12,20 @@ def test_crypto_hash():
     
     # Regression test hash accuracy
     assert crypto_hash('foo') == 'b2213295d564916f89a6a42455567c87c3f480fcd7a1c15e220f17d7169a790b'
-    
\ No newline at end of file
+
+def test_encode_matches_json():
+    # Fast paths produce same bytes as json.dumps
+    for arg in [0, -12, 10 ** 30, 'foo', 'quote"back\\slash\n', 'ünïcødé', True, None, 1.5,
+                {'a': [1, 'b']}, 'genesis_nonce']:
+        assert encode(arg) == dumps(arg).encode('utf-8')
+
+def test_crypto_hash_matches_joined_format():
+    # Byte-identical to JSON encoded arguments joined by '^'
+    args = (1, 'ünï"', [2, {'x': None}], True, 3.25)
+    joined_data = '^'.join(map(dumps, args))
+    assert crypto_hash(*args) == sha256(joined_data.encode('utf-8')).hexdigest()
+
+def test_crypto_hash_pre_encoded():
+    # Pre-encoded arguments hash same as originals
+    data = [{'id': 'abc', 'output': {'a': 1}}]
+    assert crypto_hash(1, pre_encode('prev'), pre_encode(data)) == crypto_hash(1, 'prev', data)
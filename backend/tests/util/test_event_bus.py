@@ -0,0 +1,43 @@
+import json
+import pytest
+from backend.util.event_bus import EventBus, encode_event
+
+
+def test_encode_event():
+    assert encode_event('tip', {'length': 1}) == b'event: tip\ndata: {"length": 1}\n\n'
+
+    # Already encoded JSON sent as is
+    assert encode_event('pool', b'[]') == b'event: pool\ndata: []\n\n'
+
+def test_publish():
+    bus = EventBus()
+    subscription_1 = bus.subscribe()
+    subscription_2 = bus.subscribe()
+    bus.publish('tip', {'length': 2})
+
+    # Every subscriber receives event
+    assert subscription_1.get(0) == subscription_2.get(0) == encode_event('tip', {'length': 2})
+
+    bus.unsubscribe(subscription_2)
+    bus.publish('tip', {'length': 3})
+
+    assert subscription_1.get(0) == encode_event('tip', {'length': 3})
+    assert subscription_2.get(0) is None
+
+def test_max_subscribers():
+    bus = EventBus(max_subscribers=1)
+    bus.subscribe()
+
+    with pytest.raises(Exception, match='Maximum of 1 subscribers reached'):
+        bus.subscribe()
+
+def test_lagging_subscriber():
+    bus = EventBus()
+    subscription = bus.subscribe()
+
+    for length in range(150):
+        bus.publish('tip', {'length': length})
+
+    # Missed events replaced by single reset
+    assert subscription.get(0) == encode_event('reset', {})
+    assert subscription.get(0) is None
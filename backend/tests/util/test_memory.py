@@ -0,0 +1,15 @@
+import sys
+from backend.util.memory import deep_sizeof
+
+
+def test_deep_sizeof():
+    value = {'key': ['item']}
+
+    # Container and everything inside it
+    assert deep_sizeof(value) == sum(map(sys.getsizeof, [value, 'key', value['key'], 'item']))
+
+def test_deep_sizeof_shared():
+    item = 'x' * 1000
+
+    # Object referenced twice counted once
+    assert deep_sizeof([item, item]) == sys.getsizeof([item, item]) + sys.getsizeof(item)
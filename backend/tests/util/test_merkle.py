@@ -0,0 +1,38 @@
+from backend.util.crypto_hash import crypto_hash
+from backend.util.merkle import (
+    EMPTY_MERKLE_ROOT, leaf_hash, merkle_root, merkle_proof, verify_merkle_proof)
+
+
+def test_merkle_root():
+    items = [{'id': 1}, {'id': 2}, {'id': 3}]
+
+    # Empty tree
+    assert merkle_root([]) == EMPTY_MERKLE_ROOT
+
+    # Single leaf is root
+    assert merkle_root(items[:1]) == leaf_hash(items[0])
+
+    # Odd level pairs last hash with itself
+    left = crypto_hash(leaf_hash(items[0]), leaf_hash(items[1]))
+    right = crypto_hash(leaf_hash(items[2]), leaf_hash(items[2]))
+    assert merkle_root(items) == crypto_hash(left, right)
+
+    # Order matters
+    assert merkle_root(items) != merkle_root(items[::-1])
+
+def test_merkle_proof():
+    items = [{'id': i} for i in range(7)]
+    root = merkle_root(items)
+
+    # Every item provable
+    for index, item in enumerate(items):
+        assert verify_merkle_proof(item, merkle_proof(items, index), root)
+
+def test_merkle_proof_invalid():
+    items = [{'id': i} for i in range(4)]
+    root = merkle_root(items)
+    proof = merkle_proof(items, 1)
+
+    # Wrong item or wrong root
+    assert not verify_merkle_proof({'id': 99}, proof, root)
+    assert not verify_merkle_proof(items[1], proof, merkle_root(items[:3]))
@@ -0,0 +1,90 @@
+import pytest
+from backend.util.metrics import MetricsRegistry, REGISTRY, timed
+from backend.blockchain.block import Block, MINE_ATTEMPTS, MINE_SECONDS
+from backend.wallet.wallet import Wallet, VERIFY_SECONDS
+
+
+@pytest.fixture
+def enabled_registry(monkeypatch):
+    monkeypatch.setattr(REGISTRY, 'enabled', True)
+    REGISTRY.reset()
+    yield REGISTRY
+    REGISTRY.reset()
+
+def test_disabled_metrics_not_recorded():
+    registry = MetricsRegistry()
+    counter = registry.counter('test_total', 'Test counter')
+    histogram = registry.histogram('test_seconds', 'Test histogram')
+
+    counter.inc()
+    histogram.observe(1)
+
+    assert counter.value() == 0
+    assert histogram.count() == 0
+
+def test_counter_render():
+    registry = MetricsRegistry(enabled=True)
+    counter = registry.counter('test_total', 'Test counter', 'result')
+
+    counter.inc(label_value='ok')
+    counter.inc(2, label_value='ok')
+    counter.inc(label_value='failed')
+
+    assert registry.render() == (
+        '# HELP test_total Test counter\n'
+        '# TYPE test_total counter\n'
+        'test_total{result="failed"} 1\n'
+        'test_total{result="ok"} 3\n')
+
+def test_histogram_render():
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram('test_seconds', 'Test histogram', buckets=(0.1, 1))
+
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    # Buckets are cumulative
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1"} 2',
+        'test_seconds_bucket{le="+Inf"} 3',
+        'test_seconds_sum 5.55',
+        'test_seconds_count 3']
+
+def test_gauge_function():
+    registry = MetricsRegistry(enabled=True)
+    registry.gauge('test_size', 'Test gauge', function=lambda: 42)
+
+    assert 'test_size 42' in registry.render()
+
+def test_duplicate_metric():
+    registry = MetricsRegistry()
+    registry.counter('test_total', 'Test counter')
+
+    with pytest.raises(Exception, match='already registered'):
+        registry.counter('test_total', 'Test counter')
+
+def test_timed():
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram('test_seconds', 'Test histogram')
+
+    @timed(histogram)
+    def function(value):
+        return value * 2
+
+    assert function(2) == 4
+    assert histogram.count() == 1
+
+def test_mine_block_metrics(enabled_registry):
+    block = Block.mine_block(Block.genesis(), 'foo')
+
+    assert MINE_ATTEMPTS.value() == block.nonce + 1
+    assert MINE_SECONDS.count('mined') == 1
+    assert 'mine_attempts_total' in enabled_registry.render()
+
+def test_verify_metrics(enabled_registry):
+    wallet = Wallet()
+    Wallet.verify(wallet.public_key, 'foo', wallet.sign('foo'))
+
+    assert VERIFY_SECONDS.count() == 1
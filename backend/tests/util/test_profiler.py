@@ -0,0 +1,38 @@
+import threading
+import pytest
+from backend.util.profiler import Profiler, sample_stacks
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,))
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+def test_sample_stacks(busy_thread):
+    result = sample_stacks(0.2, interval=0.001)
+
+    assert result['samples'] > 0
+    # Function running in other thread found on its stack
+    assert any(entry['function'].startswith('busy_loop') for entry in result['total'])
+
+def test_profile_memory(busy_thread):
+    result = Profiler().profile(0.1, top=5, memory=True)
+
+    assert result['seconds'] == 0.1
+    assert len(result['total']) <= 5
+    assert result['memory']['peak'] >= result['memory']['current']
+
+def test_profile_already_running():
+    profiler = Profiler()
+    profiler.lock.acquire()
+
+    with pytest.raises(Exception, match='already running'):
+        profiler.profile(0.1)
@@ -0,0 +1,27 @@
+from backend.util.rate_limit import TokenBucket, KeyedTokenBuckets
+
+
+def test_token_bucket():
+    now = [0]
+    bucket = TokenBucket(rate=2, burst=3, clock=lambda: now[0])
+
+    # Burst, then refill at rate (never beyond burst)
+    assert [bucket.allow() for i in range(4)] == [True, True, True, False]
+
+    now[0] = 0.5
+    assert bucket.allow()
+    assert not bucket.allow()
+
+    now[0] = 100
+    assert [bucket.allow() for i in range(4)] == [True, True, True, False]
+
+def test_keyed_token_buckets():
+    buckets = KeyedTokenBuckets(rate=1, burst=1, max_keys=2, clock=lambda: 0)
+
+    assert buckets.allow('key_1')
+    assert not buckets.allow('key_1')
+    assert buckets.allow('key_2')
+
+    # Least recently used key dropped once max_keys exceeded
+    buckets.allow('key_3')
+    assert list(buckets.buckets) == ['key_2', 'key_3']
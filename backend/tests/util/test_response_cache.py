@@ -0,0 +1,47 @@
+from backend.util.response_cache import TipResponseCache
+
+
+def test_response_cached_per_tip():
+    cache = TipResponseCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'length': len(calls)}
+
+    body, etag = cache.get('tip_hash', '/blockchain', compute)
+
+    # Response serialized to JSON bytes
+    assert body == b'{"length": 1}'
+
+    # Same tip – served from cache with same ETag
+    assert cache.get('tip_hash', '/blockchain', compute) == (body, etag)
+    assert len(calls) == 1
+    assert cache.hits == 1
+
+def test_response_cache_keys():
+    cache = TipResponseCache()
+    _, etag_1 = cache.get('tip_hash', '/blockchain/range?start=0&end=3', lambda: [1])
+    _, etag_2 = cache.get('tip_hash', '/blockchain/range?start=3&end=6', lambda: [2])
+
+    # Different requests have different ETags
+    assert etag_1 != etag_2
+
+def test_response_cache_invalidated_by_new_tip():
+    cache = TipResponseCache()
+    _, etag = cache.get('tip_hash', '/blockchain/length', lambda: 1)
+    body, new_etag = cache.get('new_tip_hash', '/blockchain/length', lambda: 2)
+
+    # New tip – response recomputed with new ETag
+    assert body == b'2'
+    assert new_etag != etag
+    assert cache.misses == 2
+
+def test_response_cache_max_size():
+    cache = TipResponseCache(max_size=2)
+
+    for i in range(3):
+        cache.get('tip_hash', f'/key/{i}', lambda: i)
+
+    # Least recently used response dropped
+    assert list(cache.responses) == ['/key/1', '/key/2']
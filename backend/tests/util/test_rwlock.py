@@ -0,0 +1,125 @@
+from threading import Barrier, Event, Thread
+from types import SimpleNamespace
+from backend.util.rwlock import ReadWriteLock
+from backend.pubsub import Listener, CHANNELS
+from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.block import Block
+from backend.wallet.wallet import Wallet
+from backend.wallet.transaction import Transaction
+from backend.wallet.transaction_pool import TransactionPool
+
+
+def test_readers_share_lock():
+    lock = ReadWriteLock()
+    barrier = Barrier(3, timeout=5)
+    errors = []
+
+    def read():
+        with lock.read():
+            try:
+                # Every reader inside lock at the same time
+                barrier.wait()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [Thread(target=read) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+def test_writer_excludes_readers():
+    lock = ReadWriteLock()
+    writing = Event()
+    read_during_write = []
+
+    def read():
+        with lock.read():
+            read_during_write.append(writing.is_set())
+
+    with lock.write():
+        writing.set()
+        reader = Thread(target=read)
+        reader.start()
+        reader.join(0.2)
+
+        # Reader waits for writer
+        assert read_during_write == []
+        writing.clear()
+
+    reader.join()
+    assert read_during_write == [False]
+
+def test_concurrent_node_state_stress():
+    # Readers serialize chain and pool while Listener threads add Transactions and Blocks
+    lock = ReadWriteLock()
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    listener = Listener(blockchain, transaction_pool, lock)
+    # One Transaction per sender (pool keeps one pending Transaction per sender)
+    wallets = [Wallet(blockchain) for i in range(40)]
+    transactions = [Transaction(wallets[i], 'recipient', i).to_json() for i in range(40)]
+    block = Block.mine_block(blockchain.chain[-1], transactions[:5])
+    done = Event()
+    errors = []
+
+    def read():
+        while not done.is_set():
+            try:
+                with lock.read():
+                    chain_json = blockchain.to_json()
+                    transaction_data = transaction_pool.transaction_data()
+                    balances = [wallet.balance for wallet in wallets]
+
+                    # Consistent snapshot of node state
+                    assert len(chain_json) == len(blockchain.chain)
+                    assert len(transaction_data) == len(transaction_pool.transaction_map)
+                    assert all(balance >= 0 for balance in balances)
+            except Exception as e:
+                errors.append(e)
+
+    def write(transaction_jsons):
+        for transaction_json in transaction_jsons:
+            try:
+                listener.message(None, SimpleNamespace(channel=CHANNELS['TRANSACTION'], message=transaction_json))
+            except Exception as e:
+                errors.append(e)
+
+    readers = [Thread(target=read) for i in range(8)]
+    writers = [Thread(target=write, args=(transactions[i::4],)) for i in range(4)]
+
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+
+    # Queued Transactions applied
+    listener.transaction_queue.join()
+    assert len(transaction_pool.transaction_map) == 40
+
+    listener.message(None, SimpleNamespace(channel=CHANNELS['BLOCK'], message=dict(block.to_json())))
+    done.set()
+
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert blockchain.chain[-1] == block
+    # Transactions of accepted Block cleared from pool
+    assert len(transaction_pool.transaction_map) == 35
+
+def test_release_listener():
+    lock = ReadWriteLock()
+    released = []
+    lock.add_release_listener(lambda: released.append(lock.writer))
+
+    with lock.read():
+        pass
+
+    with lock.write():
+        pass
+
+    # Called once per exclusive section, after lock released
+    assert released == [False]
@@ -0,0 +1,43 @@
+from backend.util.seen_cache import SeenCache
+
+
+def test_seen():
+    cache = SeenCache(max_size=10, ttl=60)
+
+    assert not cache.seen('key')
+    assert cache.seen('key')
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_seen_expires():
+    now = [0]
+    cache = SeenCache(max_size=10, ttl=60, clock=lambda: now[0])
+    cache.add('key')
+    now[0] = 59
+
+    assert cache.seen('key')
+
+    # Forgotten ttl seconds after first seen
+    now[0] = 60
+
+    assert not cache.seen('key')
+
+def test_seen_max_size():
+    cache = SeenCache(max_size=2, ttl=60)
+
+    for key in ('key_1', 'key_2', 'key_3'):
+        cache.add(key)
+
+    # Oldest key dropped
+    assert len(cache) == 2
+    assert not cache.seen('key_1')
+    assert cache.seen('key_3')
+
+def test_seen_without_remembering():
+    cache = SeenCache(max_size=10, ttl=60)
+
+    assert not cache.seen('key', remember=False)
+    assert not cache.seen('key')
+
+    cache.forget('key')
+
+    assert not cache.seen('key')
@@ -1,3 +1,4 @@
+import json
 import pytest
 from backend.wallet.transaction import Transaction
 from backend.wallet.wallet import Wallet
@@ -78,6 +79,65 @@ def test_transaction_update():
     # Valid transaction
     assert Wallet.verify(transaction.input['public_key'], transaction.output, transaction.input['signature'])
 
+def test_transaction_update_keeps_earlier_json():
+    sender_wallet = Wallet()
+    transaction = Transaction(sender_wallet, 'first_recipient', 10)
+    # e.g. Block data being mined
+    transaction_json = transaction.to_json()
+
+    transaction.update(sender_wallet, 'next_recipient', 20)
+    transaction.update_batch(sender_wallet, [('first_recipient', 5)])
+
+    assert transaction_json['output'] == {'first_recipient': 10, sender_wallet.address: sender_wallet.balance - 10}
+    assert Wallet.verify(transaction_json['input']['public_key'], transaction_json['output'], transaction_json['input']['signature'])
+
+def test_transaction_batch():
+    sender_wallet = Wallet()
+    transaction = Transaction.batch(sender_wallet, [('first_recipient', 10), ('next_recipient', 20), ('first_recipient', 5)])
+
+    # Output data contains every recipient (repeated recipients summed) and sender change
+    assert transaction.output == {
+        'first_recipient': 15,
+        'next_recipient': 20,
+        sender_wallet.address: sender_wallet.balance - 35
+    }
+
+    Transaction.is_valid_transaction(transaction)
+
+def test_transaction_batch_invalid():
+    sender_wallet = Wallet()
+
+    with pytest.raises(Exception, match='Amount exceeds balance'):
+        Transaction.batch(sender_wallet, [('recipient', 600), ('next_recipient', 600)])
+
+    with pytest.raises(Exception, match='Amount must be positive'):
+        Transaction.batch(sender_wallet, [('recipient', 10), ('next_recipient', -5)])
+
+    with pytest.raises(Exception, match='Batch has no payments'):
+        Transaction.batch(sender_wallet, [])
+
+    for amount in (True, '10', None):
+        with pytest.raises(Exception, match='Amount must be a number'):
+            Transaction.batch(sender_wallet, [('recipient', 10), ('next_recipient', amount)])
+
+def test_transaction_update_batch():
+    sender_wallet = Wallet()
+    transaction = Transaction(sender_wallet, 'first_recipient', 99)
+    transaction.update_batch(sender_wallet, [('first_recipient', 1), ('next_recipient', 50)])
+
+    # Output data contains every recipient amount and modifies sender balance once
+    assert transaction.output['first_recipient'] == 100
+    assert transaction.output['next_recipient'] == 50
+    assert transaction.output[sender_wallet.address] == sender_wallet.balance - 150
+
+    Transaction.is_valid_transaction(transaction)
+
+    # Not enough funds – Transaction unchanged
+    with pytest.raises(Exception, match='Amount exceeds balance'):
+        transaction.update_batch(sender_wallet, [('next_recipient', 9999)])
+
+    assert transaction.output['next_recipient'] == 50
+
 def test_valid_transaction():
     # Valid
     Transaction.is_valid_transaction(Transaction(Wallet(), 'recipient', 99))
@@ -91,6 +151,15 @@ def test_valid_transaction_invalid_outputs():
     with pytest.raises(Exception, match='Invalid transaction – Output values invalid'):
         Transaction.is_valid_transaction(transaction)
 
+def test_valid_transaction_no_change_entry():
+    # Invalid - sender left out of output (balance would never be reduced)
+    sender_wallet = Wallet()
+    output = {'recipient': sender_wallet.balance}
+    transaction = Transaction(output=output, input=Transaction.create_input(sender_wallet, output))
+
+    with pytest.raises(Exception, match='Output has no entry for sender'):
+        Transaction.is_valid_transaction(transaction)
+
 def test_valid_transaction_invalid_signature():
     # Invalid - incorrect signature
     transaction = Transaction(Wallet(), 'recipient', 99)
@@ -128,4 +197,16 @@ def test_valid_reward_transaction_invalid_amount():
 
     with pytest.raises(Exception, match='Mining reward invalid'):
         Transaction.is_valid_transaction(reward_transaction)
-        
\ No newline at end of file
+        
+def test_serialize():
+    sender_wallet = Wallet()
+    transaction = Transaction(sender_wallet, 'recipient', 5)
+    serialized = transaction.serialize()
+
+    # Canonical JSON of Transaction, encoded once and reused
+    assert json.loads(serialized) == json.loads(json.dumps(transaction.to_json()))
+    assert transaction.serialize() is serialized
+
+    # Update drops cached encoding
+    transaction.update(sender_wallet, 'next_recipient', 7)
+    assert json.loads(transaction.serialize())['output']['next_recipient'] == 7
@@ -1,7 +1,10 @@
+import json
+import pytest
 from backend.wallet.transaction_pool import TransactionPool
 from backend.wallet.transaction import Transaction
 from backend.wallet.wallet import Wallet
 from backend.blockchain.blockchain import Blockchain
+from backend.blockchain.block import Block
 
 
 def test_set_transaction():
@@ -13,6 +16,104 @@ def test_set_transaction():
     # Transaction added to pool
     assert transaction_pool.transaction_map[transaction.id] == transaction
 
+    # Pool version changed
+    assert transaction_pool.version == 1
+
+def test_admit_transaction():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    transaction = Transaction(Wallet(blockchain), 'recipient', 5)
+
+    transaction_pool.admit_transaction(transaction, blockchain)
+
+    # Admitted with verdict cached for current chain tip
+    assert transaction_pool.transaction_map[transaction.id] == transaction
+    assert transaction_pool.verdicts[transaction.id] == blockchain.chain[-1].hash
+
+def test_admit_transaction_invalid():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    wallet = Wallet(blockchain)
+
+    # Bad signature
+    transaction = Transaction(wallet, 'recipient', 5)
+    transaction.input['signature'] = Wallet().sign(transaction.output)
+
+    with pytest.raises(Exception, match='Signature invalid'):
+        transaction_pool.admit_transaction(transaction, blockchain)
+
+    # Input amount no longer sender's balance (spends balance already spent in chain)
+    stale = Transaction(wallet, 'recipient', 5)
+    blockchain.add_block([Transaction(wallet, 'recipient', 5).to_json()])
+
+    with pytest.raises(Exception, match='does not match balance'):
+        transaction_pool.admit_transaction(stale, blockchain)
+
+    # Already in chain
+    with pytest.raises(Exception, match='already in chain'):
+        transaction_pool.admit_transaction(Transaction.from_json(blockchain.chain[-1].data[0]), blockchain)
+
+    with pytest.raises(Exception, match='Mining reward'):
+        transaction_pool.admit_transaction(Transaction.reward_transaction(wallet), blockchain)
+
+    # Pool unchanged
+    assert transaction_pool.transaction_map == {}
+
+def test_admit_transaction_double_spend():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    wallet = Wallet(blockchain)
+    transaction = Transaction(wallet, 'foo', 900)
+    transaction_pool.admit_transaction(transaction, blockchain)
+
+    # Second Transaction spending sender's balance refused, first seen kept
+    with pytest.raises(Exception, match='already has pending Transaction'):
+        transaction_pool.admit_transaction(Transaction(wallet, 'bar', 900), blockchain)
+
+    # Update of pending Transaction (same id) accepted
+    transaction.update(wallet, 'bar', 50)
+    transaction_pool.admit_transaction(transaction, blockchain)
+
+    assert list(transaction_pool.transaction_map) == [transaction.id]
+    assert transaction_pool.existing_transaction(wallet.address) == transaction
+
+def test_valid_transaction_data_one_per_sender():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    wallet = Wallet(blockchain)
+    first = Transaction(wallet, 'foo', 900)
+    # Set directly (e.g. returned to pool by reorg)
+    transaction_pool.set_transaction(first)
+    transaction_pool.set_transaction(Transaction(wallet, 'bar', 900))
+
+    assert transaction_pool.valid_transaction_data(blockchain) == [first.to_json()]
+
+    transaction_pool.clear_blockchain_transactions(blockchain)
+
+    assert list(transaction_pool.transaction_map) == [first.id]
+    assert transaction_pool.sender_map == {wallet.address: first.id}
+
+def test_valid_transaction_data():
+    blockchain = Blockchain()
+    transaction_pool = TransactionPool()
+    wallet = Wallet(blockchain)
+    spent = Transaction(wallet, 'recipient', 5)
+    valid = Transaction(Wallet(blockchain), 'recipient', 5)
+    transaction_pool.admit_transaction(spent, blockchain)
+    transaction_pool.admit_transaction(valid, blockchain)
+
+    # Sender's balance changes after admission
+    blockchain.add_block([Transaction(wallet, 'recipient', 1).to_json()])
+
+    # Block data only holds Transactions still valid on new tip
+    assert transaction_pool.valid_transaction_data(blockchain) == [valid.to_json()]
+
+    transaction_pool.clear_blockchain_transactions(blockchain)
+
+    # Invalid Transaction dropped, verdict of the rest renewed
+    assert list(transaction_pool.transaction_map) == [valid.id]
+    assert transaction_pool.verdicts == {valid.id: blockchain.chain[-1].hash}
+
 def test_clear_blockchain_transactions():
     transaction_pool = TransactionPool()
     transaction_1 = Transaction(Wallet(), 'recipient', 1)
@@ -33,3 +134,25 @@ def test_clear_blockchain_transactions():
     # Transactions removed from pool
     assert not transaction_1.id in transaction_pool.transaction_map
     assert not transaction_1.id in transaction_pool.transaction_map
+
+def test_update_for_reorg():
+    transaction_pool = TransactionPool()
+    removed_transaction = Transaction(Wallet(), 'recipient', 1)
+    added_transaction = Transaction(Wallet(), 'recipient', 2)
+    reward = Transaction.reward_transaction(Wallet())
+    transaction_pool.set_transaction(added_transaction)
+
+    removed_block = Block.mine_block(Block.genesis(), [removed_transaction.to_json(), reward.to_json()])
+    added_block = Block.mine_block(Block.genesis(), [added_transaction.to_json()])
+    transaction_pool.update_for_reorg([removed_block], [added_block])
+
+    # Transactions of dropped Block back in pool (mining reward is not), new Block's Transactions removed
+    assert list(transaction_pool.transaction_map) == [removed_transaction.id]
+
+def test_serialize():
+    transaction_pool = TransactionPool()
+    transaction = Transaction(Wallet(), 'recipient', 5)
+    transaction_pool.set_transaction(transaction)
+
+    # JSON list of pool Transactions
+    assert json.loads(transaction_pool.serialize()) == json.loads(json.dumps(transaction_pool.transaction_data()))
@@ -44,4 +44,12 @@ def test_calculate_balance():
 
     # Balance is increased by incoming transaction amounts
     assert Wallet.calculate_balance(blockchain, wallet.address) == STARTING_BALANCE - amount + recieved_amount_1 + recieved_amount_2
-    
\ No newline at end of file
+    
+def test_wallet_from_private_value():
+    # Same secret and address – same keys
+    wallet = Wallet(private_value=12345, address='known')
+    same_wallet = Wallet(private_value=12345, address='known')
+
+    assert wallet.address == 'known'
+    assert wallet.public_key == same_wallet.public_key
+    assert Wallet.verify(same_wallet.public_key, {'foo': 'bar'}, wallet.sign({'foo': 'bar'}))
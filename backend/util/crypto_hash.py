@@ -1,16 +1,55 @@
 from hashlib import sha256
 from json import dumps
+from json.encoder import encode_basestring_ascii
 
 
+class Encoded(bytes):
+    """
+    Argument already in canonical encoding (see pre_encode) – hashed as is
+    """
+
+def encode(arg):
+    """
+    Canonical encoding of one hash argument (same bytes as json.dumps)
+    :param arg: <any> JSON-serializable data
+    :return: <bytes> ASCII JSON encoding of argument
+    """
+    arg_type = type(arg)
+
+    # Fast paths for the common argument types
+    if arg_type is Encoded:
+        return arg
+    if arg_type is int:
+        return int.__repr__(arg).encode('ascii')
+    if arg_type is str:
+        return encode_basestring_ascii(arg).encode('ascii')
+
+    return dumps(arg).encode('utf-8')
+
+def pre_encode(arg):
+    """
+    Encode argument once for reuse across many crypto_hash calls (e.g. Block data while mining)
+    :param arg: <any> JSON-serializable data
+    :return: <Encoded> Canonical encoding of argument
+    """
+    return Encoded(encode(arg))
+
 def crypto_hash(*args):
     """
     Return SHA-256 hash of all arguments
+    Arguments are JSON encoded and separated by '^', streamed straight into the hash
     :param *args: <any> Data fed to hash algorithm
     :return <str> Hash string (hexadecimal representation)
     """
-    stringified_args = map(dumps, args)
-    joined_data = '^'.join(stringified_args)
-    return sha256(joined_data.encode('utf-8')).hexdigest()
+    hash = sha256()
+    separator = b''
+
+    for arg in args:
+        hash.update(separator)
+        hash.update(encode(arg))
+        separator = b'^'
+
+    return hash.hexdigest()
 
 
 # -- TESTING AND EXPERIMENTATION -- #
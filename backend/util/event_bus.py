@@ -0,0 +1,121 @@
+from json import dumps
+from queue import Queue, Empty, Full
+from threading import Lock
+
+
+# Events buffered per subscriber before it is marked lagging
+MAX_QUEUED_EVENTS = 100
+
+def encode_event(event, data):
+    """
+    Encode server-sent event
+    :param event: <str> Event name
+    :param data: <bytes / object> Data (encoded JSON, or object encoded as JSON)
+    :return: <bytes> Event in text/event-stream format
+    """
+    if not isinstance(data, bytes):
+        data = dumps(data).encode('utf-8')
+
+    return b'event: ' + event.encode('utf-8') + b'\ndata: ' + data + b'\n\n'
+
+
+class Subscription:
+    """
+    Events queued for one subscriber (e.g. one /events stream)
+    - Subscriber too slow to keep up is marked lagging instead of blocking publishers
+    """
+    def __init__(self, max_queued=MAX_QUEUED_EVENTS):
+        """
+        Initialize Subscription with no events
+        :param max_queued: <int> Events buffered before subscriber lags
+        """
+        self.queue = Queue(max_queued)
+        self.lagging = False
+
+    def put(self, message):
+        """
+        Queue encoded event (drop it and mark subscriber lagging if queue full)
+        :param message: <bytes> Encoded event
+        :return: None
+        """
+        try:
+            self.queue.put_nowait(message)
+        except Full:
+            self.lagging = True
+
+    def get(self, timeout=None):
+        """
+        Next encoded event
+        - Lagging subscriber gets a single 'reset' event (it must refetch state) instead of missed events
+        :param timeout: <float> Seconds to wait
+        :return: <bytes / None> Encoded event, None if none arrived in time
+        """
+        if self.lagging:
+            self.lagging = False
+
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+            return encode_event('reset', {})
+
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+
+class EventBus:
+    """
+    Fan-out of events to subscribers
+    - Each event is encoded once, however many subscribers receive it
+    """
+    def __init__(self, max_subscribers=None):
+        """
+        Initialize EventBus with no subscribers
+        :param max_subscribers: <int> Subscribers allowed at once (None – unlimited)
+        """
+        self.max_subscribers = max_subscribers
+        self.subscriptions = set()
+        self.lock = Lock()
+
+    def has_subscribers(self):
+        return bool(self.subscriptions)
+
+    def subscribe(self):
+        """
+        Add subscriber
+        :return: <Subscription> Subscription receiving every later event
+        :raises Exception: Throw if maximum subscribers reached
+        """
+        with self.lock:
+            if self.max_subscribers is not None and len(self.subscriptions) >= self.max_subscribers:
+                raise Exception(f'Cannot subscribe – Maximum of {self.max_subscribers} subscribers reached')
+
+            subscription = Subscription()
+            self.subscriptions.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove subscriber
+        :param subscription: <Subscription> Subscription returned by subscribe
+        :return: None
+        """
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, event, data):
+        """
+        Send event to every subscriber
+        :param event: <str> Event name
+        :param data: <bytes / object> Event data
+        :return: None
+        """
+        if not self.subscriptions:
+            return
+
+        message = encode_event(event, data)
+
+        with self.lock:
+            for subscription in self.subscriptions:
+                subscription.put(message)
@@ -0,0 +1,31 @@
+import sys
+
+
+def deep_sizeof(value):
+    """
+    Approximate memory used by value and everything it contains
+    - Follows dicts, lists, tuples and sets (JSON-like data)
+    - Objects referenced more than once are counted once
+    :param value: <any> Value being measured
+    :return: <int> Bytes
+    """
+    seen = set()
+    pending = [value]
+    size = 0
+
+    while pending:
+        item = pending.pop()
+
+        if id(item) in seen:
+            continue
+
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            pending.extend(item)
+
+    return size
@@ -0,0 +1,81 @@
+from backend.util.crypto_hash import crypto_hash
+
+
+# Merkle root of Block without Transactions
+EMPTY_MERKLE_ROOT = crypto_hash([])
+
+def leaf_hash(item):
+    """
+    Hash of one Merkle tree leaf (e.g. Transaction in JSON format)
+    :param item: <any> Leaf data
+    :return: <str> Hash string (hexadecimal representation)
+    """
+    return crypto_hash(item)
+
+def merkle_levels(leaf_hashes):
+    """
+    Build every level of Merkle tree (odd levels pair last hash with itself)
+    - Leaves [a, b, c] and [a, b, c, c] share a root – validators must reject duplicate leaves
+    :param leaf_hashes: <list> Hashes of leaves
+    :return: <list> Levels from leaves up to root
+    """
+    levels = [list(leaf_hashes)]
+
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append([
+            crypto_hash(level[i], level[min(i + 1, len(level) - 1)])
+            for i in range(0, len(level), 2)
+        ])
+
+    return levels
+
+def merkle_root(items):
+    """
+    Merkle root committing to list of items
+    :param items: <list> Leaf data (e.g. Block data)
+    :return: <str> Merkle root hash
+    """
+    return merkle_root_of_hashes(list(map(leaf_hash, items)))
+
+def merkle_root_of_hashes(leaf_hashes):
+    """
+    Merkle root of already hashed leaves
+    :param leaf_hashes: <list> Hashes of leaves
+    :return: <str> Merkle root hash
+    """
+    if not leaf_hashes:
+        return EMPTY_MERKLE_ROOT
+
+    return merkle_levels(leaf_hashes)[-1][0]
+
+def merkle_proof(items, index):
+    """
+    Inclusion proof of one item in Merkle tree
+    :param items: <list> Leaf data (e.g. Block data)
+    :param index: <int> Position of item being proven
+    :return: <list> [sibling hash, side of sibling ('left' / 'right')] pairs from leaf up to root
+    """
+    proof = []
+
+    for level in merkle_levels(map(leaf_hash, items))[:-1]:
+        sibling = index - 1 if index % 2 else min(index + 1, len(level) - 1)
+        proof.append([level[sibling], 'left' if index % 2 else 'right'])
+        index //= 2
+
+    return proof
+
+def verify_merkle_proof(item, proof, root):
+    """
+    Verify that item is included in Merkle tree with given root
+    :param item: <any> Leaf data
+    :param proof: <list> Proof from merkle_proof
+    :param root: <str> Merkle root hash
+    :return: <bool> True if proof valid, False if not
+    """
+    hash = leaf_hash(item)
+
+    for sibling, side in proof:
+        hash = crypto_hash(sibling, hash) if side == 'left' else crypto_hash(hash, sibling)
+
+    return hash == root
@@ -0,0 +1,316 @@
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from backend.config import METRICS_ENABLED
+
+
+# Upper bounds (seconds) of histogram buckets – validation and signature checks up to mining
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+
+def format_value(value):
+    """
+    Format sample value for Prometheus text format
+    :param value: <int / float> Sample value
+    :return: <str> Formatted value
+    """
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(value)
+
+def format_labels(labels):
+    """
+    Format sample labels for Prometheus text format
+    :param labels: <list> (label name, label value) pairs
+    :return: <str> Formatted labels ('' if none)
+    """
+    if not labels:
+        return ''
+
+    formatted = []
+
+    for name, value in labels:
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        formatted.append(f'{name}="{escaped}"')
+
+    return '{' + ','.join(formatted) + '}'
+
+
+class Metric:
+    """
+    Named metric with optional single label (e.g. operation, channel)
+    """
+    type = None
+
+    def __init__(self, registry, name, help, label=None):
+        """
+        Initialize Metric with no samples
+        :param registry: <MetricsRegistry> Registry metric belongs to
+        :param name: <str> Metric name
+        :param help: <str> Description of metric
+        :param label: <str> Name of label distinguishing series (None – single series)
+        """
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.label = label
+        self.series = {}
+        self.lock = Lock()
+
+    def labels(self, label_value):
+        """
+        Labels of one series
+        :param label_value: <str> Value of metric label
+        :return: <list> (label name, label value) pairs
+        """
+        return [(self.label, label_value)] if self.label else []
+
+    def render(self):
+        """
+        Render metric in Prometheus text format
+        :return: <list> Lines
+        """
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type}']
+
+        with self.lock:
+            for label_value, value in sorted(self.series.items(), key=lambda item: str(item[0])):
+                lines.extend(self.render_series(self.labels(label_value), value))
+
+        return lines
+
+    def render_series(self, labels, value):
+        return [f'{self.name}{format_labels(labels)} {format_value(value)}']
+
+    def reset(self):
+        """
+        Drop every sample
+        :return: None
+        """
+        with self.lock:
+            self.series.clear()
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count (e.g. hashes computed)
+    """
+    type = 'counter'
+
+    def inc(self, amount=1, label_value=None):
+        """
+        Increase counter (no-op while metrics disabled)
+        :param amount: <int / float> Amount added
+        :param label_value: <str> Value of metric label
+        :return: None
+        """
+        if not self.registry.enabled:
+            return
+
+        with self.lock:
+            self.series[label_value] = self.series.get(label_value, 0) + amount
+
+    def value(self, label_value=None):
+        return self.series.get(label_value, 0)
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down – set directly or read from a function when rendered
+    """
+    type = 'gauge'
+
+    def __init__(self, registry, name, help, label=None, function=None):
+        """
+        :param function: <callable> Returns current value (read on every render)
+        """
+        super().__init__(registry, name, help, label)
+        self.function = function
+
+    def set(self, value, label_value=None):
+        """
+        Set gauge (no-op while metrics disabled)
+        :param value: <int / float> New value
+        :param label_value: <str> Value of metric label
+        :return: None
+        """
+        if not self.registry.enabled:
+            return
+
+        with self.lock:
+            self.series[label_value] = value
+
+    def value(self, label_value=None):
+        return self.function() if self.function else self.series.get(label_value, 0)
+
+    def render(self):
+        if self.function:
+            return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type}',
+                    f'{self.name} {format_value(self.function())}']
+
+        return super().render()
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values (e.g. seconds spent validating) in cumulative buckets
+    """
+    type = 'histogram'
+
+    def __init__(self, registry, name, help, label=None, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: <tuple> Upper bounds of buckets (ascending)
+        """
+        super().__init__(registry, name, help, label)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, label_value=None):
+        """
+        Record observed value (no-op while metrics disabled)
+        :param value: <int / float> Observed value
+        :param label_value: <str> Value of metric label
+        :return: None
+        """
+        if not self.registry.enabled:
+            return
+
+        with self.lock:
+            series = self.series.get(label_value)
+
+            if series is None:
+                # [bucket counts, sum, count]
+                series = self.series[label_value] = [[0] * len(self.buckets), 0, 0]
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, label_value=None):
+        """
+        Observe seconds spent in with-block (skips timing while metrics disabled)
+        :param label_value: <str> Value of metric label
+        """
+        if not self.registry.enabled:
+            yield
+            return
+
+        start_time = perf_counter()
+
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start_time, label_value)
+
+    def count(self, label_value=None):
+        series = self.series.get(label_value)
+        return series[2] if series else 0
+
+    def render_series(self, labels, series):
+        bucket_counts, total, count = series
+        lines = []
+        cumulative = 0
+
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{format_labels(labels + [("le", format_value(bound))])} {cumulative}')
+
+        lines.append(f'{self.name}_sum{format_labels(labels)} {format_value(total)}')
+        lines.append(f'{self.name}_count{format_labels(labels)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together (e.g. by /metrics endpoint)
+    - Recording is a single flag check while disabled
+    """
+    def __init__(self, enabled=False):
+        """
+        Initialize MetricsRegistry with no metrics
+        :param enabled: <bool> Whether samples are recorded
+        """
+        self.enabled = enabled
+        self.metrics = {}
+
+    def register(self, metric):
+        """
+        Add metric to registry
+        :param metric: <Metric> Metric being added
+        :return: <Metric> Added metric
+        :raises Exception: Throw if metric name already taken
+        """
+        if metric.name in self.metrics:
+            raise Exception(f'Metric {metric.name} already registered')
+
+        self.metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name):
+        """
+        Remove metric from registry (if registered)
+        :param name: <str> Metric name
+        :return: None
+        """
+        self.metrics.pop(name, None)
+
+    def counter(self, name, help, label=None):
+        return self.register(Counter(self, name, help, label))
+
+    def gauge(self, name, help, label=None, function=None):
+        return self.register(Gauge(self, name, help, label, function))
+
+    def histogram(self, name, help, label=None, buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(self, name, help, label, buckets))
+
+    def render(self):
+        """
+        Render every metric in Prometheus text format
+        :return: <str> Exposition text
+        """
+        lines = []
+
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """
+        Drop samples of every metric
+        :return: None
+        """
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+# Metrics of this process (enable with METRICS_ENABLED=True)
+REGISTRY = MetricsRegistry(METRICS_ENABLED)
+
+def timed(histogram, label_value=None):
+    """
+    Decorator observing seconds spent in each call of function
+    :param histogram: <Histogram> Histogram receiving durations
+    :param label_value: <str> Value of metric label
+    :return: <callable> Decorator
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not histogram.registry.enabled:
+                return function(*args, **kwargs)
+
+            start_time = perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - start_time, label_value)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,128 @@
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from time import perf_counter, sleep
+
+
+# Seconds between stack samples
+SAMPLE_INTERVAL = 0.005
+
+# Longest profile allowed (keeps a live node from being sampled indefinitely)
+MAX_PROFILE_SECONDS = 60
+
+# Frames kept per tracemalloc allocation site
+TRACEMALLOC_FRAMES = 1
+
+def frame_key(frame):
+    """
+    Identify function of stack frame
+    :param frame: <frame> Stack frame
+    :return: <str> 'function (file:first line)'
+    """
+    code = frame.f_code
+    return f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})'
+
+def sample_stacks(seconds, interval=SAMPLE_INTERVAL, top=20):
+    """
+    Sample stacks of every other thread for a fixed time
+    - 'self' counts samples where function was running (top of stack)
+    - 'total' counts samples where function was anywhere on stack
+    :param seconds: <float> Time spent sampling
+    :param interval: <float> Seconds between samples
+    :param top: <int> Number of functions reported
+    :return: <dict> Sample count and top functions by self and total samples
+    """
+    own_thread = threading.get_ident()
+    self_counts = Counter()
+    total_counts = Counter()
+    samples = 0
+    end_time = perf_counter() + seconds
+
+    while perf_counter() < end_time:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+
+            self_counts[frame_key(frame)] += 1
+            stack = set()
+
+            while frame:
+                stack.add(frame_key(frame))
+                frame = frame.f_back
+
+            total_counts.update(stack)
+
+        samples += 1
+        sleep(interval)
+
+    return {
+        'samples': samples,
+        'self': [{'function': key, 'samples': count} for key, count in self_counts.most_common(top)],
+        'total': [{'function': key, 'samples': count} for key, count in total_counts.most_common(top)]
+    }
+
+def memory_top(snapshot, top=20):
+    """
+    Largest allocation sites of tracemalloc snapshot
+    :param snapshot: <Snapshot> tracemalloc snapshot
+    :param top: <int> Number of sites reported
+    :return: <list> Allocation sites with size (bytes) and block count
+    """
+    return [
+        {'site': str(statistic.traceback), 'size': statistic.size, 'count': statistic.count}
+        for statistic in snapshot.statistics('lineno')[:top]
+    ]
+
+
+class Profiler:
+    """
+    On-demand profiler for a live node
+    - Samples stacks of all threads (request handlers, Miner, PubSub)
+    - Optionally traces memory allocations while sampling
+    - One profile at a time
+    """
+    def __init__(self):
+        """
+        Initialize idle Profiler
+        """
+        self.lock = threading.Lock()
+
+    def profile(self, seconds, top=20, memory=False):
+        """
+        Capture time-boxed profile
+        :param seconds: <float> Time spent profiling (capped at MAX_PROFILE_SECONDS)
+        :param top: <int> Number of functions (and allocation sites) reported
+        :param memory: <bool> Also report allocation sites traced while sampling
+        :return: <dict> Profile
+        :raises Exception: Throw if a profile is already running
+        """
+        if not self.lock.acquire(blocking=False):
+            raise Exception('Profile already running')
+
+        try:
+            seconds = min(max(seconds, 0), MAX_PROFILE_SECONDS)
+            started_tracing = memory and not tracemalloc.is_tracing()
+
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+
+            try:
+                result = sample_stacks(seconds, top=top)
+                result['seconds'] = seconds
+
+                if memory:
+                    current, peak = tracemalloc.get_traced_memory()
+                    result['memory'] = {
+                        'current': current,
+                        'peak': peak,
+                        'top': memory_top(tracemalloc.take_snapshot(), top)
+                    }
+            finally:
+                # Tracing slows every allocation – only keep it on if it was on before
+                if started_tracing:
+                    tracemalloc.stop()
+
+            return result
+        finally:
+            self.lock.release()
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter
+    - Refills at rate tokens per second, holding at most burst tokens
+    - Not thread safe (callers hold their own lock)
+    """
+    def __init__(self, rate, burst, clock=monotonic):
+        """
+        Initialize TokenBucket full
+        :param rate: <float> Tokens added per second
+        :param burst: <float> Maximum tokens held
+        :param clock: <callable> Returns current time in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+
+    def allow(self, cost=1):
+        """
+        Take tokens if enough available
+        :param cost: <float> Tokens needed
+        :return: <bool> True if allowed, False if rate exceeded
+        """
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < cost:
+            return False
+
+        self.tokens -= cost
+        return True
+
+
+class KeyedTokenBuckets:
+    """
+    One TokenBucket per key (e.g. per sender address)
+    - At most max_keys buckets kept – least recently used dropped (its key starts full again)
+    """
+    def __init__(self, rate, burst, max_keys, clock=monotonic):
+        """
+        Initialize KeyedTokenBuckets with no buckets
+        :param max_keys: <int> Maximum number of buckets kept
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self.buckets = OrderedDict()
+
+    def allow(self, key, cost=1):
+        """
+        Take tokens from bucket of key if enough available
+        :param key: <str> Key
+        :param cost: <float> Tokens needed
+        :return: <bool> True if allowed, False if rate of key exceeded
+        """
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst, self.clock)
+
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+
+        return bucket.allow(cost)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from hashlib import sha256
+from json import dumps
+from threading import Lock
+
+
+# Maximum number of responses cached for one chain tip
+MAX_CACHED_RESPONSES = 256
+
+class TipResponseCache:
+    """
+    Cache of serialized responses keyed by chain tip hash
+    - Responses only change when the last Block of the chain changes
+    - Every cached response is dropped as soon as a new tip hash is seen
+    """
+    def __init__(self, max_size=MAX_CACHED_RESPONSES):
+        """
+        Initialize TipResponseCache with no tip and no responses
+        :param max_size: <int> Maximum number of responses kept (least recently used dropped)
+        """
+        self.max_size = max_size
+        self.tip_hash = None
+        self.responses = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tip_hash, key, compute):
+        """
+        Get serialized response for key, computing it on cache miss
+        :param tip_hash: <str> Hash of last Block in chain
+        :param key: <str> Response key (e.g. request path and query)
+        :param compute: <callable> Returns JSON-serializable response data (or already encoded JSON bytes)
+        :return: <tuple> (<bytes> JSON body, <str> ETag)
+        """
+        with self.lock:
+            # New tip – every cached response is stale
+            if tip_hash != self.tip_hash:
+                self.tip_hash = tip_hash
+                self.responses.clear()
+
+            response = self.responses.get(key)
+
+            if response:
+                self.responses.move_to_end(key)
+                self.hits += 1
+                return response
+
+            self.misses += 1
+
+        body = compute()
+
+        if not isinstance(body, bytes):
+            body = dumps(body).encode('utf-8')
+
+        etag = sha256(f'{tip_hash}^{key}'.encode('utf-8')).hexdigest()[:32]
+
+        with self.lock:
+            if tip_hash == self.tip_hash:
+                self.responses[key] = (body, etag)
+
+                if len(self.responses) > self.max_size:
+                    self.responses.popitem(last=False)
+
+        return body, etag
+
+    def clear(self):
+        """
+        Drop every cached response
+        :return: None
+        """
+        with self.lock:
+            self.tip_hash = None
+            self.responses.clear()
@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+from threading import Condition, Lock
+
+
+class ReadWriteLock:
+    """
+    Reader-writer lock
+    - Any number of readers may hold the lock at once
+    - Writers hold the lock exclusively
+    - Waiting writers block new readers (writers are not starved)
+    Not reentrant – do not acquire write access while holding read access
+    """
+    def __init__(self):
+        """
+        Initialize ReadWriteLock with no readers or writers
+        """
+        self.condition = Condition(Lock())
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+        # Called (lock not held) after every exclusive section, e.g. to publish changes
+        self.release_listeners = []
+
+    def add_release_listener(self, listener):
+        """
+        Call listener after every release of exclusive (write) access
+        :param listener: <callable> Called with no arguments, without lock held
+        :return: None
+        """
+        self.release_listeners.append(listener)
+
+    def acquire_read(self):
+        """
+        Acquire shared (read) access
+        :return: None
+        """
+        with self.condition:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+
+    def release_read(self):
+        """
+        Release shared (read) access
+        :return: None
+        """
+        with self.condition:
+            self.readers -= 1
+            if not self.readers:
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Acquire exclusive (write) access
+        :return: None
+        """
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+
+    def release_write(self):
+        """
+        Release exclusive (write) access
+        :return: None
+        """
+        with self.condition:
+            self.writer = False
+            self.condition.notify_all()
+
+        for listener in self.release_listeners:
+            listener()
+
+    @contextmanager
+    def read(self):
+        """
+        Context manager holding shared (read) access
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """
+        Context manager holding exclusive (write) access
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
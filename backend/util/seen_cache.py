@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+
+class SeenCache:
+    """
+    Keys seen recently (e.g. hashes of gossiped Blocks), bounded in size and age
+    - Keys expire ttl seconds after first seen
+    - Oldest keys dropped first once max_size reached
+    """
+    def __init__(self, max_size, ttl, clock=monotonic):
+        """
+        Initialize SeenCache with no keys
+        :param max_size: <int> Maximum number of keys kept
+        :param ttl: <float> Seconds a key is remembered
+        :param clock: <callable> Returns current time in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        # Key -> time first seen (oldest first)
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def expire(self, now):
+        """
+        Drop keys older than ttl (call with lock held)
+        :param now: <float> Current time
+        :return: None
+        """
+        while self.entries:
+            key, seen_at = next(iter(self.entries.items()))
+
+            if now - seen_at < self.ttl:
+                return
+
+            self.entries.popitem(last=False)
+
+    def add(self, key):
+        """
+        Remember key (e.g. of message broadcast by this node)
+        :param key: <str> Key
+        :return: None
+        """
+        now = self.clock()
+
+        with self.lock:
+            self.expire(now)
+
+            if key not in self.entries:
+                self.entries[key] = now
+
+                if len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+
+    def forget(self, key):
+        """
+        Drop key (e.g. message refused after it was remembered), so it counts as new again
+        :param key: <str> Key
+        :return: None
+        """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def seen(self, key, remember=True):
+        """
+        Check whether key seen recently, remembering it if not
+        :param key: <str> Key
+        :param remember: <bool> Whether new key is remembered (False – caller adds it once message accepted)
+        :return: <bool> True if key seen before (duplicate), False if new
+        """
+        now = self.clock()
+
+        with self.lock:
+            self.expire(now)
+
+            if key in self.entries:
+                self.hits += 1
+                return True
+
+            self.misses += 1
+
+            if not remember:
+                return False
+
+            self.entries[key] = now
+
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+            return False
@@ -1,4 +1,5 @@
 from uuid import uuid4
+from json import dumps
 from time import time_ns
 from backend.config import MINING_REWARD, MINING_REWARD_INPUT
 from backend.wallet.wallet import Wallet
@@ -13,6 +14,15 @@ class Transaction:
         self.output = output or self.create_output(sender_wallet, recipient, amount)
         self.input = input or self.create_input(sender_wallet, self.output)
 
+    def __setattr__(self, name, value):
+        """
+        Set attribute – changing any Transaction field drops cached serialization
+        """
+        super().__setattr__(name, value)
+
+        if not name.startswith('_'):
+            super().__setattr__('_serialized', None)
+
     def create_output(self, sender_wallet, recipient, amount):
         """
         Structure output data for Transaction
@@ -31,17 +41,19 @@ class Transaction:
 
         return output
 
-    def create_input(self, sender_wallet, output):
+    @staticmethod
+    def create_input(sender_wallet, output, balance=None):
         """
         Structure input data for Transaction
         Sign Transaction and include sender's public key and address
         :param sender_wallet: <Wallet> Wallet of sender
         :param output: <dict> Output data of Transaction
+        :param balance: <float> Balance of sender (computed from Wallet if None)
         :return: <dict> Input data of Transaction
         """
         return {
             'timestamp': time_ns(),
-            'amount': sender_wallet.balance,
+            'amount': sender_wallet.balance if balance is None else balance,
             'address': sender_wallet.address,
             'public_key': sender_wallet.public_key,
             'signature': sender_wallet.sign(output)
@@ -50,6 +62,7 @@ class Transaction:
     def update(self, sender_wallet, recipient, amount):
         """
         Update Transaction with existing or new recipient
+        New output dict built – JSON handed out before (e.g. Block data being mined) is left unchanged
         :param sender_wallet: <Wallet> Wallet of sender
         :param recipient: <str> Address of recipient
         :param amount: <float> Transaction amount
@@ -59,22 +72,108 @@ class Transaction:
         if amount > self.output[sender_wallet.address]:
             raise Exception('Amount exceeds balance')
 
+        output = dict(self.output)
+
         # Modify existing transaction amount with recipient
-        if recipient in self.output:
-            self.output[recipient] += amount
+        if recipient in output:
+            output[recipient] += amount
         # New recipient
         else:
-            self.output[recipient] = amount
+            output[recipient] = amount
 
-        self.output[sender_wallet.address] -= amount
+        output[sender_wallet.address] -= amount
+        self.output = output
         self.input = self.create_input(sender_wallet, self.output)
 
+    def update_batch(self, sender_wallet, payments):
+        """
+        Update Transaction with many existing or new recipients at once
+        Balance checked and Transaction signed once for the whole batch (new output dict built, see update)
+        :param sender_wallet: <Wallet> Wallet of sender
+        :param payments: <list> (recipient address, amount) pairs
+        :return: None
+        """
+        total = Transaction.payments_total(payments)
+
+        # Not enough funds
+        if total > self.output[sender_wallet.address]:
+            raise Exception('Amount exceeds balance')
+
+        output = dict(self.output)
+
+        for recipient, amount in payments:
+            output[recipient] = output.get(recipient, 0) + amount
+
+        output[sender_wallet.address] -= total
+        self.output = output
+        self.input = self.create_input(sender_wallet, self.output)
+
+    @staticmethod
+    def batch(sender_wallet, payments):
+        """
+        Create Transaction paying many recipients (balance computed and Transaction signed once)
+        :param sender_wallet: <Wallet> Wallet of sender
+        :param payments: <list> (recipient address, amount) pairs
+        :return: <Transaction> Signed Transaction
+        """
+        total = Transaction.payments_total(payments)
+        balance = sender_wallet.balance
+
+        # Not enough funds
+        if total > balance:
+            raise Exception('Amount exceeds balance')
+
+        output = {}
+
+        for recipient, amount in payments:
+            output[recipient] = output.get(recipient, 0) + amount
+
+        output[sender_wallet.address] = output.get(sender_wallet.address, 0) + balance - total
+
+        return Transaction(output=output, input=Transaction.create_input(sender_wallet, output, balance))
+
+    @staticmethod
+    def payments_total(payments):
+        """
+        Total amount of batch of payments
+        :param payments: <list> (recipient address, amount) pairs
+        :return: <float> Sum of amounts
+        :raises Exception: Throw if batch empty or an amount is not a positive number
+        """
+        if not payments:
+            raise Exception('Batch has no payments')
+
+        total = 0
+
+        for recipient, amount in payments:
+            # bool is an int subclass – True would pay 1
+            if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+                raise Exception(f'Invalid amount for {recipient} – Amount must be a number')
+
+            if amount <= 0:
+                raise Exception(f'Invalid amount for {recipient} – Amount must be positive')
+
+            total += amount
+
+        return total
+
     def to_json(self):
         """
         Serialize Transaction
         :return: <dict> Dictionary representation of Transaction
         """
-        return self.__dict__
+        return {'id': self.id, 'output': self.output, 'input': self.input}
+
+    def serialize(self):
+        """
+        Canonical JSON encoding of Transaction
+        Computed once and reused until Transaction is updated
+        :return: <bytes> UTF-8 encoded JSON of Transaction
+        """
+        if self._serialized is None:
+            self._serialized = dumps(self.to_json()).encode('utf-8')
+
+        return self._serialized
 
     @staticmethod
     def from_json(transaction_json):
@@ -103,6 +202,10 @@ class Transaction:
             return
 
         # Normal transaction
+        # Sender's balance becomes its 'change' entry – every Transaction must have one
+        if transaction.input['address'] not in transaction.output:
+            raise Exception('Invalid transaction – Output has no entry for sender')
+
         output_total = sum(transaction.output.values())
 
         if transaction.input['amount'] != output_total:
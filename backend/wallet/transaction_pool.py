@@ -1,3 +1,12 @@
+from backend.util.metrics import REGISTRY, timed
+from backend.wallet.transaction import Transaction
+from backend.config import MINING_REWARD_INPUT
+
+
+POOL_OPERATION_SECONDS = REGISTRY.histogram(
+    'transaction_pool_operation_seconds', 'Seconds spent in TransactionPool operations', 'operation')
+POOL_REJECTIONS = REGISTRY.counter('transaction_pool_rejections_total', 'Transactions refused at pool admission')
+
 class TransactionPool:
     """
     Store Transactions not yet been added to Blockchain (for miners)
@@ -7,7 +16,16 @@ class TransactionPool:
         Initialize TransactionPool with empty pool
         """
         self.transaction_map = {}
+        # Incremented whenever pool contents change (lets miners refresh their Block data)
+        self.version = 0
+        # Transaction id -> hash of chain tip Transaction was last found valid on
+        self.verdicts = {}
+        # Sender address -> id of sender's pending Transaction
+        self.sender_map = {}
+        # Ids of Transactions set or removed since last drain_changes
+        self.changed_ids = set()
 
+    @timed(POOL_OPERATION_SECONDS, 'set_transaction')
     def set_transaction(self, transaction):
         """
         Set Transaction in TransactionPool
@@ -15,16 +33,131 @@ class TransactionPool:
         :return: None
         """
         self.transaction_map[transaction.id] = transaction
+        self.sender_map[transaction.input['address']] = transaction.id
+        self.changed_ids.add(transaction.id)
+        self.version += 1
+
+    @timed(POOL_OPERATION_SECONDS, 'admit_transaction')
+    def admit_transaction(self, transaction, blockchain, verified=False):
+        """
+        Validate Transaction against current chain state, then set it in pool
+        - Verdict cached on pool entry until chain tip changes
+        - One pending Transaction per sender (first seen kept) – updates of it keep its id
+        :param transaction: <Transaction> Transaction being admitted
+        :param blockchain: <Blockchain> Blockchain whose balances Transaction must match
+        :param verified: <bool> Whether signature and outputs already verified (e.g. outside state lock)
+        :return: None
+        :raises Exception: Throw if Transaction invalid or sender already has another pending Transaction (pool unchanged)
+        """
+        try:
+            if transaction.input == MINING_REWARD_INPUT:
+                raise Exception('Invalid transaction – Mining reward not accepted in pool')
+
+            pending_id = self.sender_map.get(transaction.input['address'])
+
+            # Double spend – both Transactions spend sender's whole balance
+            if pending_id is not None and pending_id != transaction.id:
+                raise Exception(f'Invalid transaction – Sender already has pending Transaction {pending_id}')
+
+            if not verified:
+                Transaction.is_valid_transaction(transaction)
+
+            TransactionPool.is_valid_on_chain(transaction, blockchain)
+        except Exception:
+            POOL_REJECTIONS.inc()
+            raise
+
+        self.set_transaction(transaction)
+        self.verdicts[transaction.id] = blockchain.chain[-1].hash
+
+    @staticmethod
+    def is_valid_on_chain(transaction, blockchain):
+        """
+        Validate Transaction against main chain (same rules as Blockchain.is_valid_block_transactions)
+        Requirements:
+            - Transaction not already in chain
+            - Input amount equals sender's current balance
+        :param transaction: <Transaction> Transaction with verified signature
+        :param blockchain: <Blockchain> Blockchain
+        :return: None
+        :raises Exception: Throw if Transaction would make a Block invalid
+        """
+        if blockchain.has_transaction(transaction.id):
+            raise Exception(f'Invalid transaction – Transaction {transaction.id} already in chain')
+
+        if blockchain.balance(transaction.input['address']) != transaction.input['amount']:
+            raise Exception(f'Invalid transaction – Transaction {transaction.id} input amount does not match balance')
+
+    def remove_transaction(self, transaction_id):
+        """
+        Delete Transaction (and its cached verdict) from pool
+        :param transaction_id: <str> Id of Transaction
+        :return: None
+        """
+        transaction = self.transaction_map.pop(transaction_id)
+        self.verdicts.pop(transaction_id, None)
+
+        if self.sender_map.get(transaction.input['address']) == transaction_id:
+            del self.sender_map[transaction.input['address']]
+
+        self.changed_ids.add(transaction_id)
+        self.version += 1
+
+    def drain_changes(self):
+        """
+        Transactions set or removed since last call (e.g. pushed as pool events)
+        :return: <tuple> (<list> Transactions set (added or updated), <list> ids of removed Transactions)
+        """
+        updated = []
+        removed = []
 
+        for transaction_id in self.changed_ids:
+            transaction = self.transaction_map.get(transaction_id)
+
+            if transaction is None:
+                removed.append(transaction_id)
+            else:
+                updated.append(transaction)
+
+        self.changed_ids = set()
+        return updated, removed
+
+    @timed(POOL_OPERATION_SECONDS, 'existing_transaction')
     def existing_transaction(self, address):
         """
         Find Transaction in pool generated by address
         :param address: <str> Address being searched for within pool
         :return: <Transaction / None> Transaction if match found, None if not
         """
+        return self.transaction_map.get(self.sender_map.get(address))
+
+    @timed(POOL_OPERATION_SECONDS, 'valid_transaction_data')
+    def valid_transaction_data(self, blockchain):
+        """
+        Get pool Transactions valid on current chain tip in JSON format (Block data for miners)
+        - Verdict reached on current tip reused, other Transactions re-checked against balances
+        - At most one Transaction per sender (a Block may spend each balance once)
+        :param blockchain: <Blockchain> Blockchain Block is mined on
+        :return: <list> Valid Transactions in JSON format
+        """
+        tip_hash = blockchain.chain[-1].hash
+        transaction_data = []
+        senders = set()
+
         for transaction in self.transaction_map.values():
-            if transaction.input['address'] == address:
-                return transaction
+            if transaction.input['address'] in senders:
+                continue
+
+            if self.verdicts.get(transaction.id) != tip_hash:
+                try:
+                    TransactionPool.is_valid_on_chain(transaction, blockchain)
+                except Exception:
+                    continue
+
+            senders.add(transaction.input['address'])
+            transaction_data.append(transaction.to_json())
+
+        return transaction_data
 
     def transaction_data(self):
         """
@@ -33,17 +166,61 @@ class TransactionPool:
         """
         return list(map(lambda transaction: transaction.to_json(), self.transaction_map.values()))
 
+    def serialize(self):
+        """
+        Canonical JSON encoding of all Transactions in pool (reuses each Transaction's cached encoding)
+        :return: <bytes> UTF-8 encoded JSON list of Transactions
+        """
+        return b'[' + b', '.join(map(lambda transaction: transaction.serialize(), self.transaction_map.values())) + b']'
+
+    @timed(POOL_OPERATION_SECONDS, 'clear_blockchain_transactions')
     def clear_blockchain_transactions(self, blockchain):
         """
-        Delete Transactions from pool if already recorded in Blockchain
+        Delete Transactions from pool if already recorded in Blockchain or no longer valid on it
+        (e.g. sender's balance changed) – verdicts of remaining Transactions renewed for new tip
+        - Only first Transaction of each sender kept (reorgs may return several to pool)
         :param blockchain: <Blockchain> Blockchain being searched
         :return: None
         """
-        for block in blockchain.chain:
-            for transaction in block.data:
-                try:
-                    # Remove from pool if Transaction 'id' found in Blockchain
-                    del self.transaction_map[transaction['id']]
-                except KeyError:
-                    pass
-                    
\ No newline at end of file
+        tip_hash = blockchain.chain[-1].hash
+        senders = set()
+
+        # Only pool Transactions looked up (Blockchain indexes Transactions and balances)
+        for transaction in list(self.transaction_map.values()):
+            sender = transaction.input['address']
+
+            try:
+                TransactionPool.is_valid_on_chain(transaction, blockchain)
+            except Exception:
+                self.remove_transaction(transaction.id)
+                continue
+
+            if sender in senders:
+                self.remove_transaction(transaction.id)
+                continue
+
+            self.verdicts[transaction.id] = tip_hash
+            senders.add(sender)
+
+        self.sender_map = {transaction.input['address']: transaction.id for transaction in self.transaction_map.values()}
+
+    @timed(POOL_OPERATION_SECONDS, 'update_for_reorg')
+    def update_for_reorg(self, removed_blocks, added_blocks):
+        """
+        Keep pool in step with main chain after Blocks added or switched (reorg)
+        - Transactions of Blocks dropped from main chain return to pool (unless in new Blocks)
+        - Transactions of new main chain Blocks leave pool
+        :param removed_blocks: <list> Blocks removed from main chain
+        :param added_blocks: <list> Blocks added to main chain
+        :return: None
+        """
+        added_ids = set(transaction['id'] for block in added_blocks for transaction in block.data)
+
+        for block in removed_blocks:
+            for transaction_json in block.data:
+                if transaction_json['input'] != MINING_REWARD_INPUT and transaction_json['id'] not in added_ids:
+                    self.set_transaction(Transaction.from_json(transaction_json))
+
+        for transaction_id in added_ids:
+            if transaction_id in self.transaction_map:
+                self.remove_transaction(transaction_id)
@@ -1,13 +1,10 @@
 from uuid import uuid4
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives.hashes import SHA256
-from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.utils import (
-    encode_dss_signature, decode_dss_signature)
 from json import dumps
 from backend.config import STARTING_BALANCE
+from backend.util.metrics import REGISTRY, timed
+
+
+VERIFY_SECONDS = REGISTRY.histogram('signature_verification_seconds', 'Seconds spent verifying signatures')
 
 
 class Wallet:
@@ -15,14 +12,26 @@ class Wallet:
     Individual wallet for miner
     - Keep track of miner's balance
     - Allow miner to authorize Transactions
+    cryptography is imported on first use (modules that never sign or verify start faster)
     """
-    def __init__(self, blockchain=None):
+    def __init__(self, blockchain=None, private_value=None, address=None):
         """
         Initialize Wallet with address, public and private keys, and balance
+        :param blockchain: <Blockchain> Blockchain used to calculate balance
+        :param private_value: <int> Optional private key secret (derive known key instead of generating)
+        :param address: <str> Optional address (random if not given)
         """
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives.asymmetric import ec
+
         self.blockchain = blockchain
-        self.address = str(uuid4())[:8]
-        self.private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
+        self.address = address or str(uuid4())[:8]
+
+        if private_value:
+            self.private_key = ec.derive_private_key(private_value, ec.SECP256K1(), default_backend())
+        else:
+            self.private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
+
         self.public_key = self.private_key.public_key()
         # Serialize public key to string format
         self.serialize_public_key()
@@ -37,6 +46,10 @@ class Wallet:
         :param data: <any> Data to be signed
         :return: <str> Signed data
         """
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+        from cryptography.hazmat.primitives.hashes import SHA256
+
         return decode_dss_signature(self.private_key.sign(dumps(data).encode('utf-8'), 
                                         ec.ECDSA(SHA256())))
 
@@ -45,12 +58,15 @@ class Wallet:
         Reset public key to serialized version
         :return: None
         """
+        from cryptography.hazmat.primitives import serialization
+
         self.public_key = self.public_key.public_bytes(
                             encoding=serialization.Encoding.PEM, 
                             format=serialization.PublicFormat.SubjectPublicKeyInfo
                             ).decode('utf-8')
 
     @staticmethod
+    @timed(VERIFY_SECONDS)
     def verify(public_key, data, signature):
         """
         Verify a signature based on public key and data
@@ -59,6 +75,13 @@ class Wallet:
         :param signature: <str> Signature
         :return: <bool> True if valid signature, False if not
         """
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+        from cryptography.hazmat.primitives.hashes import SHA256
+
         deserialized_public_key = serialization.load_pem_public_key(public_key.encode('utf-8'), 
                                                                         default_backend)
         r, s = signature
@@ -81,20 +104,11 @@ class Wallet:
         :param address: <str> Address owning balance being calculated
         :return: <float> Balance contained at address
         """
-        balance = STARTING_BALANCE
-
         if not blockchain:
-            return balance
-
-        for block in blockchain.chain:
-            for transaction in block.data:
-                # Address conducts transaction (payment) – reset balance to 'change'
-                if transaction['input']['address'] == address:
-                    balance = transaction['output'][address]
-                elif address in transaction['output']:
-                    balance += transaction['output'][address]
+            return STARTING_BALANCE
 
-        return balance
+        # Kept up to date Block by Block by Blockchain's Ledger
+        return blockchain.balance(address)
 
 
 # -- TESTING AND EXPERIMENTATION -- #
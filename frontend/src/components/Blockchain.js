@@ -1,7 +1,8 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { Button } from 'react-bootstrap';
 import { API_BASE_URL } from '../config';
+import subscribeEvents from '../events';
 import Block from './Block';
 
 const PAGE_RANGE = 3;
@@ -9,8 +10,10 @@ const PAGE_RANGE = 3;
 function Blockchain() {
     const [blockchain, setBlockchain] = useState([]);
     const [blockchainLength, setBlockchainLength] = useState(0);
+    const page = useRef({ start: 0, end: PAGE_RANGE });
 
     const fetchBlockchainPage = ({ start, end }) => {
+      page.current = { start, end };
       fetch(`${API_BASE_URL}/blockchain/range?start=${start}&end=${end}`)
         .then(response => response.json())
         .then(json => setBlockchain(json))
@@ -22,6 +25,24 @@ function Blockchain() {
       fetch(`${API_BASE_URL}/blockchain/length`)
         .then(response => response.json())
         .then(json => setBlockchainLength(json))
+
+      // Pushed updates – no polling
+      return subscribeEvents({
+        block: block => {
+          // Newest Blocks page shows pushed Block right away
+          if (page.current.start === 0) {
+            setBlockchain(blockchain => [block, ...blockchain].slice(0, PAGE_RANGE));
+          }
+        },
+        tip: tip => {
+          setBlockchainLength(tip.length);
+
+          if (tip.reset) {
+            fetchBlockchainPage(page.current);
+          }
+        },
+        reset: () => fetchBlockchainPage(page.current)
+      });
     }, []);
 
   const buttonNumbers = [];
@@ -2,19 +2,49 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { FormGroup, FormControl, Button } from 'react-bootstrap';
 import { API_BASE_URL } from '../config';
-import history from '../history';
+import subscribeEvents from '../events';
 
 function ConductTransaction() {
   const [amount, setAmount] = useState(0);
   const [recipient, setRecipient] = useState('');
   const [knownAddresses, setKnownAddresses] = useState([]);
+  const [transactionId, setTransactionId] = useState(null);
+  const [transactionStatus, setTransactionStatus] = useState(null);
 
   useEffect(() => {
-    fetch(`${API_BASE_URL}/known-addresses`)
-      .then(response => response.json())
-      .then(json => setKnownAddresses(json))
+    const fetchKnownAddresses = () => {
+      fetch(`${API_BASE_URL}/known-addresses`)
+        .then(response => response.json())
+        .then(json => setKnownAddresses(json))
+    }
+
+    // Known addresses only change with the chain tip
+    return subscribeEvents({ tip: fetchKnownAddresses, reset: fetchKnownAddresses });
   }, []);
 
+  // Refresh confirmation status of submitted transaction when chain or pool changes
+  useEffect(() => {
+    if (!transactionId) {
+      return;
+    }
+
+    const fetchStatus = () => {
+      fetch(`${API_BASE_URL}/transaction/${transactionId}`)
+        .then(response => response.json())
+        .then(json => setTransactionStatus(json));
+    }
+
+    // Pool changes only matter if they touch this transaction
+    const onPoolChange = ({ updated, removed }) => {
+      if (removed.includes(transactionId) || updated.some(transaction => transaction.id === transactionId)) {
+        fetchStatus();
+      }
+    }
+
+    fetchStatus();
+    return subscribeEvents({ tip: fetchStatus, pool: onPoolChange, reset: fetchStatus });
+  }, [transactionId]);
+
   const updateRecipient = event => {
     setRecipient(event.target.value);
   }
@@ -32,7 +62,7 @@ function ConductTransaction() {
       .then(json => {
         console.log('submitTransaction json', json);
         alert('Transaction submitted successfully!');
-        history.push('/transaction-pool')
+        setTransactionId(json.id);
       });
   }
 
@@ -51,6 +81,24 @@ function ConductTransaction() {
       <div>
         <Button variant="danger" onClick={submitTransaction}>Submit</Button>
       </div>
+      {
+        transactionId && (
+          <div>
+            <br />
+            <h4>Transaction Status</h4>
+            <div>Id: {transactionId}</div>
+            <div>
+              {
+                !transactionStatus ? 'checking...'
+                  : transactionStatus.error ? transactionStatus.error
+                  : transactionStatus.status === 'confirmed'
+                    ? `confirmed in block ${transactionStatus.height} (${transactionStatus.confirmations} confirmations)`
+                    : 'pending in transaction pool'
+              }
+            </div>
+          </div>
+        )
+      }
       <br />
       <h4>Known Addresses</h4>
       <div>
@@ -2,10 +2,11 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Button } from 'react-bootstrap';
 import Transaction from './Transaction';
-import { API_BASE_URL, SECONDS_JS } from '../config';
+import { API_BASE_URL } from '../config';
 import history from '../history';
+import subscribeEvents from '../events';
 
-const POLL_INTERVAL = 10 * SECONDS_JS;
+const MINING_JOB_WAIT = 10;
 
 function TransactionPool() {
   const [transactions, setTransactions] = useState([]);
@@ -21,17 +22,39 @@ const fetchTransactions = () => {
 
   useEffect(() => {
     fetchTransactions();
-    // Fetch/update transaction pool every 10 seconds
-    const intervalId = setInterval(fetchTransactions, POLL_INTERVAL);
-    return () => clearInterval(intervalId);
+    // Pool changes pushed as they happen (added or updated transactions, ids of removed ones)
+    return subscribeEvents({
+      pool: ({ updated, removed }) => setTransactions(transactions => {
+        const changedIds = new Set(removed.concat(updated.map(transaction => transaction.id)));
+
+        return transactions.filter(transaction => !changedIds.has(transaction.id)).concat(updated);
+      }),
+      reset: fetchTransactions
+    });
   }, []);
 
   const fetchMineBlock = () => {
-    fetch(`${API_BASE_URL}/blockchain/mine`)
-      .then(() => {
+    fetch(`${API_BASE_URL}/blockchain/mine/jobs`, { method: 'POST' })
+      .then(response => response.json())
+      .then(job => {
         alert('Mining has begun!');
-        history.push('/blockchain');
-      })
+        waitForMiningJob(job.id);
+      });
+  }
+
+  // Long-poll mining job until it finishes
+  const waitForMiningJob = jobId => {
+    fetch(`${API_BASE_URL}/blockchain/mine/jobs/${jobId}?wait=${MINING_JOB_WAIT}`)
+      .then(response => response.json())
+      .then(job => {
+        if (job.status === 'mining') {
+          waitForMiningJob(jobId);
+        } else if (job.status === 'mined') {
+          history.push('/blockchain');
+        } else {
+          alert(`Mining ${job.status}: ${job.error}`);
+        }
+      });
   }
 
   return (
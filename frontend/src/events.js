@@ -0,0 +1,15 @@
+import { API_BASE_URL } from './config';
+
+// Subscribe to server-sent chain and pool events (block, tip, pool, reset)
+// handlers: { eventName: data => ... } – returns function closing the stream
+const subscribeEvents = handlers => {
+  const events = new EventSource(`${API_BASE_URL}/events`);
+
+  Object.entries(handlers).forEach(([name, handler]) => {
+    events.addEventListener(name, event => handler(JSON.parse(event.data)));
+  });
+
+  return () => events.close();
+}
+
+export default subscribeEvents;